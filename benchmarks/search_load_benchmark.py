@@ -0,0 +1,83 @@
+"""
+Offline throughput/timeout test for the search layer against the local stand-in server.
+
+Starts a StubSearchServer, points the Serper or SearXNG client at it and issues
+`--requests` queries with `--concurrency` in flight, reporting throughput, latency
+percentiles and errors. With `--agent`, the queries go through
+OpenDeepSearchAgent.search_and_build_context (default mode, no scraping) instead.
+
+Usage:
+    python benchmarks/search_load_benchmark.py --provider serper --requests 2000 --concurrency 64 \\
+        --latency-median 0.2 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import time
+
+from opendeepsearch.serp_search.serp_search import SearXNGAPI, SearXNGConfig, SerperAPI, SerperConfig
+from opendeepsearch.serp_search.stub_server import LatencyModel, StubSearchServer
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+async def run(args, server: StubSearchServer) -> None:
+    if args.provider == "serper":
+        api = SerperAPI(config=SerperConfig(api_key="stub", api_url=server.serper_url, timeout=args.timeout, pool_size=args.concurrency))
+    else:
+        api = SearXNGAPI(config=SearXNGConfig(instance_url=server.searxng_url, timeout=args.timeout, pool_size=args.concurrency))
+
+    if args.agent:
+        from opendeepsearch import OpenDeepSearchAgent
+        agent = OpenDeepSearchAgent(search_provider=args.provider, serper_api_key="stub", searxng_instance_url=server.searxng_url)
+        agent.serp_search = api
+        call = lambda q: agent.search_and_build_context(q)
+    else:
+        call = lambda q: api.aget_sources(q)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            result = await call(f"load test query {i % args.distinct}")
+            latencies.append(time.perf_counter() - start)
+            if getattr(result, "failed", False):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    await api.aclose()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s -> {args.requests / elapsed:.1f} req/s")
+    print(
+        f"latency p50 {percentile(latencies, 50) * 1000:.1f} ms  p95 {percentile(latencies, 95) * 1000:.1f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:.1f} ms  max {max(latencies) * 1000:.1f} ms"
+    )
+    print(f"errors {errors}  server {server.stats()}  health {api.health()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["serper", "searxng"], default="serper")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=100, help="Number of distinct queries to cycle through")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-median", type=float, default=0.05)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--agent", action="store_true", help="Drive OpenDeepSearchAgent.search_and_build_context")
+    args = parser.parse_args()
+
+    latency = LatencyModel(kind=args.latency, median=args.latency_median, sigma=args.latency_sigma, high=args.timeout * 2)
+    with StubSearchServer(latency=latency, error_rate=args.error_rate, hang_rate=args.hang_rate, hang_seconds=args.timeout * 2, seed=0) as server:
+        asyncio.run(run(args, server))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for decoding Serper responses: the default dict path versus the
+fast decode path (orjson when installed + slotted records).
+
+Usage:
+    python benchmarks/serp_decode_benchmark.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+
+from opendeepsearch.serp_search.records import decode_json, orjson
+from opendeepsearch.serp_search.serp_search import SerperAPI, SerperConfig
+
+def make_payload(num_organic: int = 10) -> bytes:
+    """Build a synthetic Serper response shaped like a real one"""
+    organic = [
+        {
+            "title": f"Aave V3 risk parameters and liquidation thresholds - result {i}",
+            "link": f"https://docs.example.org/aave/v3/risk/{i}",
+            "snippet": "Aave V3 introduces isolation mode, efficiency mode and supply caps. " * 3,
+            "date": "Oct 1, 2026",
+            "position": i + 1,
+            "sitelinks": [{"title": "Overview", "link": f"https://docs.example.org/{i}/overview"}],
+        }
+        for i in range(num_organic)
+    ]
+    data = {
+        "searchParameters": {"q": "is aave safe", "gl": "us", "type": "search", "engine": "google"},
+        "answerBox": {"title": "Aave", "snippet": "Aave is a decentralised lending protocol.", "link": "https://aave.com"},
+        "knowledgeGraph": {
+            "title": "Aave",
+            "type": "Decentralized finance protocol",
+            "description": "Aave is an open source liquidity protocol.",
+            "website": "https://aave.com",
+            "attributes": {"Founded": "2017", "Token": "AAVE"},
+        },
+        "organic": organic,
+        "topStories": [{"title": f"Story {i}", "imageUrl": f"https://img.example.org/{i}.png"} for i in range(5)],
+        "images": [{"title": f"Image {i}", "imageUrl": f"https://img.example.org/i{i}.png"} for i in range(10)],
+        "peopleAlsoAsk": [{"question": "Is Aave audited?", "snippet": "Yes.", "link": "https://aave.com/security"}],
+        "relatedSearches": [{"query": "aave risks"}, {"query": "aave audit"}],
+    }
+    return json.dumps(data).encode()
+
+def measure(api: SerperAPI, decode, body: bytes, iterations: int) -> dict:
+    def run():
+        return api._parse_response(decode(body))
+
+    seconds = timeit.timeit(run, number=iterations)
+
+    tracemalloc.start()
+    kept = [run() for _ in range(100)]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    return {
+        "us_per_query": seconds / iterations * 1e6,
+        "retained_bytes_per_query": retained / 100,
+        "peak_bytes": peak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--num-organic", type=int, default=10)
+    args = parser.parse_args()
+
+    body = make_payload(args.num_organic)
+    dict_api = SerperAPI(config=SerperConfig(api_key="benchmark"))
+    fast_api = SerperAPI(config=SerperConfig(api_key="benchmark", fast_decode=True))
+
+    results = {
+        "dict (json + extract_fields)": measure(dict_api, json.loads, body, args.iterations),
+        f"fast ({'orjson' if orjson else 'json'} + records)": measure(fast_api, decode_json, body, args.iterations),
+    }
+
+    print(f"payload: {len(body)} bytes, {args.num_organic} organic results, {args.iterations} iterations")
+    for name, stats in results.items():
+        print(
+            f"{name:32s} {stats['us_per_query']:8.1f} us/query  "
+            f"{stats['retained_bytes_per_query']:8.0f} B retained/query  "
+            f"{stats['peak_bytes'] / 1024:8.1f} KiB peak"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from opendeepsearch.rate_limiter import RateLimitTimeout, default_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class GasPriceMonitor:
@@ -23,6 +25,15 @@ class GasPriceMonitor:
         }
         self.etherscan_key = os.getenv("ETHERSCAN_API_KEY")
     
+    def _etherscan_slot(self) -> bool:
+        """Wait for an Etherscan rate-limit token; False if none is free within 5s"""
+        try:
+            default_rate_limiter.acquire("etherscan", self.etherscan_key, timeout=5)
+            return True
+        except RateLimitTimeout as e:
+            logger.warning(f"Skipping Etherscan gas prices: {e}")
+            return False
+
     def get_gas_prices(self) -> Dict:
         """Get current gas prices from multiple sources"""
         gas_data = {
@@ -35,9 +46,11 @@ class GasPriceMonitor:
         
         try:
             # Ethereum gas prices from Etherscan
-            if self.etherscan_key:
+            if self.etherscan_key and self._etherscan_slot():
                 url = self.sources['etherscan'].format(self.etherscan_key)
                 response = requests.get(url, timeout=5)
+                if response.status_code == 429:
+                    default_rate_limiter.throttled("etherscan", self.etherscan_key)
                 if response.status_code == 200:
                     data = response.json()
                     if data.get('status') == '1':
@@ -1,4 +1,20 @@
-from .ods_agent import OpenDeepSearchAgent
-from .ods_tool import OpenDeepSearchTool
+import importlib
 
 __all__ = ['OpenDeepSearchAgent', 'OpenDeepSearchTool']
+
+# Imported on first access, so light modules such as opendeepsearch.rate_limiter can be used
+# without pulling in the agent's dependencies (crawl4ai, litellm, the rerankers)
+_LAZY_EXPORTS = {
+    'OpenDeepSearchAgent': '.ods_agent',
+    'OpenDeepSearchTool': '.ods_tool',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
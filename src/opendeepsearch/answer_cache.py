@@ -0,0 +1,361 @@
+"""
+Semantic answer cache: paraphrased questions reuse a recent answer.
+
+Queries are embedded and compared by cosine similarity against cached questions. A hit
+above the similarity threshold, within the question's freshness TTL, returns the stored
+answer without any search, scrape or LLM call. Storage is pluggable (in-memory LRU or
+SQLite-backed) through the AnswerStore interface.
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+
+from opendeepsearch.serp_search.search_cache import DEFAULT_TTL_RULES, TTLRule, normalize_query
+
+@dataclass
+class AnswerEntry:
+    """A cached answer together with the embedding of the question it answers"""
+    key: str
+    variant: str
+    query: str
+    answer: str
+    embedding: torch.Tensor  # 1-D, unit length
+    expires_at: float
+
+class AnswerStore(ABC):
+    """
+    Storage backend for SemanticAnswerCache.
+
+    Stores own their memory bound: put() evicts least recently used entries beyond
+    max_entries and returns how many it evicted. Callers serialize access.
+    """
+    def nearest(self, embedding: torch.Tensor, variant: str, now: float) -> Tuple[Optional[AnswerEntry], float, int]:
+        """
+        Find the fresh entry stored under `variant` whose question is most similar to
+        `embedding`, dropping expired entries along the way.
+
+        Returns:
+            (entry or None, its cosine similarity, number of expired entries removed)
+        """
+        candidates = []
+        expired = 0
+        for entry in self.entries():
+            if entry.expires_at <= now:
+                self.remove(entry.key)
+                expired += 1
+            elif entry.variant == variant:
+                candidates.append(entry)
+        if not candidates:
+            return None, 0.0, expired
+        similarities = torch.stack([entry.embedding for entry in candidates]) @ embedding
+        best = int(torch.argmax(similarities))
+        return candidates[best], similarities[best].item(), expired
+
+    @abstractmethod
+    def entries(self) -> List[AnswerEntry]:
+        """Return every stored entry"""
+        pass
+
+    @abstractmethod
+    def put(self, entry: AnswerEntry) -> int:
+        """Insert or replace an entry and return the number of evicted entries"""
+        pass
+
+    @abstractmethod
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used"""
+        pass
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+class InMemoryAnswerStore(AnswerStore):
+    """
+    In-process LRU of at most `max_entries` answers.
+
+    Embeddings live in one (max_entries, dim) matrix allocated on first insert, with a
+    row per entry, so a lookup is a single matrix-vector product instead of stacking
+    every cached embedding again.
+    """
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, AnswerEntry]" = OrderedDict()
+        self._matrix: Optional[torch.Tensor] = None
+        self._rows: Dict[str, int] = {}
+        self._row_keys: List[Optional[str]] = [None] * max_entries
+        self._free_rows = list(range(max_entries - 1, -1, -1))
+        self._variant_ids: Dict[str, int] = {}
+        self._row_variants = torch.full((max_entries,), -1, dtype=torch.long)  # -1 marks a free row
+        self._row_expires = torch.zeros(max_entries, dtype=torch.float64)
+
+    def entries(self) -> List[AnswerEntry]:
+        return list(self._entries.values())
+
+    def put(self, entry: AnswerEntry) -> int:
+        evicted = []
+        if entry.key not in self._entries:
+            while self._entries and len(self._entries) >= self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+                self._free_row(evicted[-1])
+        self._add(entry)
+        self._on_evict(evicted)
+        return len(evicted)
+
+    def touch(self, key: str) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._free_row(key)
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._free_row(key)
+        self._entries.clear()
+
+    def nearest(self, embedding: torch.Tensor, variant: str, now: float) -> Tuple[Optional[AnswerEntry], float, int]:
+        if self._matrix is None:
+            return None, 0.0, 0
+        in_use = self._row_variants >= 0
+        expired_rows = (in_use & (self._row_expires <= now)).nonzero().flatten().tolist()
+        for row in expired_rows:
+            self.remove(self._row_keys[row])
+        variant_id = self._variant_ids.get(variant)
+        if variant_id is None:
+            return None, 0.0, len(expired_rows)
+        similarities = self._matrix @ embedding.to(self._matrix.dtype)
+        similarities[self._row_variants != variant_id] = float("-inf")
+        best = int(torch.argmax(similarities))
+        if self._row_variants[best] != variant_id:
+            return None, 0.0, len(expired_rows)
+        return self._entries[self._row_keys[best]], similarities[best].item(), len(expired_rows)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, entry: AnswerEntry) -> None:
+        """Insert or replace an entry and write its embedding into its matrix row"""
+        if self._matrix is None:
+            self._matrix = torch.zeros((self.max_entries, entry.embedding.shape[-1]), dtype=torch.float32)
+        row = self._rows.get(entry.key)
+        if row is None:
+            row = self._rows[entry.key] = self._free_rows.pop()
+            self._row_keys[row] = entry.key
+        self._matrix[row] = entry.embedding
+        self._row_variants[row] = self._variant_ids.setdefault(entry.variant, len(self._variant_ids))
+        self._row_expires[row] = entry.expires_at
+        self._entries[entry.key] = entry
+        self._entries.move_to_end(entry.key)
+
+    def _free_row(self, key: str) -> None:
+        row = self._rows.pop(key)
+        self._row_keys[row] = None
+        self._row_variants[row] = -1
+        self._free_rows.append(row)
+
+    def _on_evict(self, keys: List[str]) -> None:
+        pass
+
+class SQLiteAnswerStore(InMemoryAnswerStore):
+    """
+    LRU mirrored to an SQLite file so answers survive restarts and can be shared
+    between processes at startup. Lookups are served from memory; writes go through.
+    """
+    def __init__(self, path: str, max_entries: int = 1024):
+        super().__init__(max_entries)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answer_cache ("
+            "key TEXT PRIMARY KEY, variant TEXT, query TEXT, answer TEXT, "
+            "embedding TEXT, expires_at REAL, last_used REAL)"
+        )
+        self._db.execute("DELETE FROM answer_cache WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT key, variant, query, answer, embedding, expires_at FROM answer_cache "
+            "ORDER BY last_used DESC LIMIT ?", (max_entries,)
+        ).fetchall()
+        for key, variant, query, answer, embedding, expires_at in reversed(rows):
+            self._add(AnswerEntry(key, variant, query, answer, torch.tensor(json.loads(embedding)), expires_at))
+
+    def put(self, entry: AnswerEntry) -> int:
+        self._db.execute(
+            "INSERT OR REPLACE INTO answer_cache "
+            "(key, variant, query, answer, embedding, expires_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry.key, entry.variant, entry.query, entry.answer,
+             json.dumps(entry.embedding.tolist()), entry.expires_at, time.time())
+        )
+        evicted = super().put(entry)
+        self._db.commit()
+        return evicted
+
+    def touch(self, key: str) -> None:
+        super().touch(key)
+        self._db.execute("UPDATE answer_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+
+    def remove(self, key: str) -> None:
+        super().remove(key)
+        self._db.execute("DELETE FROM answer_cache WHERE key = ?", (key,))
+        self._db.commit()
+
+    def clear(self) -> None:
+        super().clear()
+        self._db.execute("DELETE FROM answer_cache")
+        self._db.commit()
+
+    def _on_evict(self, keys: List[str]) -> None:
+        self._db.executemany("DELETE FROM answer_cache WHERE key = ?", [(key,) for key in keys])
+
+class SemanticAnswerCache:
+    """
+    Answer cache keyed by query embedding.
+
+    Args:
+        embedder: Maps a list of texts to a (num_texts, dim) embedding tensor, e.g. a
+            reranker's embed
+        store: Storage backend (defaults to an InMemoryAnswerStore of `max_entries`)
+        threshold: Minimum cosine similarity for a cached question to count as a hit
+        ttl_rules: Ordered per-query-class freshness TTLs (defaults to the SERP cache rules)
+        default_ttl: Freshness TTL in seconds for queries matching no rule
+        max_entries: LRU bound of the default store
+        sqlite_path: Use an SQLiteAnswerStore at this path instead of the in-memory store
+    """
+    def __init__(
+        self,
+        embedder: Callable[[List[str]], torch.Tensor],
+        store: Optional[AnswerStore] = None,
+        threshold: float = 0.9,
+        ttl_rules: Optional[List[TTLRule]] = None,
+        default_ttl: float = 300,
+        max_entries: int = 1024,
+        sqlite_path: Optional[str] = None
+    ):
+        self.embedder = embedder
+        if store is None:
+            store = SQLiteAnswerStore(sqlite_path, max_entries) if sqlite_path else InMemoryAnswerStore(max_entries)
+        self.store = store
+        self.threshold = threshold
+        self.ttl_rules = ttl_rules if ttl_rules is not None else DEFAULT_TTL_RULES
+        self._compiled_rules = [(rule, re.compile(rule.pattern, re.IGNORECASE)) for rule in self.ttl_rules]
+        self.default_ttl = default_ttl
+        # Embeddings of recent lookups, so put() after a miss does not embed the query again
+        self._recent: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "stores": 0, "errors": 0}
+
+    def ttl_for(self, query: str) -> float:
+        """Return the freshness TTL in seconds for a query based on the first matching rule"""
+        for rule, regex in self._compiled_rules:
+            if regex.search(query):
+                return rule.ttl
+        return self.default_ttl
+
+    def get(self, query: str, variant: str = "") -> Optional[str]:
+        """
+        Return the cached answer of the most similar fresh question, or None.
+
+        Args:
+            query: The incoming question
+            variant: Only entries stored under the same variant (e.g. max_sources/pro_mode) match
+        """
+        try:
+            embedding = self._embed(query)
+        except Exception as e:
+            print(f"Answer cache embedding failed: {e}")
+            with self._lock:
+                self._stats["errors"] += 1
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            entry, similarity, expired = self.store.nearest(embedding, variant, time.time())
+            self._stats["expired"] += expired
+            if entry is not None and similarity >= self.threshold:
+                self.store.touch(entry.key)
+                self._stats["hits"] += 1
+                return entry.answer
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, query: str, answer: str, variant: str = "") -> None:
+        """Cache `answer` for `query`; empty answers are not stored"""
+        if not answer:
+            return
+        try:
+            embedding = self._embed(query)
+        except Exception as e:
+            print(f"Answer cache embedding failed: {e}")
+            with self._lock:
+                self._stats["errors"] += 1
+            return
+
+        entry = AnswerEntry(
+            key=f"{variant}|{normalize_query(query)}",
+            variant=variant,
+            query=query,
+            answer=answer,
+            embedding=embedding,
+            expires_at=time.time() + self.ttl_for(query)
+        )
+        with self._lock:
+            self._stats["evictions"] += self.store.put(entry)
+            self._stats["stores"] += 1
+
+    async def aget(self, query: str, variant: str = "") -> Optional[str]:
+        """Async version of get(); the embedding call runs in a worker thread"""
+        return await asyncio.to_thread(self.get, query, variant)
+
+    async def aput(self, query: str, answer: str, variant: str = "") -> None:
+        """Async version of put()"""
+        await asyncio.to_thread(self.put, query, answer, variant)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/expiry/eviction counters and the current store size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self.store)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self.store.clear()
+            self._recent.clear()
+
+    def _embed(self, query: str) -> torch.Tensor:
+        key = normalize_query(query)
+        with self._lock:
+            cached = self._recent.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = torch.as_tensor(self.embedder([query])[0], dtype=torch.float32)
+        embedding = torch.nn.functional.normalize(embedding, dim=-1)
+        with self._lock:
+            self._recent[key] = embedding
+            while len(self._recent) > 256:
+                self._recent.popitem(last=False)
+        return embedding
@@ -0,0 +1,82 @@
+"""
+Long-lived event loop in a background thread for driving async code from sync callers.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar('T')
+
+class BackgroundLoop:
+    """
+    Event loop running forever in a daemon thread.
+
+    Sync callers from any thread submit coroutines with run_coroutine_threadsafe, so
+    loop-bound resources (httpx clients, browser sessions, semaphores) are created once
+    and reused across calls instead of being torn down with a per-call loop.
+    """
+    def __init__(self, name: str = "opendeepsearch-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running background loop, started on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, args=(self._loop, ready), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule a coroutine on the background loop and return a concurrent Future"""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the background loop from its own thread; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the background loop and block until it finishes.
+
+        Raises:
+            concurrent.futures.TimeoutError: If `timeout` elapses; the coroutine is cancelled
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread; a later call to run() starts a fresh one"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            loop.close()
+
+_default_loop = BackgroundLoop()
+
+def default_background_loop() -> BackgroundLoop:
+    """The process-wide loop shared by every agent's sync entry points"""
+    return _default_loop
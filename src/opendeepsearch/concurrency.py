@@ -0,0 +1,47 @@
+"""
+Concurrency limits usable from any event loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
+class LoopBoundSemaphore:
+    """
+    Async context manager limiting concurrency to `limit` per event loop.
+
+    asyncio.Semaphore binds to the first loop that waits on it, while agents are driven
+    from several loops (ask_sync threads, notebooks, servers). This keeps one semaphore
+    per running loop so the same limit object can be shared safely. A limit of None or
+    0 disables limiting.
+    """
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.limit:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+            return semaphore
+
+    async def __aenter__(self) -> None:
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+
+    async def __aexit__(self, *exc) -> None:
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            semaphore.release()
+
+    def in_use(self) -> int:
+        """Slots currently held on the running loop"""
+        semaphore = self._semaphore()
+        return 0 if semaphore is None else self.limit - semaphore._value
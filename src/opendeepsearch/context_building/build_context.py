@@ -1,13 +1,31 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from loguru import logger
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from opendeepsearch.serp_search.records import AnswerBox, OrganicResult
+from opendeepsearch.context_building.tokens import count_tokens, truncate_to_tokens
 
+# Don't bother keeping a truncated piece shorter than this
+MIN_TRUNCATED_TOKENS = 16
 
-def extract_information(organic_results: List[Dict]) -> List[str]:
+
+def extract_information(organic_results: List[Union[Dict, OrganicResult]]) -> List[str]:
     """Extract snippets from organic search results in a formatted string."""
     formatted_results = []
     for item in organic_results:
-        if 'snippet' in item:
+        if isinstance(item, OrganicResult):
+            # Fast path: read the typed record's fields directly
+            if item.snippet is None:
+                continue
+            result_parts = [
+                f"title: {item.title if item.title is not None else 'N/A'}",
+                f"date authored: {item.date if item.date is not None else 'N/A'}",
+                f"link: {item.link if item.link is not None else 'N/A'}",
+                f"snippet: {item.snippet}"
+            ]
+            if item.html is not None:
+                result_parts.append(f"additional information: {item.html}")
+            formatted_results.append('\n'.join(result_parts))
+        elif 'snippet' in item:
             result_parts = [
                 f"title: {item.get('title', 'N/A')}",
                 f"date authored: {item.get('date', 'N/A')}",
@@ -34,11 +52,14 @@ def extract_top_stories(top_stories: Optional[List[Dict]]) -> List[str]:
     ]
 
 def extract_answer_box(
-    answer_box: Optional[Dict]
+    answer_box: Optional[Union[Dict, AnswerBox]]
 ) -> List[str]:
     """Extract information from answer box."""
     results = []
     
+    if isinstance(answer_box, AnswerBox):
+        return [value for value in (answer_box.answer, answer_box.snippet) if value]
+
     if answer_box:
         for key in ['answer', 'snippet']:
             if answer_box.get(key):
@@ -48,17 +69,24 @@ def extract_answer_box(
 
 def build_context(
     sources_result: Dict,
+    max_context_tokens: Optional[int] = None,
 ) -> str:
     """
     Build context from search results.
     
     Args:
         sources_result: Dictionary containing search results
+        max_context_tokens: Optional token budget for the whole context. When set, the
+            answer box, snippets and scraped chunks are packed by value (see
+            build_budgeted_context) instead of concatenated unbounded
         
     Returns:
         A formatted string containing all relevant search results
     """
     try:
+        if max_context_tokens is not None:
+            return build_budgeted_context(sources_result, max_context_tokens)
+
         # Build context from different components
         organic_results = extract_information(sources_result.get('organic', []))
         top_stories = extract_top_stories(sources_result.get('topStories'))
@@ -92,3 +120,106 @@ def build_context(
     except Exception as e:
         logger.exception(f"An error occurred while building context: {e}")
         return ""  # Return empty string in case of error
+
+def _organic_header(item: Union[Dict, OrganicResult]) -> Optional[str]:
+    """Format an organic result without its scraped content; None if it has no snippet"""
+    if isinstance(item, OrganicResult):
+        if item.snippet is None:
+            return None
+        fields = (item.title, item.date, item.link, item.snippet)
+    elif 'snippet' in item:
+        fields = (item.get('title'), item.get('date'), item.get('link'), item['snippet'])
+    else:
+        return None
+    title, date, link, snippet = (value if value is not None else 'N/A' for value in fields)
+    return f"title: {title}\ndate authored: {date}\nlink: {link}\nsnippet: {snippet}"
+
+def _organic_chunks(item: Union[Dict, OrganicResult]) -> List[Tuple[str, float]]:
+    """Scraped chunks of an organic result with their rerank scores"""
+    chunks = item.get('chunks')
+    if chunks:
+        return [(chunk['document'].strip(), float(chunk['score'])) for chunk in chunks]
+    html = item.get('html')
+    # Unscored content (e.g. from older processors) ranks below every scored chunk
+    return [(html, float('-inf'))] if html else []
+
+def build_budgeted_context(sources_result: Dict, max_context_tokens: int) -> str:
+    """
+    Build a context that fits (approximately) in `max_context_tokens` tokens.
+
+    Pieces are admitted in order of value: answer box entries, then organic snippets
+    in SERP rank order, then scraped chunks across all pages by rerank score, then top
+    stories. A piece that doesn't fit is truncated if a useful part of it still fits and
+    dropped otherwise, so low-value text goes first. The output keeps build_context's
+    layout, with each page's selected chunks under its result.
+    """
+    remaining = max_context_tokens
+    opened = set()
+
+    def admit(text: str, overhead: str = "", section: Optional[str] = None) -> Optional[str]:
+        nonlocal remaining
+        cost = count_tokens(overhead) + 1  # +1 for the joining newline
+        if section is not None and section not in opened:
+            cost += count_tokens(section) + 2
+        available = remaining - cost
+        tokens = count_tokens(text)
+        if tokens > available:
+            if available < MIN_TRUNCATED_TOKENS:
+                return None
+            text = truncate_to_tokens(text, available)
+            tokens = count_tokens(text)
+        remaining -= cost + tokens
+        if section is not None:
+            opened.add(section)
+        return text
+
+    answer_box = [
+        text for text in (
+            admit(entry, section="ANSWER BOX:")
+            for entry in extract_answer_box(sources_result.get('answerBox'))
+        ) if text
+    ]
+
+    organic: List[Tuple[str, List[Tuple[str, float]], List[str]]] = []
+    for item in sources_result.get('organic', []):
+        header = _organic_header(item)
+        if header is None:
+            continue
+        admitted = admit(header, section="SEARCH RESULTS:")
+        if admitted is not None:
+            organic.append((admitted, _organic_chunks(item), []))
+
+    candidates = [
+        (score, rank, i, text)
+        for rank, (_, chunks, _) in enumerate(organic)
+        for i, (text, score) in enumerate(chunks)
+    ]
+    for score, rank, i, text in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        selected = organic[rank][2]
+        admitted = admit(text, overhead="" if selected else "additional information: ")
+        if admitted is not None:
+            selected.append(admitted)
+
+    top_stories = [
+        text for text in (
+            admit(title, section="TOP STORIES:")
+            for title in extract_top_stories(sources_result.get('topStories'))
+        ) if text
+    ]
+
+    context_parts = []
+    if answer_box:
+        context_parts.append("ANSWER BOX:")
+        context_parts.extend(answer_box)
+        context_parts.append("")
+    if organic:
+        context_parts.append("SEARCH RESULTS:")
+        for header, _, selected in organic:
+            if selected:
+                header += "\nadditional information: " + "\n".join(selected)
+            context_parts.append(header)
+        context_parts.append("")
+    if top_stories:
+        context_parts.append("TOP STORIES:")
+        context_parts.extend(top_stories)
+    return "\n".join(context_parts)
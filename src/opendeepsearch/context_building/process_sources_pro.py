@@ -1,9 +1,15 @@
+import asyncio
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from opendeepsearch.context_scraping.crawl4ai_scraper import WebScraper
+from opendeepsearch.context_scraping.browser_pool import BrowserPoolConfig
+from opendeepsearch.context_scraping.scrape_cache import ScrapeCache
+from crawl4ai import CacheMode
+from opendeepsearch.context_scraping.extraction_result import ExtractionResult
 from opendeepsearch.ranking_models.infinity_rerank import InfinitySemanticSearcher
 from opendeepsearch.ranking_models.jina_reranker import JinaReranker
 from opendeepsearch.ranking_models.chunker import Chunker 
+from opendeepsearch.serp_search.records import OrganicResult
 
 @dataclass
 class Source:
@@ -17,13 +23,29 @@ class SourceProcessor:
         top_results: int = 5,
         strategies: List[str] = ["no_extraction"],
         filter_content: bool = True,
-        reranker: str = "infinity"
+        reranker: str = "infinity",
+        max_concurrent_scrapes: Optional[int] = 16,
+        browser_pool_config: Optional[BrowserPoolConfig] = None,
+        max_concurrent_per_domain: Optional[int] = 2,
+        politeness_delay_s: float = 0.25,
+        fetch_mode: str = "auto",
+        scrape_cache: Optional[Union[ScrapeCache, str]] = None,
+        scrape_cache_mode: CacheMode = CacheMode.ENABLED
     ):
         self.strategies = strategies
+        if isinstance(scrape_cache, str):
+            scrape_cache = ScrapeCache(scrape_cache)
         self.filter_content = filter_content
         self.scraper = WebScraper(
             strategies=self.strategies, 
-            filter_content=self.filter_content
+            filter_content=self.filter_content,
+            max_concurrent_scrapes=max_concurrent_scrapes,
+            browser_pool_config=browser_pool_config,
+            max_concurrent_per_domain=max_concurrent_per_domain,
+            politeness_delay_s=politeness_delay_s,
+            fetch_mode=fetch_mode,
+            scrape_cache=scrape_cache,
+            cache_mode=scrape_cache_mode
         )
         self.top_results = top_results
         self.chunker = Chunker()
@@ -41,8 +63,15 @@ class SourceProcessor:
         sources: List[dict], 
         num_elements: int, 
         query: str, 
-        pro_mode: bool = False
+        pro_mode: bool = False,
+        max_rerank_candidates: Optional[int] = None
     ) -> List[dict]:
+        """
+        Scrape and rerank the top sources in place.
+
+        max_rerank_candidates caps how many chunks per page are embedded and reranked
+        (None embeds them all); used to trade quality for latency under a deadline.
+        """
         try:
             valid_sources = self._get_valid_sources(sources, num_elements)
             if not valid_sources:
@@ -51,53 +80,97 @@ class SourceProcessor:
             if not pro_mode:
                 # Check if there's a Wikipedia article among valid sources
                 wiki_sources = [(i, source) for i, source in valid_sources 
-                              if 'wikipedia.org' in source['link']]
+                              if 'wikipedia.org' in self._link(source)]
                 if not wiki_sources:
                     return sources.data
                 # If Wikipedia article exists, only process that
                 valid_sources = wiki_sources[:1]  # Take only the first Wikipedia source
 
-            html_contents = await self._fetch_html_contents([s[1]['link'] for s in valid_sources])
-            return self._update_sources_with_content(sources.data, valid_sources, html_contents, query)
+            await self._scrape_and_rerank(valid_sources, query, max_rerank_candidates)
+            return sources.data
         except Exception as e:
             print(f"Error in process_sources: {e}")
             return sources
 
+    async def aclose(self) -> None:
+        """Close the scraper's pooled browsers"""
+        await self.scraper.aclose()
+
+    @staticmethod
+    def _link(source) -> str:
+        # Typed records from the fast decode path expose fields as attributes
+        return source.link if isinstance(source, OrganicResult) else source['link']
+
     def _get_valid_sources(self, sources: List[dict], num_elements: int) -> List[Tuple[int, dict]]:
         return [(i, source) for i, source in enumerate(sources.data['organic'][:num_elements]) if source]
 
-    async def _fetch_html_contents(self, links: List[str]) -> List[str]:
-        raw_contents = await self.scraper.scrape_many(links)
-        return [x['no_extraction'].content for x in raw_contents.values()]
+    async def _scrape_and_rerank(
+        self,
+        valid_sources: List[Tuple[int, dict]],
+        query: str,
+        max_rerank_candidates: Optional[int] = None
+    ) -> None:
+        """
+        Pipeline scraping with chunking/reranking: each page is handed to the reranker as
+        soon as its scrape completes, so slow pages overlap with embedding the fast ones.
+        """
+        sources_by_link: Dict[str, List[dict]] = {}
+        for _, source in valid_sources:
+            sources_by_link.setdefault(self._link(source), []).append(source)
 
-    def _process_html_content(self, html: str, query: str) -> str:
+        pending = []
+        try:
+            # Links are in SERP rank order, which the scraper uses as scheduling priority
+            async for link, results in self.scraper.scrape_many_as_completed(list(sources_by_link)):
+                pending.append(asyncio.ensure_future(
+                    self._update_sources_with_content(sources_by_link[link], results, query, max_rerank_candidates)
+                ))
+            await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancellations to land, so no update writes into the sources after
+            # we return (e.g. while a timed-out caller builds its context from them)
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _process_html_content(
+        self,
+        html: str,
+        query: str,
+        max_candidates: Optional[int] = None
+    ) -> List[Dict[str, Union[str, float]]]:
         if not html:
-            return ""
+            return []
         try:
             # Split the HTML content into chunks
             documents = self.chunker.split_text(html)
+            if max_candidates is not None:
+                documents = documents[:max_candidates]
             
-            # Rerank the chunks based on the query
-            reranked_content = self.semantic_searcher.get_reranked_documents(
+            # Rerank the chunks based on the query. Raw similarities (rather than per-page
+            # softmax) keep scores comparable across pages for context budgeting
+            return self.semantic_searcher.rerank(
                 query,
                 documents,
-                top_k=self.top_results
+                top_k=self.top_results,
+                normalize="none"
             )
-            
-            return reranked_content
         
         except Exception as e:
             print(f"Error in content processing: {e}")
-            return ""
+            return []
 
-    def _update_sources_with_content(
+    async def _update_sources_with_content(
         self, 
         sources: List[dict],
-        valid_sources: List[Tuple[int, dict]], 
-        html_contents: List[str],
-        query: str
-    ) -> List[dict]:
-        for (i, source), html in zip(valid_sources, html_contents):
-            source['html'] = self._process_html_content(html, query)
-            # sources[i] = source
-        return sources
\ No newline at end of file
+        results: Dict[str, ExtractionResult],
+        query: str,
+        max_rerank_candidates: Optional[int] = None
+    ) -> None:
+        html = results['no_extraction'].content
+        # Chunking and reranking block (HTTP embedding calls), so keep them off the event loop
+        chunks = await asyncio.to_thread(self._process_html_content, html, query, max_rerank_candidates)
+        content = "\n".join(chunk['document'].strip() for chunk in chunks)
+        for source in sources:
+            source['html'] = content
+            source['chunks'] = chunks
@@ -0,0 +1,58 @@
+"""
+Fast, cached token counting for context budgeting.
+
+Uses tiktoken's cl100k_base encoding when it is available and falls back to a
+characters-per-token estimate otherwise (e.g. offline, where the encoding file cannot
+be downloaded). Counts are memoized since the same snippets and chunks are counted
+repeatedly while a context is assembled.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+
+CHARS_PER_TOKEN = 4
+
+_encoding: Any = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+def _get_encoding() -> Optional[Any]:
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """Return the number of tokens in `text`"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` tokens, preferring to end on a word boundary"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 1:
+        return ""
+    keep = max_tokens - 1  # Leave room for the ellipsis
+    encoding = _get_encoding()
+    if encoding is None:
+        truncated = text[:keep * CHARS_PER_TOKEN]
+    else:
+        truncated = encoding.decode(encoding.encode(text, disallowed_special=())[:keep])
+    cut = truncated.rfind(" ")
+    if cut > len(truncated) // 2:
+        truncated = truncated[:cut]
+    return truncated.rstrip() + " ..."
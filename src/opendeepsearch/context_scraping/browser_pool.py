@@ -0,0 +1,221 @@
+"""
+Pool of long-lived Crawl4AI browsers shared by every scrape a WebScraper makes.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+@dataclass
+class BrowserPoolConfig:
+    """Sizing and recycling of the browsers kept by a BrowserPool"""
+    size: int = 2                           # Browsers kept running
+    pages_per_browser: int = 4              # Concurrent pages (reused sessions) per browser
+    max_pages_per_browser: int = 200        # Recycle a browser after serving this many pages
+    health_check_interval_s: float = 30.0   # Minimum time between liveness probes of a browser
+    max_consecutive_failures: int = 3       # Crawler exceptions in a row before a browser is recycled
+
+class _PooledBrowser:
+    __slots__ = ('crawler', 'started', 'sessions', 'active', 'pages_served',
+                 'failures', 'last_checked', 'retiring')
+
+    def __init__(self, crawler: AsyncWebCrawler, session_ids: List[str]):
+        self.crawler = crawler
+        self.started: Optional[asyncio.Future] = None
+        self.sessions = session_ids  # Free session ids; each keeps one page open for reuse
+        self.active = 0
+        self.pages_served = 0
+        self.failures = 0
+        self.last_checked = time.monotonic()
+        self.retiring = False
+
+def _browser_connected(crawler: AsyncWebCrawler) -> bool:
+    """Best-effort liveness probe; True when the crawler doesn't expose its browser"""
+    strategy = getattr(crawler, 'crawler_strategy', None)
+    manager = getattr(strategy, 'browser_manager', None)
+    browser = getattr(manager, 'browser', None) or getattr(strategy, 'browser', None)
+    is_connected = getattr(browser, 'is_connected', None)
+    if not callable(is_connected):
+        return True
+    try:
+        return bool(is_connected())
+    except Exception:
+        return False
+
+class BrowserPool:
+    """
+    Persistent headless browsers leased out one page at a time.
+
+    Browsers are launched on demand up to `config.size`, and each serves up to
+    `config.pages_per_browser` pages at once. Every slot is a Crawl4AI session, so its
+    tab is reused for the next URL. A browser is recycled (closed and, on demand, replaced)
+    after serving `max_pages_per_browser` pages, after `max_consecutive_failures` crawler
+    exceptions, or when a health check finds it disconnected. Like httpx clients, the
+    browsers are bound to the event loop they were launched on, so the pool starts afresh
+    when used from a different loop.
+
+    Args:
+        browser_config: Crawl4AI configuration used to launch every browser
+        config: Pool sizing and recycling (defaults to BrowserPoolConfig())
+    """
+    def __init__(self, browser_config: Optional[BrowserConfig] = None, config: Optional[BrowserPoolConfig] = None):
+        self.browser_config = browser_config or BrowserConfig(headless=True, verbose=True)
+        self.config = config or BrowserPoolConfig()
+        self._browsers: List[_PooledBrowser] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._session_ids = itertools.count(1)
+        self._launches = 0
+        self._recycled = 0
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        old_loop, old_browsers = self._loop, self._browsers
+        if old_browsers and old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # The old browsers can only be closed from the loop that launched them
+            asyncio.run_coroutine_threadsafe(self._close_browsers(old_browsers), old_loop)
+        self._browsers = []
+        self._loop = loop
+        self._condition = asyncio.Condition()
+
+    def _new_session_ids(self) -> List[str]:
+        return [f"ods-pool-{next(self._session_ids)}" for _ in range(self.config.pages_per_browser)]
+
+    def _check_health(self, browser: _PooledBrowser) -> None:
+        now = time.monotonic()
+        if browser.started is None or not browser.started.done():
+            return
+        if now - browser.last_checked < self.config.health_check_interval_s:
+            return
+        browser.last_checked = now
+        if browser.started.exception() is not None or not _browser_connected(browser.crawler):
+            browser.retiring = True
+
+    def _pick(self) -> Optional[_PooledBrowser]:
+        """Least busy browser with a free page, if any"""
+        best = None
+        for browser in self._browsers:
+            self._check_health(browser)
+            if browser.retiring or not browser.sessions:
+                continue
+            if best is None or browser.active < best.active:
+                best = browser
+        return best
+
+    async def _acquire(self) -> Tuple[_PooledBrowser, str]:
+        self._bind_loop()
+        async with self._condition:
+            while True:
+                browser = self._pick()
+                if browser is None and len(self._browsers) < self.config.size:
+                    browser = _PooledBrowser(AsyncWebCrawler(config=self.browser_config), self._new_session_ids())
+                    browser.started = asyncio.ensure_future(browser.crawler.start())
+                    self._browsers.append(browser)
+                    self._launches += 1
+                if browser is not None:
+                    session_id = browser.sessions.pop()
+                    browser.active += 1
+                    break
+                await self._condition.wait()
+        try:
+            # Everyone who picked a fresh browser waits on the same launch
+            await asyncio.shield(browser.started)
+        except BaseException:
+            if browser.started.done() and browser.started.exception() is not None:
+                browser.retiring = True
+            await self._release(browser, session_id, served=False)
+            raise
+        return browser, session_id
+
+    async def _release(self, browser: _PooledBrowser, session_id: str, served: bool = True) -> None:
+        to_close = None
+        async with self._condition:
+            browser.active -= 1
+            if served:
+                browser.pages_served += 1
+            if (browser.pages_served >= self.config.max_pages_per_browser
+                    or browser.failures >= self.config.max_consecutive_failures):
+                browser.retiring = True
+            if not browser.retiring:
+                browser.sessions.append(session_id)
+            elif browser.active == 0 and browser in self._browsers:
+                self._browsers.remove(browser)
+                self._recycled += 1
+                to_close = browser
+            self._condition.notify_all()
+        if to_close is not None:
+            await self._close_browsers([to_close])
+
+    async def _reset_session(self, browser: _PooledBrowser, session_id: str) -> None:
+        """Close a session's page after a failure so the next lease starts from a clean tab"""
+        kill_session = getattr(getattr(browser.crawler, 'crawler_strategy', None), 'kill_session', None)
+        if kill_session is None:
+            return
+        try:
+            await kill_session(session_id)
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Tuple[AsyncWebCrawler, str]]:
+        """
+        Lease one page: yields (crawler, session_id). Pass the session id in the run
+        config to reuse the slot's tab; exceptions raised inside count as browser failures.
+        """
+        browser, session_id = await self._acquire()
+        try:
+            yield browser.crawler, session_id
+        except Exception:
+            browser.failures += 1
+            await self._reset_session(browser, session_id)
+            raise
+        else:
+            browser.failures = 0
+        finally:
+            await self._release(browser, session_id)
+
+    async def arun(self, url: str, config: CrawlerRunConfig) -> Any:
+        """Crawl one URL on a pooled page"""
+        async with self.page() as (crawler, session_id):
+            config.session_id = session_id
+            return await crawler.arun(url=url, config=config)
+
+    @staticmethod
+    async def _close_browsers(browsers: List[_PooledBrowser]) -> None:
+        async def close(browser: _PooledBrowser) -> None:
+            try:
+                if browser.started is not None:
+                    await asyncio.gather(browser.started, return_exceptions=True)
+                await browser.crawler.close()
+            except Exception as e:
+                print(f"Error closing pooled browser: {e}")
+        await asyncio.gather(*(close(browser) for browser in browsers))
+
+    async def aclose(self) -> None:
+        """Close every browser; pages still in use fail. The pool relaunches on next use."""
+        if self._loop is not asyncio.get_running_loop():
+            self._bind_loop()
+            return
+        async with self._condition:
+            browsers, self._browsers = self._browsers, []
+            for browser in browsers:
+                browser.retiring = True
+            self._condition.notify_all()
+        await self._close_browsers(browsers)
+
+    def stats(self) -> Dict[str, int]:
+        """Current browsers, pages in use and lifetime launch/recycle counts"""
+        return {
+            "browsers": len(self._browsers),
+            "pages_in_use": sum(browser.active for browser in self._browsers),
+            "pages_served": sum(browser.pages_served for browser in self._browsers),
+            "launches": self._launches,
+            "recycled": self._recycled,
+        }
@@ -4,17 +4,34 @@ Supports multiple extraction strategies including LLM, CSS, and XPath.
 """
 
 import asyncio
+import json
 import os
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai import BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.chunking_strategy import RegexChunking
 from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.extraction_strategy import ExtractionStrategy
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
 from opendeepsearch.context_scraping.extraction_result import ExtractionResult, print_extraction_result
 from opendeepsearch.context_scraping.basic_web_scraper import ExtractionConfig
 from opendeepsearch.context_scraping.strategy_factory import StrategyFactory
+from opendeepsearch.context_scraping.browser_pool import BrowserPool, BrowserPoolConfig
+from opendeepsearch.context_scraping.scrape_scheduler import ScrapeScheduler
+from opendeepsearch.context_scraping.http_fetcher import HTTPFetcher
+from opendeepsearch.context_scraping.scrape_cache import ScrapeCache
+from opendeepsearch.tracing import span, traced
+
+def _measure_scrape(results: Dict[str, ExtractionResult], scraper: "WebScraper", url: str) -> Dict[str, object]:
+    """Span fields for a single-page scrape"""
+    return {
+        "items": len(results),
+        "bytes": sum(len(result.content or "") for result in results.values()),
+        "outcome": "ok" if any(result.success for result in results.values()) else "error",
+        "url": url,
+    }
 
 class WebScraper:
     """Unified scraper that encapsulates all extraction strategies and configuration"""
@@ -25,21 +42,49 @@ class WebScraper:
         llm_instruction: str = "Extract relevant content from the provided text, only return the text, no markdown formatting, remove all footnotes, citations, and other metadata and only keep the main content",
         user_query: Optional[str] = None,
         debug: bool = False,
-        filter_content: bool = False
+        filter_content: bool = False,
+        max_concurrent_scrapes: Optional[int] = None,
+        browser_pool_config: Optional[BrowserPoolConfig] = None,
+        max_concurrent_per_domain: Optional[int] = 2,
+        politeness_delay_s: float = 0.25,
+        fetch_mode: Literal["auto", "browser", "http"] = "auto",
+        scrape_cache: Optional[ScrapeCache] = None,
+        cache_mode: CacheMode = CacheMode.ENABLED
     ):
         self.browser_config = browser_config or BrowserConfig(headless=True, verbose=True)
+        # Browsers are launched once and reused across pages instead of per extraction
+        self.browser_pool = BrowserPool(self.browser_config, browser_pool_config)
+        # "auto" tries a plain HTTP GET first and renders in the browser only when the page
+        # (or earlier pages of its domain) needs JavaScript; "http" never uses the browser
+        if fetch_mode not in ("auto", "browser", "http"):
+            raise ValueError(f"Invalid fetch_mode: {fetch_mode}")
+        self.fetch_mode = fetch_mode
+        # Also used to revalidate cached pages, whatever the fetch mode
+        self.http_fetcher = HTTPFetcher()
+        # Fetched pages are cached here rather than in Crawl4AI's cache, which stays bypassed.
+        # cache_mode follows Crawl4AI's meaning: ENABLED reads and writes, READ_ONLY/WRITE_ONLY
+        # do one of the two, BYPASS/DISABLED neither
+        self.scrape_cache = scrape_cache
+        self.cache_mode = cache_mode
+        self._cache_reads = scrape_cache is not None and cache_mode in (CacheMode.ENABLED, CacheMode.READ_ONLY)
+        self._cache_writes = scrape_cache is not None and cache_mode in (CacheMode.ENABLED, CacheMode.WRITE_ONLY)
         self.debug = debug
         self.factory = StrategyFactory()
         self.strategies = strategies or ['markdown_llm', 'html_llm', 'fit_markdown_llm', 'css', 'xpath', 'no_extraction', 'cosine']
         self.llm_instruction = llm_instruction
         self.user_query = user_query
         self.filter_content = filter_content
+        # Caps scrapes across every scrape_many call sharing this scraper (None = unlimited),
+        # per domain, and serves the best-ranked URLs first
+        self.scheduler = ScrapeScheduler(max_concurrent_scrapes, max_concurrent_per_domain, politeness_delay_s)
         
         # Validate strategies
         valid_strategies = {'markdown_llm', 'html_llm', 'fit_markdown_llm', 'css', 'xpath', 'no_extraction', 'cosine'}
         invalid_strategies = set(self.strategies) - valid_strategies
         if invalid_strategies:
             raise ValueError(f"Invalid strategies: {invalid_strategies}")
+        # Only HTML-input strategies need the page HTML kept in the scrape cache
+        self._cache_html = bool({'html_llm', 'css', 'xpath'} & set(self.strategies))
             
         # Initialize strategy map
         self.strategy_map = {
@@ -62,6 +107,7 @@ class WebScraper:
             )
         )
 
+    @traced("scrape.page", measure=_measure_scrape)
     async def scrape(self, url: str) -> Dict[str, ExtractionResult]:
         """
         Scrape URL using configured strategies
@@ -88,67 +134,185 @@ class WebScraper:
                 # If Wikipedia extraction fails, fall through to normal scraping
         
         # Normal scraping for non-Wikipedia URLs or if Wikipedia extraction failed
-        results = {}
-        for strategy_name in self.strategies:
-            config = ExtractionConfig(
-                name=strategy_name,
-                strategy=self.strategy_map[strategy_name]()
-            )
-            result = await self.extract(config, url)
-            results[strategy_name] = result
-            
-        return results
+        configs = [
+            ExtractionConfig(name=strategy_name, strategy=self.strategy_map[strategy_name]())
+            for strategy_name in self.strategies
+        ]
+        return await self.extract_many(configs, url)
     
-    async def scrape_many(self, urls: List[str]) -> Dict[str, Dict[str, ExtractionResult]]:
+    @traced("scrape.scrape_many", measure=lambda results, self, urls: {"items": len(urls)})
+    async def scrape_many(
+        self,
+        urls: List[str],
+        priorities: Optional[List[float]] = None
+    ) -> Dict[str, Dict[str, ExtractionResult]]:
         """
         Scrape multiple URLs using configured strategies in parallel
         
         Args:
             urls: List of target URLs to scrape
+            priorities: Scheduling priority per URL, lower first (defaults to list position)
             
         Returns:
             Dictionary mapping URLs to their extraction results
         """
-        # Create tasks for all URLs
-        tasks = [self.scrape(url) for url in urls]
-        # Run all tasks concurrently
-        results_list = await asyncio.gather(*tasks)
+        results = {url: result async for url, result in self.scrape_many_as_completed(urls, priorities)}
+        # Keep the caller's URL order rather than completion order
+        return {url: results[url] for url in urls}
+
+    async def scrape_many_as_completed(
+        self,
+        urls: List[str],
+        priorities: Optional[List[float]] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, ExtractionResult]]]:
+        """
+        Scrape multiple URLs in parallel, yielding each one as soon as it finishes,
+        so callers can start processing fast pages while slow ones are still loading.
+        Scrapes start through the scraper's scheduler: best priority first, within the
+        global and per-domain caps and the per-domain politeness delay.
         
-        # Build results dictionary
-        results = {}
-        for url, result in zip(urls, results_list):
-            results[url] = result
+        Args:
+            urls: List of target URLs to scrape (duplicates are scraped once)
+            priorities: Scheduling priority per URL, lower first (defaults to list
+                position, i.e. SERP rank when the URLs come from search results)
             
-        return results
+        Yields:
+            (url, extraction results) tuples in completion order
+        """
+        async def scrape_one(url: str, priority: float) -> Tuple[str, Dict[str, ExtractionResult]]:
+            async with self.scheduler.slot(url, priority):
+                return url, await self.scrape(url)
+
+        if priorities is None:
+            priorities = range(len(urls))
+        # Duplicates keep their best priority
+        ranked: Dict[str, float] = {}
+        for url, priority in zip(urls, priorities):
+            ranked[url] = min(priority, ranked.get(url, priority))
+        tasks = [asyncio.ensure_future(scrape_one(url, priority)) for url, priority in ranked.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding scrapes if the consumer bails out early
+            for task in tasks:
+                task.cancel()
 
     async def extract(self, extraction_config: ExtractionConfig, url: str) -> ExtractionResult:
         """Internal method to perform extraction using specified strategy"""
-        try:
-            config = self._create_crawler_config()
-            config.extraction_strategy = extraction_config.strategy
+        results = await self.extract_many([extraction_config], url)
+        return results[extraction_config.name]
 
+    async def extract_many(
+        self,
+        extraction_configs: List[ExtractionConfig],
+        url: str
+    ) -> Dict[str, ExtractionResult]:
+        """
+        Fetch and render `url` once, then run every extraction strategy over that page.
+        Strategies run concurrently in worker threads, since they are CPU-bound (or block
+        on their own LLM calls), so extra strategies add no network or browser time.
+        """
+        try:
+            result = await self._fetch(url)
+        except Exception as e:
             if self.debug:
-                print(f"\nDebug: Attempting extraction with strategy: {extraction_config.name}")
-                print(f"Debug: URL: {url}")
-                print(f"Debug: Strategy config: {config.extraction_strategy}")
-                if self.user_query:
-                    print(f"Debug: User query: {self.user_query}")
-
-            async with AsyncWebCrawler(config=self.browser_config) as crawler:
-                if isinstance(url, list):
-                    result = await crawler.arun_many(urls=url, config=config)
-                else:
-                    result = await crawler.arun(url=url, config=config)
+                import traceback
+                print(f"Debug: Exception occurred while fetching {url}:")
+                print(traceback.format_exc())
+            return {
+                config.name: ExtractionResult(name=config.name, success=False, error=str(e))
+                for config in extraction_configs
+            }
+
+        extracted = await asyncio.gather(*(
+            asyncio.to_thread(self._extraction_result, config, url, result)
+            for config in extraction_configs
+        ))
+        return {config.name: extraction_result for config, extraction_result in zip(extraction_configs, extracted)}
+
+    async def _fetch(self, url: str):
+        """Crawl the page without an extraction strategy; strategies run afterwards"""
+        config = self._create_crawler_config()
+
+        if self.debug:
+            print(f"\nDebug: Fetching URL: {url}")
+            if self.user_query:
+                print(f"Debug: User query: {self.user_query}")
+
+        with span("scrape.fetch", url=url) as fetch_span:
+            cached = await self._cached_page(url)
+            if cached is not None:
+                fetch_span.set(mode="cache")
+                return cached
+
+            result = None
+            if self.fetch_mode != "browser":
+                try:
+                    result = await self.http_fetcher.fetch(url, config)
+                except Exception as e:
+                    if self.debug:
+                        print(f"Debug: HTTP fetch failed, using the browser: {str(e)}")
+            if result is not None:
+                fetch_span.set(mode="http")
+            elif self.fetch_mode == "http":
+                raise RuntimeError(f"{url} could not be fetched without a browser")
+            else:
+                fetch_span.set(mode="browser")
+                result = await self.browser_pool.arun(url, config)
+
+            if self._cache_writes and result.success:
+                try:
+                    await asyncio.to_thread(self.scrape_cache.put, url, result, self._cache_html)
+                except Exception as e:
+                    print(f"Error writing {url} to the scrape cache: {e}")
+
+        if self.debug:
+            print(f"Debug: Raw result attributes: {dir(result)}")
+            print(f"Debug: Raw result: {result.__dict__}")
+        return result
 
+    async def _cached_page(self, url: str):
+        """A fresh cached page, or a stale one the server confirms is unchanged"""
+        if not self._cache_reads:
+            return None
+        try:
+            entry = await asyncio.to_thread(self.scrape_cache.get, url)
+        except Exception as e:
+            print(f"Error reading {url} from the scrape cache: {e}")
+            return None
+        if entry is None or (self._cache_html and not entry.page.html):
+            return None
+        if entry.fresh:
+            return entry.page
+        if await self.http_fetcher.revalidate(url, entry.etag, entry.last_modified):
+            await asyncio.to_thread(self.scrape_cache.refresh, url)
+            return entry.page
+        return None
+
+    @staticmethod
+    def _run_strategy(strategy: ExtractionStrategy, url: str, result) -> str:
+        """Run an extraction strategy over an already rendered page, the way Crawl4AI does during a crawl"""
+        input_format = getattr(strategy, 'input_format', 'markdown')
+        if input_format == 'html':
+            sections = [result.html]
+        else:
+            content = result.markdown_v2.fit_markdown if input_format == 'fit_markdown' else result.markdown_v2.raw_markdown
+            sections = RegexChunking().chunk(content)
+        return json.dumps(strategy.run(url, sections), indent=4, default=str, ensure_ascii=False)
+
+    def _extraction_result(self, extraction_config: ExtractionConfig, url: str, result) -> ExtractionResult:
+        """Build one strategy's result from the fetched page"""
+        try:
             if self.debug:
-                print(f"Debug: Raw result attributes: {dir(result)}")
-                print(f"Debug: Raw result: {result.__dict__}")
+                print(f"\nDebug: Attempting extraction with strategy: {extraction_config.name}")
+                print(f"Debug: Strategy config: {extraction_config.strategy}")
 
             # Handle different result formats based on strategy
             content = None
             if result.success:
                 if extraction_config.name in ['no_extraction', 'cosine']:
-                    # For strategies that return a list of dictionaries
+                    # These strategies report the page markdown itself, so the strategy doesn't need to run
                     if hasattr(result, 'markdown_v2'):
                         content = result.markdown_v2.raw_markdown
                     elif hasattr(result, 'raw_html'):
@@ -163,7 +327,7 @@ class WebScraper:
                         from src.opendeepsearch.context_scraping.utils import filter_quality_content
                         content = filter_quality_content(content)
                 else:
-                    content = result.extracted_content
+                    content = self._run_strategy(extraction_config.strategy, url, result)
                     if self.filter_content and content:
                         from src.opendeepsearch.context_scraping.utils import filter_quality_content
                         content = filter_quality_content(content)
@@ -198,6 +362,11 @@ class WebScraper:
                 error=str(e)
             )
 
+    async def aclose(self) -> None:
+        """Close the pooled browsers and HTTP clients"""
+        await self.browser_pool.aclose()
+        await self.http_fetcher.aclose()
+
 async def main():
     # Example usage with single URL
     single_url = "https://example.com/product-page"
@@ -223,5 +392,7 @@ async def main():
         for result in url_results.values():
             print_extraction_result(result)
 
+    await scraper.aclose()
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,223 @@
+"""
+Plain-HTTP page fetching for static pages, so only JavaScript-rendered pages need a browser.
+"""
+
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.content_scraping_strategy import WebScrapingStrategy
+
+from opendeepsearch.serp_search.serp_search import HTTPClientPool
+from opendeepsearch.context_scraping.scrape_scheduler import url_domain
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_INVISIBLE_BLOCKS = re.compile(r"<(script|style|noscript|template|svg)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]+>")
+_EMPTY_APP_ROOT = re.compile(
+    r"<(div|main)[^>]*\bid=[\"'](root|app|__next|__nuxt|svelte|main-app)[\"'][^>]*>\s*</\1>"
+    r"|<app-root[^>]*>\s*</app-root>",
+    re.IGNORECASE
+)
+_NOSCRIPT_WARNING = re.compile(r"<noscript[^>]*>[^<]*(enable|requires?|turn on)\s+javascript", re.IGNORECASE)
+BOT_BLOCK_STATUSES = frozenset({403, 429, 503})  # Typical bot-protection answers to plain HTTP clients
+
+def visible_text_length(html: str) -> int:
+    """Rough length of the text a reader would see, without scripts, styles and markup"""
+    text = _TAGS.sub(" ", _INVISIBLE_BLOCKS.sub(" ", html))
+    return len(" ".join(text.split()))
+
+def is_app_shell(html: str, min_text_chars: int = 200) -> bool:
+    """
+    Strong signs that a site renders with JavaScript: an empty body, an empty framework
+    mount point (React/Vue/Next/Angular/...), or a <noscript> warning, on a page with
+    little text
+    """
+    text_length = visible_text_length(html)
+    if text_length < 20:
+        return True
+    if text_length >= 5 * min_text_chars:
+        return False
+    return bool(_EMPTY_APP_ROOT.search(html) or _NOSCRIPT_WARNING.search(html))
+
+def needs_javascript(html: str, min_text_chars: int = 200) -> bool:
+    """Whether the page itself shows too little content without JavaScript"""
+    return visible_text_length(html) < min_text_chars or is_app_shell(html, min_text_chars)
+
+@dataclass
+class PageMarkdown:
+    raw_markdown: str = ""
+    markdown_with_citations: str = ""
+    fit_markdown: str = ""
+
+@dataclass
+class FetchedPage:
+    """A page fetched over plain HTTP, shaped like the Crawl4AI result fields WebScraper reads"""
+    url: str
+    html: str
+    markdown_v2: PageMarkdown = field(default_factory=PageMarkdown)
+    success: bool = True
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    extracted_content: Optional[str] = None
+    etag: Optional[str] = None            # Validators for cache revalidation
+    last_modified: Optional[str] = None
+
+class HTTPFetcher:
+    """
+    Fetches pages with a pooled async HTTP client and converts them to markdown in process
+    with Crawl4AI's scraping and markdown strategies, so the output matches a browser crawl.
+
+    fetch() returns None whenever the browser should be used instead: error statuses,
+    non-HTML or oversized responses, transport errors, and pages that look
+    JavaScript-rendered. Only site-wide verdicts are remembered per domain, so later URLs
+    on the domain go straight to the browser without another probe: an app shell, or a
+    403/429/503 (usually bot protection a real browser gets past). Anything else, such as
+    a 404, a PDF or a short page, sends just that URL to the browser.
+
+    Args:
+        timeout: Request timeout in seconds
+        pool_size: Keep-alive connections kept by the client
+        max_bytes: Larger responses are left to the browser
+        min_text_chars: Visible text below which a page is considered JavaScript-rendered
+        max_domains: Domains whose fetch mode is remembered (least recently used are dropped)
+    """
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        pool_size: int = 20,
+        max_bytes: int = 5_000_000,
+        min_text_chars: int = 200,
+        max_domains: int = 4096,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.client_pool = HTTPClientPool(pool_size=pool_size, timeout=timeout, headers=headers or DEFAULT_HEADERS)
+        self.max_bytes = max_bytes
+        self.min_text_chars = min_text_chars
+        self.max_domains = max_domains
+        self._browser_domains: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._scraping_strategy = WebScrapingStrategy()
+
+    def needs_browser(self, url: str) -> bool:
+        """Whether `url`'s domain is already known to need the browser"""
+        domain = url_domain(url)
+        with self._lock:
+            if domain in self._browser_domains:
+                self._browser_domains.move_to_end(domain)
+                return True
+        return False
+
+    def remember_browser(self, url: str) -> None:
+        """Send later fetches for `url`'s domain straight to the browser"""
+        domain = url_domain(url)
+        with self._lock:
+            self._browser_domains[domain] = None
+            self._browser_domains.move_to_end(domain)
+            while len(self._browser_domains) > self.max_domains:
+                self._browser_domains.popitem(last=False)
+
+    async def fetch(self, url: str, config: CrawlerRunConfig) -> Optional[FetchedPage]:
+        """
+        Fetch `url` over HTTP and build its markdown with `config`'s markdown generator.
+
+        Returns:
+            The page, or None if it needs the browser
+        """
+        if self.needs_browser(url):
+            return None
+        html, headers, status = await self._get(url)
+        if html is None:
+            if status in BOT_BLOCK_STATUSES:
+                self.remember_browser(url)
+            return None
+        if is_app_shell(html, self.min_text_chars):
+            self.remember_browser(url)
+            return None
+        if needs_javascript(html, self.min_text_chars):
+            # A short page alone says little about the rest of the site
+            return None
+        # HTML cleaning and markdown conversion are CPU-bound
+        page = await asyncio.to_thread(self._to_page, url, html, config)
+        page.etag = headers.get("etag")
+        page.last_modified = headers.get("last-modified")
+        return page
+
+    async def revalidate(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> Optional[bool]:
+        """
+        Conditional GET against a cached copy's validators.
+
+        Returns:
+            True if the page is unchanged (HTTP 304), False if it changed, None if the
+            server could not tell us
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return None
+        try:
+            # The body of a changed page is not read; the caller fetches it normally
+            async with self.client_pool.async_client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+                if response.status_code == 304:
+                    return True
+                return False if response.status_code < 400 else None
+        except httpx.HTTPError:
+            return None
+
+    async def _get(self, url: str) -> Tuple[Optional[str], Optional[httpx.Headers], Optional[int]]:
+        """(html, headers, status); html is None if the response can't be used (status is None on transport errors)"""
+        try:
+            async with self.client_pool.async_client.stream("GET", url, follow_redirects=True) as response:
+                status = response.status_code
+                content_type = response.headers.get("content-type", "")
+                if status >= 400 or "html" not in content_type.lower():
+                    return None, response.headers, status
+                try:
+                    if int(response.headers.get("content-length") or 0) > self.max_bytes:
+                        return None, response.headers, status
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+                        if len(body) > self.max_bytes:
+                            return None, response.headers, status
+                    return body.decode(response.encoding or "utf-8", errors="replace"), response.headers, status
+                except (ValueError, LookupError):
+                    # Malformed content-length or an unknown charset: a failed probe, not a reason to crash
+                    return None, response.headers, status
+        except httpx.HTTPError:
+            return None, None, None
+
+    def _to_page(self, url: str, html: str, config: CrawlerRunConfig) -> FetchedPage:
+        scraped: Any = self._scraping_strategy.scrap(
+            url,
+            html,
+            word_count_threshold=getattr(config, 'word_count_threshold', 1),
+            css_selector=getattr(config, 'css_selector', None)
+        )
+        cleaned_html = scraped.get('cleaned_html', '') if isinstance(scraped, dict) else getattr(scraped, 'cleaned_html', '')
+        markdown = config.markdown_generator.generate_markdown(cleaned_html=cleaned_html, base_url=url)
+        return FetchedPage(
+            url=url,
+            html=html,
+            markdown_v2=PageMarkdown(
+                raw_markdown=markdown.raw_markdown or "",
+                markdown_with_citations=markdown.markdown_with_citations or "",
+                fit_markdown=getattr(markdown, 'fit_markdown', None) or ""
+            )
+        )
+
+    async def aclose(self) -> None:
+        await self.client_pool.aclose()
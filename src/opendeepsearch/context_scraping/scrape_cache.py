@@ -0,0 +1,216 @@
+"""
+Persistent scrape cache: fetched pages compressed on local disk, keyed by canonical URL.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from opendeepsearch.serp_search.serp_search import canonical_url
+from opendeepsearch.context_scraping.http_fetcher import FetchedPage, PageMarkdown
+from opendeepsearch.context_scraping.scrape_scheduler import url_domain
+
+@dataclass
+class CachedPage:
+    """A cache entry: the stored page plus what is needed to decide whether to reuse it"""
+    url: str
+    page: FetchedPage
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+class ScrapeCache:
+    """
+    Content-addressed scrape cache in an SQLite file.
+
+    Pages are keyed by canonical URL and point at a zlib-compressed blob of their markdown
+    (and, optionally, HTML) named by its SHA-256, so mirrors serving identical content share
+    one blob. Entries are fresh for the TTL of their domain; stale entries can still be
+    reused after an ETag/Last-Modified revalidation. When the blobs exceed `max_bytes`, the
+    least recently used pages are dropped along with blobs no other page references.
+
+    Args:
+        path: SQLite file (created if missing)
+        max_bytes: Cap on the compressed size of all stored blobs
+        default_ttl: Seconds a page stays fresh
+        domain_ttls: Per-domain TTLs; a domain also matches its subdomains
+            (e.g. {"aave.com": 86400} covers docs.aave.com)
+        compression_level: zlib level (1 fastest, 9 smallest)
+    """
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 3600,
+        domain_ttls: Optional[Dict[str, float]] = None,
+        compression_level: int = 6
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.domain_ttls = {domain.lower(): ttl for domain, ttl in (domain_ttls or {}).items()}
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0, "writes": 0, "evictions": 0}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_pages ("
+            "key TEXT PRIMARY KEY, url TEXT, content_hash TEXT, etag TEXT, last_modified TEXT, "
+            "expires_at REAL, last_used REAL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS scrape_blobs (hash TEXT PRIMARY KEY, size INTEGER, data BLOB)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS scrape_pages_last_used ON scrape_pages (last_used)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS scrape_pages_content_hash ON scrape_pages (content_hash)")
+        self._db.commit()
+
+    def ttl_for(self, url: str) -> float:
+        """TTL of the most specific matching domain rule, else default_ttl"""
+        domain = url_domain(url)
+        while domain:
+            if domain in self.domain_ttls:
+                return self.domain_ttls[domain]
+            domain = domain.partition(".")[2]
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """The stored page for `url`, fresh or not, or None"""
+        key = canonical_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT p.etag, p.last_modified, p.expires_at, b.data FROM scrape_pages p "
+                "JOIN scrape_blobs b ON b.hash = p.content_hash WHERE p.key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE scrape_pages SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        etag, last_modified, expires_at, data = row
+        stored = json.loads(zlib.decompress(data))
+        page = FetchedPage(
+            url=url,
+            html=stored.get("html", ""),
+            markdown_v2=PageMarkdown(**stored["markdown"]),
+            etag=etag,
+            last_modified=last_modified
+        )
+        entry = CachedPage(url, page, etag, last_modified, expires_at)
+        with self._lock:
+            self._stats["hits" if entry.fresh else "stale"] += 1
+        return entry
+
+    def put(self, url: str, page: Any, include_html: bool = True) -> None:
+        """
+        Store a successful fetch (a FetchedPage or Crawl4AI result). Validators come from the
+        page's etag/last_modified or, for browser results, its response headers.
+        """
+        markdown = page.markdown_v2
+        stored: Dict[str, Any] = {"markdown": {
+            "raw_markdown": markdown.raw_markdown or "",
+            "markdown_with_citations": markdown.markdown_with_citations or "",
+            "fit_markdown": getattr(markdown, 'fit_markdown', None) or "",
+        }}
+        if include_html:
+            stored["html"] = page.html or ""
+        payload = json.dumps(stored, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        content_hash = hashlib.sha256(payload).hexdigest()
+        etag, last_modified = self._validators(page)
+        now = time.time()
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM scrape_blobs WHERE hash = ?", (content_hash,)).fetchone()
+            if exists is None:
+                data = zlib.compress(payload, self.compression_level)
+                self._db.execute(
+                    "INSERT INTO scrape_blobs (hash, size, data) VALUES (?, ?, ?)", (content_hash, len(data), data)
+                )
+            previous = self._db.execute(
+                "SELECT content_hash FROM scrape_pages WHERE key = ?", (canonical_url(url),)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO scrape_pages "
+                "(key, url, content_hash, etag, last_modified, expires_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), url, content_hash, etag, last_modified, now + self.ttl_for(url), now)
+            )
+            if previous is not None and previous[0] != content_hash:
+                self._drop_orphan_blob(previous[0])
+            self._stats["writes"] += 1
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, url: str) -> None:
+        """Mark a revalidated page fresh for another TTL"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE scrape_pages SET expires_at = ? WHERE key = ?",
+                (time.time() + self.ttl_for(url), canonical_url(url))
+            )
+            self._db.commit()
+            self._stats["revalidated"] += 1
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            key = canonical_url(url)
+            row = self._db.execute("SELECT content_hash FROM scrape_pages WHERE key = ?", (key,)).fetchone()
+            self._db.execute("DELETE FROM scrape_pages WHERE key = ?", (key,))
+            if row is not None:
+                self._drop_orphan_blob(row[0])
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM scrape_pages")
+            self._db.execute("DELETE FROM scrape_blobs")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus stored pages, blobs and compressed bytes"""
+        with self._lock:
+            pages = self._db.execute("SELECT COUNT(*) FROM scrape_pages").fetchone()[0]
+            blobs, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scrape_blobs").fetchone()
+            return {**self._stats, "pages": pages, "blobs": blobs, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _validators(page: Any):
+        etag = getattr(page, 'etag', None)
+        last_modified = getattr(page, 'last_modified', None)
+        if etag is None and last_modified is None:
+            headers = {key.lower(): value for key, value in (getattr(page, 'response_headers', None) or {}).items()}
+            etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        return etag, last_modified
+
+    def _drop_orphan_blob(self, content_hash: str) -> None:
+        referenced = self._db.execute(
+            "SELECT 1 FROM scrape_pages WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        if referenced is None:
+            self._db.execute("DELETE FROM scrape_blobs WHERE hash = ?", (content_hash,))
+
+    def _evict(self) -> None:
+        """Drop least recently used pages until the blobs fit in max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM scrape_blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, content_hash FROM scrape_pages ORDER BY last_used").fetchall()
+        for key, content_hash in rows:
+            self._db.execute("DELETE FROM scrape_pages WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            size = self._db.execute("SELECT size FROM scrape_blobs WHERE hash = ?", (content_hash,)).fetchone()
+            self._drop_orphan_blob(content_hash)
+            still_stored = self._db.execute("SELECT 1 FROM scrape_blobs WHERE hash = ?", (content_hash,)).fetchone()
+            if size is not None and still_stored is None:
+                total -= size[0]
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,137 @@
+"""
+Priority scheduling of page scrapes with global and per-domain limits.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+def url_domain(url: str) -> str:
+    """Host a URL is scheduled under ('www.' is ignored)"""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+class _LoopState:
+    __slots__ = ('active', 'domain_active', 'next_start', 'waiters', 'timer')
+
+    def __init__(self):
+        self.active = 0
+        self.domain_active: Dict[str, int] = defaultdict(int)
+        self.next_start: Dict[str, float] = {}
+        self.waiters: List[Tuple[float, int, str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+class ScrapeScheduler:
+    """
+    Grants scrape slots in priority order under a global and a per-domain cap.
+
+    Lower priority values go first (callers use the SERP rank), so the top results of
+    every concurrent query are scraped before anyone's tail. A waiter held back only by
+    its domain's cap or politeness delay doesn't block waiters for other domains. Starts
+    on the same domain are spaced at least `politeness_delay_s` apart. Like
+    LoopBoundSemaphore, the state is kept per event loop.
+
+    Args:
+        max_concurrent: Scrapes in flight across all domains (None = unlimited)
+        max_per_domain: Scrapes in flight per domain (None = unlimited)
+        politeness_delay_s: Minimum time between two scrape starts on the same domain
+    """
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_per_domain: Optional[int] = 2,
+        politeness_delay_s: float = 0.25
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_domain = max_per_domain
+        self.politeness_delay_s = politeness_delay_s
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _LoopState()
+            return state
+
+    def _dispatch(self, state: _LoopState) -> None:
+        """Grant every waiter that can start now, highest priority first"""
+        state.timer = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        waiting = []
+        earliest = None
+        for entry in sorted(state.waiters):
+            _, _, domain, future = entry
+            if future.done():
+                continue
+            if self.max_concurrent and state.active >= self.max_concurrent:
+                waiting.append(entry)
+                continue
+            if self.max_per_domain and state.domain_active[domain] >= self.max_per_domain:
+                waiting.append(entry)
+                continue
+            ready_at = state.next_start.get(domain, 0.0)
+            if ready_at > now:
+                waiting.append(entry)
+                earliest = ready_at if earliest is None else min(earliest, ready_at)
+                continue
+            state.active += 1
+            state.domain_active[domain] += 1
+            state.next_start[domain] = now + self.politeness_delay_s
+            future.set_result(None)
+        heapq.heapify(waiting)
+        state.waiters = waiting
+        if earliest is not None:
+            state.timer = loop.call_at(earliest, self._dispatch, state)
+
+    def _release(self, state: _LoopState, domain: str) -> None:
+        state.active -= 1
+        state.domain_active[domain] -= 1
+        if not state.domain_active[domain]:
+            del state.domain_active[domain]
+        if state.timer is not None:
+            state.timer.cancel()
+        self._dispatch(state)
+
+    @asynccontextmanager
+    async def slot(self, url: str, priority: float = 0) -> AsyncIterator[None]:
+        """Hold a scrape slot for `url` (lower priority values are served first)"""
+        state = self._state()
+        domain = url_domain(url)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(state.waiters, (priority, next(self._seq), domain, future))
+        if state.timer is not None:
+            state.timer.cancel()
+        self._dispatch(state)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled
+                self._release(state, domain)
+            else:
+                future.cancel()
+            raise
+        try:
+            yield
+        finally:
+            self._release(state, domain)
+
+    def stats(self) -> Dict[str, object]:
+        """Slots in use and waiters on the running loop"""
+        state = self._state()
+        return {
+            "active": state.active,
+            "waiting": sum(not entry[3].done() for entry in state.waiters),
+            "per_domain": dict(state.domain_active),
+        }
@@ -3,6 +3,7 @@ from typing import List, Tuple
 import fasttext
 from huggingface_hub import hf_hub_download
 import wikipediaapi
+from opendeepsearch.tracing import traced
 
 # Load the model
 model = fasttext.load_model(hf_hub_download("kenhktsui/llm-data-textbook-quality-fasttext-classifer-v2", "model.bin"))
@@ -59,6 +60,7 @@ def clean_markdown_links(text: str, min_quality_score: float = 0.2) -> Tuple[str
     
     return cleaned_text, quality_score
 
+@traced("filter.quality", measure=lambda result, text, *args, **kwargs: {"bytes": len(text), "kept_bytes": len(result)})
 def filter_quality_content(text: str, min_quality_score: float = 0.2) -> str:
     """
     Filter content based on quality and returns concatenated quality content
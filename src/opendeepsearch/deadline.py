@@ -0,0 +1,78 @@
+"""
+Request deadlines and the degradation policy applied when a deadline runs short.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+@dataclass
+class DegradationPolicy:
+    """
+    How OpenDeepSearchAgent trades quality for latency under a deadline.
+
+    The LLM call keeps `llm_reserve_s` of the budget (at most `max_llm_reserve_fraction` of
+    what is left, so short deadlines still leave time to search); search and scraping get the rest.
+    """
+    llm_reserve_s: float = 3.0             # Budget held back for the completion
+    max_llm_reserve_fraction: float = 0.5  # Cap on the reserve as a share of the remaining budget
+    min_scrape_s: float = 1.0              # Below this, skip scraping and answer from SERP snippets
+    reduce_scrape_below_s: float = 3.0     # Below this, scrape a single source with fewer rerank candidates
+    reduced_rerank_candidates: int = 16    # Chunks embedded per page when reduced
+    llm_tokens_per_s: float = 40.0         # Assumed generation speed used to cap max_tokens
+    min_completion_tokens: int = 64        # Never cap generation below this
+    min_llm_timeout_s: float = 1.0         # Floor for the completion timeout once the budget is spent
+
+    def llm_reserve(self, remaining: float) -> float:
+        """Seconds to hold back for the completion when `remaining` seconds are left"""
+        return min(self.llm_reserve_s, max(0.0, remaining) * self.max_llm_reserve_fraction)
+
+class Deadline:
+    """
+    Absolute deadline for one request, plus a record of the degradations applied to meet it.
+
+    Args:
+        timeout_s: Seconds from now until the deadline
+    """
+    def __init__(self, timeout_s: float):
+        self.timeout_s = timeout_s
+        self.expires_at = time.monotonic() + timeout_s
+        self.degradations: List[str] = []
+
+    @classmethod
+    def from_timeout(cls, timeout_s: Optional[float]) -> Optional['Deadline']:
+        return None if timeout_s is None else cls(timeout_s)
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)"""
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def degrade(self, name: str) -> None:
+        """Record that a stage was degraded to stay within the deadline"""
+        if name not in self.degradations:
+            self.degradations.append(name)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s, degradations={self.degradations})"
+
+class DeadlineAnswer(str):
+    """
+    Answer returned by ask() when it ran under a deadline. It is a plain string to existing
+    callers and also carries the degradations applied to meet the deadline.
+
+    Attributes:
+        degradations: Degradation names in the order they were applied (empty if none)
+    """
+    degradations: Tuple[str, ...]
+
+    def __new__(cls, answer: Optional[str], degradations: Sequence[str] = ()) -> 'DeadlineAnswer':
+        result = super().__new__(cls, answer or "")
+        result.degradations = tuple(degradations)
+        return result
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.degradations)
@@ -1,13 +1,22 @@
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Literal, List, AsyncIterator, Iterator, Tuple, Union, Callable
 from opendeepsearch.serp_search.serp_search import create_search_api, SearchAPI
 from opendeepsearch.context_building.process_sources_pro import SourceProcessor
 from opendeepsearch.context_building.build_context import build_context
-from litellm import completion, utils
+from opendeepsearch.serp_search.search_cache import normalize_query
+from opendeepsearch.singleflight import SingleFlight
+from opendeepsearch.answer_cache import SemanticAnswerCache
+from opendeepsearch.concurrency import LoopBoundSemaphore
+from opendeepsearch.background_loop import BackgroundLoop, default_background_loop
+from opendeepsearch import tracing
+from opendeepsearch.deadline import Deadline, DeadlineAnswer, DegradationPolicy
+from opendeepsearch.speculative import SpeculativeAnswer
+from litellm import acompletion, utils
 from dotenv import load_dotenv
 import os
 from opendeepsearch.prompts import SEARCH_SYSTEM_PROMPT
 import asyncio
-import nest_asyncio
+import contextlib
+import time
 load_dotenv()
 
 # OpenRouter API key is loaded from environment variables
@@ -18,14 +27,21 @@ class OpenDeepSearchAgent:
         self,
         model: Optional[str] = None, #We use LiteLLM to call the model
         system_prompt: Optional[str] = SEARCH_SYSTEM_PROMPT,
-        search_provider: Literal["serper", "searxng"] = "serper",
+        search_provider: Literal["serper", "searxng", "hedged", "federated"] = "serper",
         serper_api_key: Optional[str] = None,
         searxng_instance_url: Optional[str] = None,
         searxng_api_key: Optional[str] = None,
+        search_cache_config: Optional[Dict[str, Any]] = None,
+        answer_cache_config: Optional[Dict[str, Any]] = None,
         source_processor_config: Optional[Dict[str, Any]] = None,
         temperature: float = 0.2, # Slight variation while maintaining reliability
         top_p: float = 0.3, # Focus on high-confidence tokens
         reranker: Optional[str] = "None", # Optional reranker identifier
+        coalesce_requests: bool = False,
+        max_concurrent_llm_calls: Optional[int] = 8,
+        background_loop: Optional[BackgroundLoop] = None,
+        max_context_tokens: Optional[int] = None,
+        degradation_policy: Optional[DegradationPolicy] = None,
     ):
         """
         Initialize an OpenDeepSearch agent that combines web search, content processing, and LLM capabilities.
@@ -37,31 +53,64 @@ class OpenDeepSearchAgent:
             model (str): The identifier for the language model to use (compatible with LiteLLM).
             system_prompt (str, optional): Custom system prompt for the language model. If not provided,
                 uses a default prompt that instructs the model to answer based on context.
-            search_provider (str, optional): The search provider to use ('serper' or 'searxng'). Default is 'serper'.
+            search_provider (str, optional): The search provider to use ('serper', 'searxng', 'hedged' or
+                'federated'). 'hedged' and 'federated' combine Serper and SearXNG. Default is 'serper'.
             serper_api_key (str, optional): API key for SerperAPI. Required if search_provider is 'serper' and
                 SERPER_API_KEY environment variable is not set.
             searxng_instance_url (str, optional): URL of the SearXNG instance. Required if search_provider is 'searxng'
                 and SEARXNG_INSTANCE_URL environment variable is not set.
             searxng_api_key (str, optional): API key for SearXNG instance. Optional even if search_provider is 'searxng'.
+            search_cache_config (Dict[str, Any], optional): Enables the SERP result cache when provided.
+                Passed to CachedSearchAPI; supports max_entries, ttl_rules, default_ttl and sqlite_path.
+            answer_cache_config (Dict[str, Any], optional): Enables the semantic answer cache when
+                provided. Paraphrases of a recently answered question get the cached answer without
+                searching or calling the LLM. Passed to SemanticAnswerCache; supports threshold,
+                ttl_rules, default_ttl, max_entries, sqlite_path, store and embedder (defaults to
+                the reranker's embeddings).
             source_processor_config (Dict[str, Any], optional): Configuration dictionary for the
                 SourceProcessor. Supports the following options:
                 - strategies (List[str]): Content extraction strategies to use
                 - filter_content (bool): Whether to enable content filtering
                 - top_results (int): Number of top results to process
+                - max_concurrent_scrapes (int): Cap on page scrapes in flight across all
+                  concurrent asks (default 16)
+                - max_concurrent_per_domain (int): Cap on page scrapes in flight per domain (default 2)
+                - politeness_delay_s (float): Minimum time between scrape starts on one domain
+                - browser_pool_config (BrowserPoolConfig): Size and recycling of the pooled browsers
+                - fetch_mode (str): "auto" (plain HTTP first, browser for JavaScript pages),
+                  "browser" or "http"
+                - scrape_cache (ScrapeCache or str): Persistent scrape cache, or the path of
+                  its SQLite file
+                - scrape_cache_mode (CacheMode): How the scrape cache is used (default ENABLED)
             temperature (float, default=0.2): Controls randomness in model outputs. Lower values make
                 the output more focused and deterministic.
             top_p (float, default=0.3): Controls nucleus sampling for model outputs. Lower values make
                 the output more focused on high-probability tokens.
             reranker (str, optional): Identifier for the reranker to use. If not provided,
                 uses the default reranker from SourceProcessor.
+            coalesce_requests (bool, default=False): When enabled, concurrent identical searches and
+                ask() calls with the same normalized query share a single in-flight execution.
+            max_concurrent_llm_calls (int, optional, default=8): Maximum number of LLM completions
+                (including streams) in flight at once per event loop. None disables the limit.
+            background_loop (BackgroundLoop, optional): Long-lived loop that ask_sync() and
+                ask_stream_sync() run on. Defaults to the process-wide loop, so HTTP pools and
+                other loop-bound resources are reused across calls from any thread.
+            max_context_tokens (int, optional): Token budget for the context sent to the LLM.
+                Answer box, snippets and scraped chunks are packed by rerank score, truncating
+                or dropping the lowest-value text first. None keeps the unbounded context.
+            degradation_policy (DegradationPolicy, optional): Thresholds used to degrade asks
+                that run with a deadline (timeout_s). Defaults to DegradationPolicy().
         """
         # Initialize search API based on provider
         self.serp_search = create_search_api(
             search_provider=search_provider,
             serper_api_key=serper_api_key,
             searxng_instance_url=searxng_instance_url,
-            searxng_api_key=searxng_api_key
+            searxng_api_key=searxng_api_key,
+            cache_config=search_cache_config,
+            coalesce=coalesce_requests
         )
+        self._ask_flight = SingleFlight() if coalesce_requests else None
 
         # Update source_processor_config with reranker if provided
         if source_processor_config is None:
@@ -72,10 +121,20 @@ class OpenDeepSearchAgent:
         # Initialize SourceProcessor with provided config or defaults
         self.source_processor = SourceProcessor(**source_processor_config)
 
+        self.answer_cache = None
+        if answer_cache_config is not None:
+            answer_cache_config = dict(answer_cache_config)
+            embedder = answer_cache_config.pop('embedder', None) or self.source_processor.semantic_searcher.embed
+            self.answer_cache = SemanticAnswerCache(embedder, **answer_cache_config)
+
         # Initialize LLM settings
         self.model = model if model is not None else os.getenv("LITELLM_SEARCH_MODEL_ID", os.getenv("LITELLM_MODEL_ID", "openrouter/google/gemini-2.0-flash-001"))
         self.temperature = temperature
         self.top_p = top_p
+        self._llm_limit = LoopBoundSemaphore(max_concurrent_llm_calls)
+        self.background_loop = background_loop or default_background_loop()
+        self.max_context_tokens = max_context_tokens
+        self.degradation_policy = degradation_policy or DegradationPolicy()
         
         # Use DeFi-specific system prompt for better context
         self.system_prompt = system_prompt if system_prompt != SEARCH_SYSTEM_PROMPT else """
@@ -124,7 +183,8 @@ You are a DeFi safety assistant with access to real-time web data. Your role is
         self,
         query: str,
         max_sources: int = 2,
-        pro_mode: bool = False
+        pro_mode: bool = False,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Performs a web search and builds a context from the search results.
@@ -139,13 +199,104 @@ You are a DeFi safety assistant with access to real-time web data. Your role is
                 when it's smaller.
             pro_mode (bool, default=False): When enabled, performs a deeper search and more
                 thorough content processing.
+            deadline (Deadline, optional): When given, search and scraping only use the budget
+                left after reserving time for the LLM, degrading as described in ask().
 
         Returns:
             str: A formatted context string built from the processed search results.
         """
+        if deadline is not None:
+            return await self._search_and_build_context_within(query, max_sources, pro_mode, deadline)
+
         # Get sources from SERP
-        sources = self.serp_search.get_sources(query)
+        sources = await self.serp_search.aget_sources(query)
+        return await self._build_context_from_sources(query, sources, max_sources, pro_mode)
+
+    async def _search_and_build_context_within(
+        self,
+        query: str,
+        max_sources: int,
+        pro_mode: bool,
+        deadline: Deadline
+    ) -> str:
+        policy = self.degradation_policy
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            deadline.degrade("serp_timeout")
+            return ""
+        try:
+            sources = await asyncio.wait_for(
+                self.serp_search.aget_sources(query),
+                timeout=remaining - policy.llm_reserve(remaining)
+            )
+        except asyncio.TimeoutError:
+            deadline.degrade("serp_timeout")
+            return ""
+        if sources.failed:
+            deadline.degrade("serp_failed")
+            return ""
+
+        remaining = deadline.remaining()
+        scrape_budget = remaining - policy.llm_reserve(remaining)
+        if scrape_budget < policy.min_scrape_s:
+            deadline.degrade("skipped_scrape")
+            return build_context(sources.data, self.max_context_tokens)
+
+        max_rerank_candidates = None
+        if scrape_budget < policy.reduce_scrape_below_s:
+            if max_sources > 1:
+                max_sources = 1
+                deadline.degrade("fewer_sources")
+            max_rerank_candidates = policy.reduced_rerank_candidates
+            deadline.degrade("fewer_rerank_candidates")
+
+        try:
+            processed_sources = await asyncio.wait_for(
+                self.source_processor.process_sources(
+                    sources, max_sources, query, pro_mode, max_rerank_candidates=max_rerank_candidates
+                ),
+                timeout=scrape_budget
+            )
+        except asyncio.TimeoutError:
+            # Pages that finished in time were already merged into the sources in place
+            deadline.degrade("scrape_timeout")
+            processed_sources = sources.data
+        return build_context(processed_sources, self.max_context_tokens)
+
+    async def search_and_build_context_many(
+        self,
+        queries: List[str],
+        max_sources: int = 2,
+        pro_mode: bool = False,
+        concurrency: int = 8
+    ) -> List[str]:
+        """
+        Bulk version of search_and_build_context().
+
+        The SERP lookups go out together through the provider's batch API, then at most
+        `concurrency` queries are scraped and reranked at once (page scrapes are further
+        capped by the source processor's global scrape limit).
+
+        Args:
+            queries (List[str]): The search queries to execute.
+            max_sources (int, default=2): Maximum number of sources to process per query.
+            pro_mode (bool, default=False): When enabled, performs a deeper search and more
+                thorough content processing.
+            concurrency (int, default=8): Maximum number of queries processed at once.
 
+        Returns:
+            List[str]: One context string per query, in input order.
+        """
+        sources_list = await self.serp_search.aget_sources_many(queries, concurrency=concurrency)
+        limit = asyncio.Semaphore(concurrency)
+
+        async def build(query, sources) -> str:
+            async with limit:
+                return await self._build_context_from_sources(query, sources, max_sources, pro_mode)
+
+        return await asyncio.gather(*(build(q, s) for q, s in zip(queries, sources_list)))
+
+    async def _build_context_from_sources(self, query: str, sources, max_sources: int, pro_mode: bool) -> str:
         # Process sources
         processed_sources = await self.source_processor.process_sources(
             sources,
@@ -155,13 +306,15 @@ You are a DeFi safety assistant with access to real-time web data. Your role is
         )
 
         # Build and return context
-        return build_context(processed_sources)
+        return build_context(processed_sources, self.max_context_tokens)
 
     async def ask(
         self,
         query: str,
         max_sources: int = 2,
         pro_mode: bool = False,
+        timeout_s: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> str:
         """
         Searches for information and generates an AI response to the query.
@@ -175,45 +328,363 @@ You are a DeFi safety assistant with access to real-time web data. Your role is
             max_sources (int, default=2): Maximum number of sources to include in the context.
             pro_mode (bool, default=False): When enabled, performs a more comprehensive search
                 and analysis of sources.
+            timeout_s (float, optional): Time budget for the whole ask. Shorthand for
+                deadline=Deadline(timeout_s).
+            deadline (Deadline, optional): Deadline to answer within. Each stage gets the budget
+                that remains; when it runs short the agent answers from SERP snippets instead of
+                scraping, scrapes fewer sources and rerank candidates, and caps generated tokens.
 
         Returns:
             str: An AI-generated response that answers the query based on the gathered context.
+                With a timeout or deadline, a DeadlineAnswer whose `degradations` lists what
+                was degraded to meet it.
         """
-        # Get context from search results
-        context = await self.search_and_build_context(query, max_sources, pro_mode)
-        # Prepare messages for the LLM
-        messages = [
+        if deadline is None:
+            deadline = Deadline.from_timeout(timeout_s)
+        if deadline is not None:
+            # Callers with different budgets can't share one execution
+            answer = await self._ask(query, max_sources, pro_mode, deadline)
+            return DeadlineAnswer(answer, deadline.degradations)
+        if self._ask_flight is not None:
+            return await self._ask_flight.do(
+                (normalize_query(query), max_sources, pro_mode),
+                lambda: self._ask(query, max_sources, pro_mode)
+            )
+        return await self._ask(query, max_sources, pro_mode)
+
+    async def _ask(
+        self,
+        query: str,
+        max_sources: int,
+        pro_mode: bool,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
+        with tracing.span("ask", max_sources=max_sources, pro_mode=pro_mode) as ask_span:
+            if self.answer_cache is not None:
+                cached = await self.answer_cache.aget(query, self._cache_variant(max_sources, pro_mode))
+                if cached is not None:
+                    ask_span.set(outcome="cache_hit")
+                    return cached
+
+            # Get context from search results
+            context = await self.search_and_build_context(query, max_sources, pro_mode, deadline)
+            answer = await self._complete(query, context, deadline)
+
+            if deadline is not None and deadline.degradations:
+                ask_span.set(outcome="degraded", degradations=list(deadline.degradations))
+            elif self.answer_cache is not None:
+                # Degraded answers are not cached, so they don't outlive the slow moment
+                await self.answer_cache.aput(query, answer, self._cache_variant(max_sources, pro_mode))
+            return answer
+
+    async def _complete(self, query: str, context: str, deadline: Optional[Deadline] = None) -> str:
+        """Get a completion from the LLM without blocking the event loop"""
+        async with self._llm_limit:
+            with tracing.span("llm.completion", model=self.model) as llm_span:
+                response = await acompletion(
+                    model=self.model,
+                    messages=self._build_messages(query, context),
+                    temperature=self.temperature,
+                    top_p=self.top_p,
+                    **self._completion_limits(deadline)
+                )
+                answer = response.choices[0].message.content
+                usage = getattr(response, 'usage', None)
+                llm_span.set(
+                    items=getattr(usage, 'completion_tokens', None),
+                    bytes=len(answer or ""),
+                    prompt_tokens=getattr(usage, 'prompt_tokens', None)
+                )
+        return answer
+
+    async def ask_speculative(
+        self,
+        query: str,
+        max_sources: int = 2,
+        pro_mode: bool = True,
+        on_refined: Optional[Callable[[str], None]] = None,
+    ) -> SpeculativeAnswer:
+        """
+        Answers from SERP snippets right away and refines the answer in the background.
+
+        The draft is generated from the snippets and answer box of a single SERP lookup,
+        while scraping and reranking of the same results start immediately in a background
+        task that ends with a second completion over the full context. Only the refined
+        answer is stored in the answer cache; a cache hit returns an already refined handle.
+        If the search itself fails, there is nothing to refine: the handle comes back with
+        the draft as its final answer and nothing is cached.
+
+        Args:
+            query (str): The question or query to answer.
+            max_sources (int, default=2): Maximum number of sources scraped for the refinement.
+            pro_mode (bool, default=True): When enabled, the refinement performs a more
+                comprehensive analysis of sources.
+            on_refined (Callable[[str], None], optional): Called with the refined answer once
+                it is ready, on the event loop's thread.
+
+        Returns:
+            SpeculativeAnswer: Handle with the draft in `.draft`; await `.refined()` (or call
+                `.result()` from another thread) for the refined answer.
+        """
+        variant = self._cache_variant(max_sources, pro_mode)
+        with tracing.span("ask.speculative", max_sources=max_sources, pro_mode=pro_mode) as draft_span:
+            if self.answer_cache is not None:
+                cached = await self.answer_cache.aget(query, variant)
+                if cached is not None:
+                    draft_span.set(outcome="cache_hit")
+                    handle = SpeculativeAnswer(query, cached)
+                    if on_refined is not None:
+                        handle.add_done_callback(on_refined)
+                    return handle
+
+            sources = await self.serp_search.aget_sources(query)
+            # Snapshot the snippet context before the refinement starts filling in page content
+            snippet_context = build_context(sources.data if sources.success else {}, self.max_context_tokens)
+            if sources.failed:
+                # Nothing to scrape: the draft is final and is not worth caching
+                draft_span.set(outcome="serp_failed")
+                refinement = None
+            else:
+                refinement = asyncio.ensure_future(self._refine(query, sources, max_sources, pro_mode))
+            try:
+                draft = await self._complete(query, snippet_context)
+            except BaseException:
+                if refinement is not None:
+                    refinement.cancel()
+                raise
+
+        handle = SpeculativeAnswer(query, draft, refinement)
+        if on_refined is not None:
+            handle.add_done_callback(on_refined)
+        return handle
+
+    async def _refine(self, query: str, sources, max_sources: int, pro_mode: bool) -> str:
+        with tracing.span("ask.refine", max_sources=max_sources, pro_mode=pro_mode):
+            context = await self._build_context_from_sources(query, sources, max_sources, pro_mode)
+            answer = await self._complete(query, context)
+            if self.answer_cache is not None:
+                await self.answer_cache.aput(query, answer, self._cache_variant(max_sources, pro_mode))
+            return answer
+
+    def _completion_limits(self, deadline: Optional[Deadline]) -> Dict[str, Any]:
+        """Timeout and, when the budget is short, max_tokens for a completion under a deadline"""
+        if deadline is None:
+            return {}
+        policy = self.degradation_policy
+        remaining = deadline.remaining()
+        limits: Dict[str, Any] = {"timeout": max(remaining, policy.min_llm_timeout_s)}
+        if remaining < policy.llm_reserve_s:
+            limits["max_tokens"] = max(policy.min_completion_tokens, int(remaining * policy.llm_tokens_per_s))
+            deadline.degrade("capped_tokens")
+        return limits
+
+    @staticmethod
+    def _cache_variant(max_sources: int, pro_mode: bool) -> str:
+        return f"{max_sources}|{'pro' if pro_mode else 'default'}"
+
+    def _build_messages(self, query: str, context: str) -> List[Dict[str, str]]:
+        return [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query}"}
         ]
-        # Get completion from LLM
-        response = completion(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-            top_p=self.top_p
-        )
 
-        return response.choices[0].message.content
+    async def ask_stream(
+        self,
+        query: str,
+        max_sources: int = 2,
+        pro_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming version of ask(): yields the answer in chunks as the LLM generates it.
+
+        Search and context building run first, exactly as in ask(); the completion is then
+        requested in LiteLLM's streaming mode so the first tokens can be forwarded to the
+        client while the rest of the answer is still being generated. Streams are never
+        coalesced, since each caller consumes its own token sequence. An answer cache hit
+        is yielded as a single chunk.
+
+        Args:
+            query (str): The question or query to answer.
+            max_sources (int, default=2): Maximum number of sources to include in the context.
+            pro_mode (bool, default=False): When enabled, performs a more comprehensive search
+                and analysis of sources.
+
+        Yields:
+            str: Consecutive pieces of the AI-generated response.
+        """
+        variant = self._cache_variant(max_sources, pro_mode)
+        if self.answer_cache is not None:
+            cached = await self.answer_cache.aget(query, variant)
+            if cached is not None:
+                yield cached
+                return
+
+        context = await self.search_and_build_context(query, max_sources, pro_mode)
+        tokens = []
+        # The slot is held until the stream is exhausted or the consumer closes it
+        async with self._llm_limit:
+            with tracing.span("llm.completion", model=self.model, stream=True) as llm_span:
+                started = time.perf_counter()
+                response = await acompletion(
+                    model=self.model,
+                    messages=self._build_messages(query, context),
+                    temperature=self.temperature,
+                    top_p=self.top_p,
+                    stream=True
+                )
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        if not tokens:
+                            llm_span.set(ttft_s=time.perf_counter() - started)
+                        tokens.append(token)
+                        yield token
+                llm_span.set(items=len(tokens), bytes=sum(len(token) for token in tokens))
+
+        if self.answer_cache is not None:
+            await self.answer_cache.aput(query, "".join(tokens), variant)
+
+    async def ask_many(
+        self,
+        queries: List[str],
+        max_sources: int = 2,
+        pro_mode: bool = False,
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Answers many queries with at most `concurrency` asks in flight.
+
+        All asks share this agent's SERP client, scraper and reranker, so HTTP pools are
+        reused and the agent's global limits on LLM calls and page scrapes apply across
+        the whole batch.
+
+        Args:
+            queries (List[str]): The questions to answer.
+            max_sources (int, default=2): Maximum number of sources to include per context.
+            pro_mode (bool, default=False): When enabled, performs a more comprehensive search
+                and analysis of sources.
+            concurrency (int, default=8): Maximum number of asks running at once.
+            return_exceptions (bool, default=False): Return a failed ask's exception in its
+                slot instead of raising it (and cancelling the rest of the batch).
+
+        Returns:
+            List: One answer per query, in input order.
+        """
+        answers: List[Union[str, BaseException]] = [None] * len(queries)
+        # Closing the generator on the way out cancels the asks still running
+        async with contextlib.aclosing(
+            self.ask_many_as_completed(queries, max_sources, pro_mode, concurrency)
+        ) as completed:
+            async for i, answer in completed:
+                if isinstance(answer, BaseException) and not return_exceptions:
+                    raise answer
+                answers[i] = answer
+        return answers
+
+    async def ask_many_as_completed(
+        self,
+        queries: List[str],
+        max_sources: int = 2,
+        pro_mode: bool = False,
+        concurrency: int = 8,
+    ) -> AsyncIterator[Tuple[int, Union[str, BaseException]]]:
+        """
+        Like ask_many(), but yields (index, answer) pairs as soon as each ask finishes.
+        A failed ask yields its exception instead of an answer.
+        """
+        limit = asyncio.Semaphore(concurrency)
+
+        async def run(i: int, query: str) -> Tuple[int, Union[str, BaseException]]:
+            async with limit:
+                try:
+                    return i, await self.ask(query, max_sources, pro_mode)
+                except Exception as e:
+                    return i, e
+
+        tasks = [asyncio.ensure_future(run(i, query)) for i, query in enumerate(queries)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     def ask_sync(
         self,
         query: str,
         max_sources: int = 2,
         pro_mode: bool = False,
+        timeout_s: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> str:
         """
-        Synchronous version of ask() method.
+        Synchronous version of ask() method. Safe to call from any thread (including
+        one with a running loop, e.g. Jupyter); the work runs on the background loop.
+        With a timeout or deadline the result is a DeadlineAnswer, as for ask().
         """
+        return self.background_loop.run(self.ask(query, max_sources, pro_mode, timeout_s, deadline))
+
+    def ask_speculative_sync(
+        self,
+        query: str,
+        max_sources: int = 2,
+        pro_mode: bool = True,
+        on_refined: Optional[Callable[[str], None]] = None,
+    ) -> SpeculativeAnswer:
+        """
+        Synchronous version of ask_speculative(). Returns once the draft is ready; the
+        refinement keeps running on the background loop, so `.result()` can be called on the
+        returned handle from this thread.
+        """
+        return self.background_loop.run(self.ask_speculative(query, max_sources, pro_mode, on_refined))
+
+    def ask_many_sync(
+        self,
+        queries: List[str],
+        max_sources: int = 2,
+        pro_mode: bool = False,
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Synchronous version of ask_many() method.
+        """
+        return self.background_loop.run(
+            self.ask_many(queries, max_sources, pro_mode, concurrency, return_exceptions)
+        )
+
+    def ask_stream_sync(
+        self,
+        query: str,
+        max_sources: int = 2,
+        pro_mode: bool = False,
+    ) -> Iterator[str]:
+        """
+        Synchronous version of ask_stream(); a plain generator for threaded servers.
+        """
+        stream = self.ask_stream(query, max_sources, pro_mode)
+
+        async def next_token() -> str:
+            return await stream.__anext__()
+
         try:
-            # Try getting the current event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in a running event loop (e.g., Jupyter), use nest_asyncio
-                nest_asyncio.apply()
-        except RuntimeError:
-            # If there's no event loop, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(self.ask(query, max_sources, pro_mode))
+            while True:
+                try:
+                    yield self.background_loop.run(next_token())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.background_loop.run(stream.aclose())
+
+    async def aclose(self) -> None:
+        """Release the SERP HTTP clients and the scraper's pooled browsers"""
+        await self.serp_search.aclose()
+        await self.source_processor.aclose()
+
+    def close(self) -> None:
+        """Synchronous version of aclose(), for agents driven through the *_sync methods"""
+        self.background_loop.run(self.aclose())
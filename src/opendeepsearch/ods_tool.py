@@ -1,6 +1,7 @@
-from typing import Optional, Literal
+from typing import Optional, Literal, AsyncIterator, Iterator, List, Union, Callable, Tuple
 from smolagents import Tool
 from opendeepsearch.ods_agent import OpenDeepSearchAgent
+from opendeepsearch.speculative import SpeculativeAnswer
 
 class OpenDeepSearchTool(Tool):
     name = "web_search"
@@ -18,10 +19,12 @@ class OpenDeepSearchTool(Tool):
         self,
         model_name: Optional[str] = None,
         reranker: str = "infinity",
-        search_provider: Literal["serper", "searxng"] = "serper",
+        search_provider: Literal["serper", "searxng", "hedged", "federated"] = "serper",
         serper_api_key: Optional[str] = None,
         searxng_instance_url: Optional[str] = None,
-        searxng_api_key: Optional[str] = None
+        searxng_api_key: Optional[str] = None,
+        coalesce_requests: bool = False,
+        timeout_s: Optional[float] = None
     ):
         super().__init__()
         self.search_model_name = model_name  # LiteLLM model name
@@ -30,11 +33,53 @@ class OpenDeepSearchTool(Tool):
         self.serper_api_key = serper_api_key
         self.searxng_instance_url = searxng_instance_url
         self.searxng_api_key = searxng_api_key
+        self.coalesce_requests = coalesce_requests
+        self.timeout_s = timeout_s  # Per-call deadline; the agent degrades to stay within it
+        self.last_degradations: Tuple[str, ...] = ()  # Degradations applied by the last forward()
 
     def forward(self, query: str):
-        answer = self.search_tool.ask_sync(query, max_sources=2, pro_mode=True)
+        answer = self.search_tool.ask_sync(query, max_sources=2, pro_mode=True, timeout_s=self.timeout_s)
+        self.last_degradations = getattr(answer, 'degradations', ())
+        if self.last_degradations:
+            # Let the calling agent know the answer was cut short to meet the time limit
+            return f"{answer}\n\n[Answered under a {self.timeout_s:g}s time limit; degraded: {', '.join(self.last_degradations)}]"
         return answer
 
+    def forward_many(
+        self,
+        queries: List[str],
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> List[Union[str, BaseException]]:
+        """Answer a batch of queries concurrently (bounded); answers come back in input order"""
+        return self.search_tool.ask_many_sync(
+            queries,
+            max_sources=2,
+            pro_mode=True,
+            concurrency=concurrency,
+            return_exceptions=return_exceptions
+        )
+
+    def forward_speculative(
+        self,
+        query: str,
+        on_refined: Optional[Callable[[str], None]] = None
+    ) -> SpeculativeAnswer:
+        """
+        Like forward(), but returns as soon as a draft answer from SERP snippets is ready;
+        the handle's .result() gives the answer refined from the scraped pages
+        """
+        return self.search_tool.ask_speculative_sync(query, max_sources=2, pro_mode=True, on_refined=on_refined)
+
+    def forward_stream(self, query: str) -> Iterator[str]:
+        """Like forward(), but yields the answer token by token as the LLM produces it"""
+        return self.search_tool.ask_stream_sync(query, max_sources=2, pro_mode=True)
+
+    async def aforward_stream(self, query: str) -> AsyncIterator[str]:
+        """Async version of forward_stream() for callers running their own event loop"""
+        async for token in self.search_tool.ask_stream(query, max_sources=2, pro_mode=True):
+            yield token
+
     def setup(self):
         self.search_tool = OpenDeepSearchAgent(
             self.search_model_name,
@@ -42,5 +87,6 @@ class OpenDeepSearchTool(Tool):
             search_provider=self.search_provider,
             serper_api_key=self.serper_api_key,
             searxng_instance_url=self.searxng_instance_url,
-            searxng_api_key=self.searxng_api_key
+            searxng_api_key=self.searxng_api_key,
+            coalesce_requests=self.coalesce_requests
         )
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
 import torch
 from typing import List, Dict, Union
+from opendeepsearch.tracing import traced
+
+def measure_embeddings(embeddings, searcher: "BaseSemanticSearcher", texts: List[str], *args, **kwargs) -> Dict[str, Union[int, str]]:
+    """Span fields for an _get_embeddings call"""
+    return {"items": len(texts), "bytes": sum(len(text) for text in texts), "provider": type(searcher).__name__}
 
 class BaseSemanticSearcher(ABC):
     """
@@ -24,6 +29,18 @@ class BaseSemanticSearcher(ABC):
         """
         pass
 
+    def embed(self, texts: List[str]) -> torch.Tensor:
+        """
+        Embed texts for use outside reranking (e.g. by the semantic answer cache).
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            torch.Tensor containing the embeddings shape: (num_texts, embedding_dim)
+        """
+        return self._get_embeddings(texts)
+
     def calculate_scores(
         self,
         queries: List[str],
@@ -63,6 +80,7 @@ class BaseSemanticSearcher(ABC):
             
         return scores
 
+    @traced("rerank", measure=lambda results, self, query, documents, *args, **kwargs: {"items": len(documents)})
     def rerank(
         self,
         query: Union[str, List[str]],
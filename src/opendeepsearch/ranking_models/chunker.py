@@ -1,5 +1,6 @@
 from typing import List, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from opendeepsearch.tracing import traced
 
 class Chunker:
     """A modular text chunking class that splits text into smaller, overlapping segments.
@@ -44,6 +45,7 @@ class Chunker:
             length_function=self.length_function
         )
     
+    @traced("chunk.split_text", measure=lambda chunks, self, text: {"items": len(chunks), "bytes": len(text)})
     def split_text(self, text: str) -> List[str]:
         """Split a single text into chunks.
         
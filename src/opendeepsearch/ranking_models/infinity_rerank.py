@@ -2,7 +2,8 @@ import torch
 import requests
 import json
 from typing import List
-from opendeepsearch.ranking_models.base_reranker import BaseSemanticSearcher
+from opendeepsearch.ranking_models.base_reranker import BaseSemanticSearcher, measure_embeddings
+from opendeepsearch.tracing import traced
 
 class InfinitySemanticSearcher(BaseSemanticSearcher):
     """
@@ -57,6 +58,7 @@ class InfinitySemanticSearcher(BaseSemanticSearcher):
         self.model_name = model_name
         self.instruction_prefix = instruction_prefix
 
+    @traced("embed", measure=measure_embeddings)
     def _get_embeddings(self, texts: List[str], embedding_type: str = "query") -> torch.Tensor:
         """
         Get embeddings for a list of texts using the Infinity API.
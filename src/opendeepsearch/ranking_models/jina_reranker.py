@@ -3,20 +3,30 @@ import torch
 from typing import List, Optional
 from dotenv import load_dotenv
 import os
-from .base_reranker import BaseSemanticSearcher
+from .base_reranker import BaseSemanticSearcher, measure_embeddings
+from opendeepsearch.tracing import traced
+from opendeepsearch.rate_limiter import RateLimiter, RateLimitTimeout, default_rate_limiter, parse_retry_after
 
 class JinaReranker(BaseSemanticSearcher):
     """
     Semantic searcher implementation using Jina AI's embedding API.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "jina-embeddings-v3"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "jina-embeddings-v3",
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout: float = 30
+    ):
         """
         Initialize the Jina reranker.
         
         Args:
             api_key: Jina AI API key. If None, will load from environment variable JINA_API_KEY
             model: Model name to use (default: "jina-embeddings-v3")
+            rate_limiter: Limiter shared with other clients (default: the process-wide one)
+            timeout: Seconds to wait for a rate-limit slot and for the API response
         """
         if api_key is None:
             load_dotenv()
@@ -30,7 +40,11 @@ class JinaReranker(BaseSemanticSearcher):
             'Authorization': f'Bearer {api_key}'
         }
         self.model = model
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.timeout = timeout
 
+    @traced("embed", measure=measure_embeddings)
     def _get_embeddings(self, texts: List[str]) -> torch.Tensor:
         """
         Get embeddings for a list of texts using Jina AI API.
@@ -51,7 +65,10 @@ class JinaReranker(BaseSemanticSearcher):
         }
         
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=data)
+            self.rate_limiter.acquire("jina", self.api_key, timeout=self.timeout)
+            response = requests.post(self.api_url, headers=self.headers, json=data, timeout=self.timeout)
+            if response.status_code == 429:
+                self.rate_limiter.throttled("jina", self.api_key, parse_retry_after(response.headers.get('Retry-After')))
             response.raise_for_status()  # Raise exception for non-200 status codes
             
             # Extract embeddings from response
@@ -62,5 +79,5 @@ class JinaReranker(BaseSemanticSearcher):
             
             return embeddings
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RateLimitTimeout) as e:
             raise RuntimeError(f"Error calling Jina AI API: {str(e)}")
@@ -0,0 +1,200 @@
+"""
+Token-bucket rate limiting and quota accounting per provider and API key.
+
+Upstream APIs (Serper, Jina, Etherscan, ...) enforce per-key request rates. Clients call
+``acquire``/``aacquire`` on the shared ``default_rate_limiter`` before each request.
+Callers over the rate are queued (FIFO, by reservation) until a token is available or
+their deadline passes, instead of bursting into HTTP 429s.
+
+Providers without a configured limit are not throttled, only counted:
+
+    from opendeepsearch.rate_limiter import default_rate_limiter
+    default_rate_limiter.configure("serper", rate=10, burst=20)
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+class RateLimitTimeout(Exception):
+    """Raised when a token cannot be obtained before the caller's deadline"""
+    pass
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `capacity`.
+
+    Acquiring reserves tokens immediately (the balance may go negative) and returns how
+    long the caller must wait for its reservation to mature, so waiting callers are
+    served in arrival order without polling.
+    """
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1, timeout: Optional[float] = None) -> float:
+        """
+        Reserve tokens and return the seconds to wait before using them.
+
+        Raises:
+            RateLimitTimeout: If the wait would exceed `timeout`; nothing is reserved then
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, (tokens - self._tokens) / self.rate, self._blocked_until - now)
+            if timeout is not None and wait > timeout:
+                raise RateLimitTimeout(f"Rate limit wait of {wait:.2f}s exceeds deadline of {timeout:.2f}s")
+            self._tokens -= tokens
+            return wait
+
+    def refund(self, tokens: float = 1) -> None:
+        """Return tokens from a reservation that won't be used"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after an upstream 429 with Retry-After"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0)
+
+    def remaining(self) -> float:
+        """Tokens currently available (negative while callers are queued)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+class RateLimiter:
+    """
+    Registry of token buckets keyed by provider and API key.
+
+    Limits are configured per provider and applied to each key separately. API keys are
+    only kept as short hashes so they never show up in stats or logs.
+    """
+    def __init__(self):
+        self._limits: Dict[str, Tuple[float, float]] = {}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._usage: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, rate: float, burst: Optional[float] = None) -> None:
+        """Limit `provider` to `rate` requests/second per key, allowing bursts of `burst`"""
+        with self._lock:
+            self._limits[provider] = (rate, burst or rate)
+            for key in [k for k in self._buckets if k[0] == provider]:
+                del self._buckets[key]
+
+    @staticmethod
+    def _key_id(api_key: Optional[str]) -> str:
+        if not api_key:
+            return "-"
+        return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+    def _bucket(self, provider: str, api_key: Optional[str]) -> Tuple[Optional[TokenBucket], Dict[str, float]]:
+        key = (provider, self._key_id(api_key))
+        with self._lock:
+            usage = self._usage.setdefault(key, {"granted": 0, "timed_out": 0, "throttled": 0, "waited_s": 0.0})
+            if provider not in self._limits:
+                return None, usage
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, burst = self._limits[provider]
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket, usage
+
+    def _reserve(self, provider: str, api_key: Optional[str], tokens: float, timeout: Optional[float]) -> float:
+        bucket, usage = self._bucket(provider, api_key)
+        if bucket is None:
+            wait = 0.0
+        else:
+            try:
+                wait = bucket.reserve(tokens, timeout)
+            except RateLimitTimeout:
+                with self._lock:
+                    usage["timed_out"] += 1
+                raise
+        with self._lock:
+            usage["granted"] += tokens
+            usage["waited_s"] += wait
+        return wait
+
+    def acquire(self, provider: str, api_key: Optional[str] = None, tokens: float = 1, timeout: Optional[float] = None) -> None:
+        """Block until `tokens` are available for the provider/key, or raise RateLimitTimeout"""
+        wait = self._reserve(provider, api_key, tokens, timeout)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, provider: str, api_key: Optional[str] = None, tokens: float = 1, timeout: Optional[float] = None) -> None:
+        """Async version of acquire() that waits without blocking the event loop"""
+        wait = self._reserve(provider, api_key, tokens, timeout)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # The request won't be sent, so hand the reservation to the callers behind us
+                self._refund(provider, api_key, tokens)
+                raise
+
+    def _refund(self, provider: str, api_key: Optional[str], tokens: float) -> None:
+        bucket, usage = self._bucket(provider, api_key)
+        if bucket is not None:
+            bucket.refund(tokens)
+        with self._lock:
+            usage["granted"] -= tokens
+
+    def throttled(self, provider: str, api_key: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Record an upstream rate-limit response. When the provider is limited here, its
+        bucket is paused for `retry_after` seconds (or one refill interval).
+        """
+        bucket, usage = self._bucket(provider, api_key)
+        with self._lock:
+            usage["throttled"] += 1
+        if bucket is not None:
+            bucket.block_for(retry_after if retry_after is not None else 1 / bucket.rate)
+
+    def remaining(self, provider: str, api_key: Optional[str] = None) -> Optional[float]:
+        """Tokens left for the provider/key, or None if the provider is not limited"""
+        bucket, _ = self._bucket(provider, api_key)
+        return None if bucket is None else bucket.remaining()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per provider/key usage counters, limits and remaining tokens"""
+        with self._lock:
+            entries = [
+                (key, dict(usage), self._buckets.get(key), self._limits.get(key[0]))
+                for key, usage in self._usage.items()
+            ]
+        return {
+            f"{provider}:{key_id}": {
+                **usage,
+                "rate": limit[0] if limit else None,
+                "burst": limit[1] if limit else None,
+                "remaining": bucket.remaining() if bucket is not None else None,
+            }
+            for (provider, key_id), usage, bucket, limit in entries
+        }
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP-date values are ignored"""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+# Shared limiter used by the search clients and rerankers unless one is injected
+default_rate_limiter = RateLimiter()
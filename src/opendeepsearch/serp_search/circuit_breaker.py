@@ -0,0 +1,172 @@
+"""
+Per-provider circuit breaker with a latency tracker that drives adaptive timeouts.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the provider's circuit is open"""
+    pass
+
+@dataclass
+class CircuitBreakerConfig:
+    """Configuration for a provider's circuit breaker and adaptive timeout"""
+    failure_threshold: int = 5       # Consecutive failures before the circuit opens
+    reset_timeout: float = 30.0      # Seconds the circuit stays open before a trial request
+    window_size: int = 200           # Number of recent latencies kept for percentiles
+    min_samples: int = 20            # Samples needed before the timeout adapts
+    timeout_multiplier: float = 2.0  # Timeout = p95 latency * multiplier ...
+    min_timeout: float = 1.0         # ... clamped to [min_timeout, the provider's configured timeout]
+
+class LatencyTracker:
+    """Rolling window of successful request latencies"""
+    def __init__(self, window_size: int = 200):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) of recorded latencies, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q / 100 * (len(samples) - 1)))))
+        return samples[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures. While open, requests
+    fail fast with CircuitOpenError. After `reset_timeout` seconds one trial request is
+    let through (half-open); success closes the circuit, failure opens it again.
+
+    Args:
+        name: Provider name used in errors and introspection
+        max_timeout: The provider's configured timeout, used until enough samples exist
+        config: Breaker and adaptive timeout settings
+        ignored_errors: Exceptions that say nothing about provider health (e.g. rate
+            limiting); they are counted as neither a success nor a failure
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        max_timeout: float,
+        config: Optional[CircuitBreakerConfig] = None,
+        ignored_errors: Tuple[Type[Exception], ...] = ()
+    ):
+        self.name = name
+        self.ignored_errors = ignored_errors
+        self.max_timeout = max_timeout
+        self.config = config or CircuitBreakerConfig()
+        self.latency = LatencyTracker(self.config.window_size)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._counters = {"successes": 0, "failures": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.config.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def timeout(self) -> float:
+        """Request timeout derived from the observed p95 latency"""
+        if len(self.latency) < self.config.min_samples:
+            return self.max_timeout
+        p95 = self.latency.percentile(95)
+        return min(self.max_timeout, max(self.config.min_timeout, p95 * self.config.timeout_multiplier))
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.config.reset_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record_success(self, seconds: Optional[float] = None) -> None:
+        if seconds is not None:
+            self.latency.record(seconds)
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.config.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @contextmanager
+    def call(self, track_latency: bool = True) -> Iterator[None]:
+        """
+        Guard a request: raises CircuitOpenError if the circuit is open, records a
+        failure if the block raises (other than `ignored_errors`) and a success (with its
+        latency) otherwise.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit is open after repeated failures")
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if isinstance(e, self.ignored_errors):
+                self._release_trial()
+            else:
+                self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation (e.g. a losing hedged request) says nothing about provider health
+            self._release_trial()
+            raise
+        self.record_success(time.monotonic() - start if track_latency else None)
+
+    def _release_trial(self) -> None:
+        """Let another request be the half-open trial without changing the state"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state, counters and latency estimates for introspection"""
+        state = self.state
+        with self._lock:
+            counters = dict(self._counters)
+            consecutive_failures = self._consecutive_failures
+        return {
+            "provider": self.name,
+            "state": state,
+            "consecutive_failures": consecutive_failures,
+            **counters,
+            "samples": len(self.latency),
+            "p50_latency": self.latency.percentile(50),
+            "p95_latency": self.latency.percentile(95),
+            "timeout": self.timeout(),
+        }
@@ -0,0 +1,103 @@
+"""
+SearchAPI wrapper that coalesces identical in-flight searches.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+from opendeepsearch.serp_search.serp_search import SearchAPI, SearchResult
+from opendeepsearch.serp_search.search_cache import normalize_query
+from opendeepsearch.singleflight import SingleFlight
+
+class CoalescingSearchAPI(SearchAPI):
+    """
+    Sends one upstream request for concurrent searches with the same normalized
+    query, num_results and location; every caller receives its own copy of the result.
+    Batches go straight to the wrapped API (keeping provider batch requests), with
+    duplicate queries in a batch sent once.
+    """
+    def __init__(self, api: SearchAPI):
+        self.api = api
+        self.flight = SingleFlight()
+
+    def get_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        result = self.flight.do_sync(
+            self._key(query, num_results, stored_location),
+            lambda: self.api.get_sources(query, num_results, stored_location)
+        )
+        return self._copy(result)
+
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        result = await self.flight.do(
+            self._key(query, num_results, stored_location),
+            lambda: self.api.aget_sources(query, num_results, stored_location)
+        )
+        return self._copy(result)
+
+    def get_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        unique = self._unique(queries, num_results, stored_location)
+        results = self.api.get_sources_many(list(unique.values()), num_results, stored_location, concurrency)
+        return self._spread(queries, num_results, stored_location, unique, results)
+
+    async def aget_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        unique = self._unique(queries, num_results, stored_location)
+        results = await self.api.aget_sources_many(list(unique.values()), num_results, stored_location, concurrency)
+        return self._spread(queries, num_results, stored_location, unique, results)
+
+    async def aclose(self) -> None:
+        await self.api.aclose()
+
+    def health(self) -> Dict[str, Any]:
+        return self.api.health()
+
+    @staticmethod
+    def _key(query: str, num_results: int, stored_location: Optional[str]) -> tuple:
+        return (normalize_query(query), num_results, (stored_location or "").lower())
+
+    def _unique(self, queries: List[str], num_results: int, stored_location: Optional[str]) -> Dict[tuple, str]:
+        """First query of each distinct key, in input order"""
+        unique: Dict[tuple, str] = {}
+        for query in queries:
+            unique.setdefault(self._key(query, num_results, stored_location), query)
+        return unique
+
+    def _spread(
+        self,
+        queries: List[str],
+        num_results: int,
+        stored_location: Optional[str],
+        unique: Dict[tuple, str],
+        results: List[SearchResult[Dict[str, Any]]]
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        """Map the results of the unique queries back onto `queries`, one private copy each"""
+        by_key = dict(zip(unique, results))
+        return [self._copy(by_key[self._key(query, num_results, stored_location)]) for query in queries]
+
+    @staticmethod
+    def _copy(result: SearchResult[Dict[str, Any]]) -> SearchResult[Dict[str, Any]]:
+        # SourceProcessor annotates organic items in place, so callers must not share them
+        if result.failed:
+            return result
+        return SearchResult(data=copy.deepcopy(result.data))
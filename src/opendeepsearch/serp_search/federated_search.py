@@ -0,0 +1,202 @@
+"""
+Composite SearchAPI that fans a query out to several providers.
+Supports racing, hedging (staggered backup requests) and merging of results.
+"""
+
+import asyncio
+import concurrent.futures
+from typing import Any, Dict, List, Literal, Optional
+
+from opendeepsearch.serp_search.serp_search import SearchAPI, SearchResult, canonical_url
+
+def merge_organic(result_lists: List[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """Interleave organic lists by rank, dropping links already seen"""
+    merged = []
+    seen = set()
+    for rank in range(max((len(items) for items in result_lists), default=0)):
+        for items in result_lists:
+            if rank >= len(items):
+                continue
+            item = items[rank]
+            key = canonical_url(item.get('link', ''))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+    return merged[:limit]
+
+class FederatedSearchAPI(SearchAPI):
+    """
+    Queries several search providers for the same request.
+
+    Strategies:
+        - 'race': send to every provider at once and return the first successful result
+        - 'hedge': send to the first provider and only start the next one if no success
+          arrived within hedge_delay seconds (or the previous one failed). A provider
+          whose circuit breaker is open fails instantly, so traffic falls back to the next
+        - 'merge': wait for every provider and merge the organic results, deduplicated
+          by canonical URL
+
+    Args:
+        apis: Providers in order of preference
+        strategy: One of 'race', 'hedge' or 'merge'
+        hedge_delay: Seconds to wait before sending the backup request in 'hedge' mode
+    """
+    def __init__(
+        self,
+        apis: List[SearchAPI],
+        strategy: Literal["race", "hedge", "merge"] = "hedge",
+        hedge_delay: float = 0.5
+    ):
+        if not apis:
+            raise ValueError("FederatedSearchAPI needs at least one provider")
+        if strategy not in ("race", "hedge", "merge"):
+            raise ValueError(f"Invalid strategy: {strategy}. Must be 'race', 'hedge' or 'merge'")
+        self.apis = apis
+        self.strategy = strategy
+        self.hedge_delay = hedge_delay
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def get_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        if not query.strip():
+            return SearchResult(error="Query cannot be empty")
+
+        if self.strategy == "merge":
+            futures = [self._submit(api, query, num_results, stored_location) for api in self.apis]
+            return self._merge([self._future_result(f) for f in futures], num_results)
+
+        delay = 0 if self.strategy == "race" else self.hedge_delay
+        remaining = list(self.apis)
+        pending = set()
+        errors = []
+
+        def launch():
+            api = remaining.pop(0)
+            pending.add(self._submit(api, query, num_results, stored_location))
+
+        launch()
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending,
+                timeout=delay if remaining else None,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                launch()
+                continue
+            for future in done:
+                pending.discard(future)
+                result = self._future_result(future)
+                if result.success:
+                    for other in pending:
+                        other.cancel()
+                    return result
+                errors.append(result.error)
+            if remaining:
+                launch()
+
+        return SearchResult(error="All search providers failed: " + "; ".join(errors))
+
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        if not query.strip():
+            return SearchResult(error="Query cannot be empty")
+
+        if self.strategy == "merge":
+            results = await asyncio.gather(
+                *(api.aget_sources(query, num_results, stored_location) for api in self.apis),
+                return_exceptions=True
+            )
+            return self._merge(
+                [SearchResult(error=str(r)) if isinstance(r, BaseException) else r for r in results],
+                num_results
+            )
+
+        delay = 0 if self.strategy == "race" else self.hedge_delay
+        remaining = list(self.apis)
+        pending = set()
+        errors = []
+
+        def launch():
+            api = remaining.pop(0)
+            pending.add(asyncio.ensure_future(api.aget_sources(query, num_results, stored_location)))
+
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    result = self._future_result(task)
+                    if result.success:
+                        return result
+                    errors.append(result.error)
+                if remaining:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return SearchResult(error="All search providers failed: " + "; ".join(errors))
+
+    async def aclose(self) -> None:
+        for api in self.apis:
+            await api.aclose()
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker threads used by get_sources; they are recreated on the next call"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def health(self) -> Dict[str, Any]:
+        health = {}
+        for api in self.apis:
+            health.update(api.health())
+        return health
+
+    def _submit(self, api: SearchAPI, query: str, num_results: int, stored_location: Optional[str]) -> concurrent.futures.Future:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=4 * len(self.apis),
+                thread_name_prefix="federated-search"
+            )
+        return self._executor.submit(api.get_sources, query, num_results, stored_location)
+
+    @staticmethod
+    def _future_result(future) -> SearchResult[Dict[str, Any]]:
+        try:
+            return future.result()
+        except Exception as e:
+            return SearchResult(error=f"Unexpected error: {str(e)}")
+
+    @staticmethod
+    def _merge(results: List[SearchResult[Dict[str, Any]]], num_results: int) -> SearchResult[Dict[str, Any]]:
+        successful = [r.data for r in results if r.success and r.data]
+        if not successful:
+            return SearchResult(error="All search providers failed: " + "; ".join(r.error or "no data" for r in results))
+
+        merged = {'organic': merge_organic([data.get('organic') or [] for data in successful], num_results)}
+        # For everything else keep the first provider's non-empty value
+        for data in successful:
+            for key, value in data.items():
+                if key != 'organic' and not merged.get(key):
+                    merged[key] = value
+        return SearchResult(data=merged)
@@ -0,0 +1,133 @@
+"""
+Compact typed records for decoded search provider responses.
+
+Used by the optional fast decode path (``fast_decode=True`` on SerperConfig/SearXNGConfig).
+The records keep their fields in ``__slots__`` and still answer the small dict-style
+surface (``get``, ``[]``, ``in``) that older callers rely on, so they can flow through
+code written for the plain-dict results.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+
+def decode_json(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+class _Record:
+    """Base class giving slotted records a read/write dict-style interface"""
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key, None) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the set fields as a plain dict"""
+        return {key: getattr(self, key) for key in self.__slots__ if getattr(self, key) is not None}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class OrganicResult(_Record):
+    """
+    A single organic search hit. Unset fields are None.
+
+    `html` and `chunks` are filled in by SourceProcessor: the reranked page text, and the
+    same chunks as [{"document": str, "score": float}, ...] in rerank order.
+    """
+    __slots__ = ('title', 'link', 'snippet', 'date', 'html', 'chunks')
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        link: Optional[str] = None,
+        snippet: Optional[str] = None,
+        date: Optional[str] = None,
+        html: Optional[str] = None,
+        chunks: Optional[List[Dict[str, Any]]] = None
+    ):
+        self.title = title
+        self.link = link
+        self.snippet = snippet
+        self.date = date
+        self.html = html
+        self.chunks = chunks
+
+class AnswerBox(_Record):
+    """Direct answer block returned above the organic results"""
+    __slots__ = ('title', 'answer', 'snippet', 'link')
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        answer: Optional[str] = None,
+        snippet: Optional[str] = None,
+        link: Optional[str] = None
+    ):
+        self.title = title
+        self.answer = answer
+        self.snippet = snippet
+        self.link = link
+
+class KnowledgeGraph(_Record):
+    """Knowledge graph panel"""
+    __slots__ = ('title', 'type', 'description', 'website', 'attributes')
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        type: Optional[str] = None,
+        description: Optional[str] = None,
+        website: Optional[str] = None,
+        attributes: Optional[Dict[str, str]] = None
+    ):
+        self.title = title
+        self.type = type
+        self.description = description
+        self.website = website
+        self.attributes = attributes
+
+def record_to_json(obj: Any) -> Dict[str, Any]:
+    """``default`` hook for json.dumps on results that contain records"""
+    if isinstance(obj, _Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+_RECORD_TAG = "__record__"
+_RECORD_TYPES = {cls.__name__: cls for cls in (OrganicResult, AnswerBox, KnowledgeGraph)}
+
+def record_to_tagged_json(obj: Any) -> Dict[str, Any]:
+    """Like record_to_json, but tags the record type so tagged_json_to_record can rebuild it"""
+    data = record_to_json(obj)
+    data[_RECORD_TAG] = type(obj).__name__
+    return data
+
+def tagged_json_to_record(data: Dict[str, Any]) -> Any:
+    """``object_hook`` for json.loads that turns objects written by record_to_tagged_json back into records"""
+    record_type = _RECORD_TYPES.get(data.pop(_RECORD_TAG, None))
+    return record_type(**data) if record_type is not None else data
@@ -0,0 +1,290 @@
+"""
+TTL'd result cache that can be wrapped around any SearchAPI provider.
+Entries live in an in-process LRU and, optionally, an on-disk SQLite tier.
+"""
+
+import asyncio
+import copy
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from opendeepsearch.serp_search.records import record_to_tagged_json, tagged_json_to_record
+from opendeepsearch.serp_search.serp_search import SearchAPI, SearchResult
+
+@dataclass
+class TTLRule:
+    """Cache lifetime for queries matching a regex"""
+    name: str
+    pattern: str
+    ttl: float
+
+DEFAULT_TTL_RULES = [
+    TTLRule(name="gas", pattern=r"\b(gas|gwei|base fee|priority fee)\b", ttl=15),
+    TTLRule(name="market", pattern=r"\b(price|prices|tvl|apy|apr|volume|liquidation)\b", ttl=60),
+    TTLRule(name="docs", pattern=r"\b(docs?|documentation|audit|audits|whitepaper|how does|how do|what is|safe)\b", ttl=6 * 3600),
+]
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and strip trailing punctuation"""
+    return re.sub(r"\s+", " ", query.strip().lower()).strip(" ?!.")
+
+class CachedSearchAPI(SearchAPI):
+    """
+    Caching decorator for a SearchAPI.
+
+    Results are keyed on provider, normalized query, num_results and location. Only
+    successful results are cached, and callers always get a private copy since
+    SourceProcessor annotates the returned organic items in place. The first matching
+    TTLRule decides how long an entry stays fresh; unmatched queries use default_ttl.
+    The async methods run SQLite reads and writes in a worker thread, and records from
+    the fast decode path come back from the disk tier as records.
+
+    Args:
+        api: The provider to wrap
+        max_entries: Size of the in-process LRU
+        ttl_rules: Ordered per-query-class TTLs (defaults to DEFAULT_TTL_RULES)
+        default_ttl: TTL in seconds for queries matching no rule
+        sqlite_path: Optional path of an on-disk SQLite cache shared between processes
+        provider: Name used in cache keys (defaults to the wrapped class name)
+    """
+    def __init__(
+        self,
+        api: SearchAPI,
+        max_entries: int = 1024,
+        ttl_rules: Optional[List[TTLRule]] = None,
+        default_ttl: float = 300,
+        sqlite_path: Optional[str] = None,
+        provider: Optional[str] = None
+    ):
+        self.api = api
+        self.max_entries = max_entries
+        self.ttl_rules = ttl_rules if ttl_rules is not None else DEFAULT_TTL_RULES
+        self._compiled_rules = [(rule, re.compile(rule.pattern, re.IGNORECASE)) for rule in self.ttl_rules]
+        self.default_ttl = default_ttl
+        self.provider = provider or type(api).__name__
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()  # Held for disk I/O, so memory hits never wait on it
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS serp_cache (key TEXT PRIMARY KEY, expires_at REAL, data TEXT)"
+            )
+            self._db.commit()
+
+    def ttl_for(self, query: str) -> float:
+        """Return the TTL in seconds for a query based on the first matching rule"""
+        for rule, regex in self._compiled_rules:
+            if regex.search(query):
+                return rule.ttl
+        return self.default_ttl
+
+    def cache_key(self, query: str, num_results: int, stored_location: Optional[str]) -> str:
+        return "|".join([self.provider, normalize_query(query), str(num_results), (stored_location or "").lower()])
+
+    def get_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        key = self.cache_key(query, num_results, stored_location)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = self.api.get_sources(query, num_results, stored_location)
+        self._store(key, query, result)
+        return result
+
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        key = self.cache_key(query, num_results, stored_location)
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+
+        result = await self.api.aget_sources(query, num_results, stored_location)
+        await self._astore(key, query, result)
+        return result
+
+    def get_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        results, misses = self._lookup_many(queries, num_results, stored_location)
+        if misses:
+            fetched = self.api.get_sources_many(
+                [queries[i] for i in misses], num_results, stored_location, concurrency
+            )
+            self._store_many(results, misses, fetched, queries, num_results, stored_location)
+        return results
+
+    async def aget_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        results = [await self._alookup(self.cache_key(query, num_results, stored_location)) for query in queries]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fetched = await self.api.aget_sources_many(
+                [queries[i] for i in misses], num_results, stored_location, concurrency
+            )
+            for i, result in zip(misses, fetched):
+                await self._astore(self.cache_key(queries[i], num_results, stored_location), queries[i], result)
+                results[i] = result
+        return results
+
+    async def aclose(self) -> None:
+        await self.api.aclose()
+
+    def health(self) -> Dict[str, Any]:
+        return self.api.health()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current LRU size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM serp_cache")
+                self._db.commit()
+
+    def _lookup(self, key: str) -> Optional[SearchResult[Dict[str, Any]]]:
+        cached = self._lookup_memory(key)
+        if cached is None and self._db is not None:
+            cached = self._lookup_disk(key)
+        if cached is None:
+            self._count("misses")
+        return cached
+
+    async def _alookup(self, key: str) -> Optional[SearchResult[Dict[str, Any]]]:
+        cached = self._lookup_memory(key)
+        if cached is None and self._db is not None:
+            cached = await asyncio.to_thread(self._lookup_disk, key)
+        if cached is None:
+            self._count("misses")
+        return cached
+
+    def _lookup_memory(self, key: str) -> Optional[SearchResult[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return SearchResult(data=copy.deepcopy(data))
+            del self._entries[key]
+            self._stats["expired"] += 1
+            return None
+
+    def _lookup_disk(self, key: str) -> Optional[SearchResult[Dict[str, Any]]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, data FROM serp_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        data = json.loads(row[1], object_hook=tagged_json_to_record)
+        with self._lock:
+            self._insert(key, row[0], data)
+            self._stats["disk_hits"] += 1
+        return SearchResult(data=copy.deepcopy(data))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup_many(
+        self,
+        queries: List[str],
+        num_results: int,
+        stored_location: Optional[str]
+    ) -> Tuple[List[Optional[SearchResult[Dict[str, Any]]]], List[int]]:
+        results = [self._lookup(self.cache_key(query, num_results, stored_location)) for query in queries]
+        return results, [i for i, result in enumerate(results) if result is None]
+
+    def _store_many(
+        self,
+        results: List[Optional[SearchResult[Dict[str, Any]]]],
+        misses: List[int],
+        fetched: List[SearchResult[Dict[str, Any]]],
+        queries: List[str],
+        num_results: int,
+        stored_location: Optional[str]
+    ) -> None:
+        for i, result in zip(misses, fetched):
+            self._store(self.cache_key(queries[i], num_results, stored_location), queries[i], result)
+            results[i] = result
+
+    def _store(self, key: str, query: str, result: SearchResult[Dict[str, Any]]) -> None:
+        expires_at = self._store_memory(key, query, result)
+        if expires_at is not None and self._db is not None:
+            self._write_disk(key, expires_at, self._dumps(result.data))
+
+    async def _astore(self, key: str, query: str, result: SearchResult[Dict[str, Any]]) -> None:
+        expires_at = self._store_memory(key, query, result)
+        if expires_at is not None and self._db is not None:
+            # Serialize now, before the caller starts annotating the results in place
+            await asyncio.to_thread(self._write_disk, key, expires_at, self._dumps(result.data))
+
+    def _store_memory(self, key: str, query: str, result: SearchResult[Dict[str, Any]]) -> Optional[float]:
+        """Cache a successful result in the LRU; returns its expiry, or None if it isn't cacheable"""
+        if result.failed or result.data is None:
+            return None
+        expires_at = time.time() + self.ttl_for(query)
+        with self._lock:
+            self._insert(key, expires_at, copy.deepcopy(result.data))
+        return expires_at
+
+    def _write_disk(self, key: str, expires_at: float, payload: str) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO serp_cache (key, expires_at, data) VALUES (?, ?, ?)",
+                (key, expires_at, payload)
+            )
+            self._db.execute("DELETE FROM serp_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    @staticmethod
+    def _dumps(data: Dict[str, Any]) -> str:
+        # Records are tagged so the disk tier can hand them back as records
+        return json.dumps(data, default=record_to_tagged_json)
+
+    def _insert(self, key: str, expires_at: float, data: Dict[str, Any]) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (expires_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
@@ -1,9 +1,20 @@
 import os
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, List, TypeVar, Generic, Union
+import math
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple, TypeVar, Generic, Union
 from abc import ABC, abstractmethod
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+
+from opendeepsearch.serp_search.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
+from opendeepsearch.serp_search.records import AnswerBox, KnowledgeGraph, OrganicResult, decode_json
+from opendeepsearch.rate_limiter import RateLimiter, RateLimitTimeout, default_rate_limiter, parse_retry_after
+from opendeepsearch.tracing import traced
 
 T = TypeVar('T')
 
@@ -19,6 +30,10 @@ class SearXNGException(SearchAPIException):
     """Custom exception for SearXNG related errors"""
     pass
 
+class SearchRateLimitError(SearchAPIException):
+    """Raised when a provider answers HTTP 429"""
+    pass
+
 @dataclass
 class SerperConfig:
     """Configuration for Serper API"""
@@ -26,6 +41,10 @@ class SerperConfig:
     api_url: str = "https://google.serper.dev/search"
     default_location: str = 'us'
     timeout: int = 10
+    pool_size: int = 20
+    batch_size: int = 100  # Max queries per multi-query request
+    fast_decode: bool = False  # Decode into slotted records (see records.py)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
 
     @classmethod
     def from_env(cls) -> 'SerperConfig':
@@ -42,6 +61,11 @@ class SearXNGConfig:
     api_key: Optional[str] = None
     default_location: str = 'all'
     timeout: int = 10
+    pool_size: int = 20
+    results_per_page: int = 10  # Results a single SearXNG page typically holds
+    max_pages: int = 5  # Upper bound on pages fetched in parallel for one query
+    fast_decode: bool = False  # Decode into slotted records (see records.py)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
 
     @classmethod
     def from_env(cls) -> 'SearXNGConfig':
@@ -63,6 +87,106 @@ class SearchResult(Generic[T]):
     def failed(self) -> bool:
         return not self.success
 
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication: lowercase host without 'www.', no fragment,
+    no tracking parameters and no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in ('gclid', 'fbclid', 'ref')
+    ])
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'https', host, path, query, ''))
+
+def _check_status(
+    response: Union[requests.Response, httpx.Response],
+    provider: str,
+    api_key: Optional[str],
+    rate_limiter: RateLimiter
+) -> None:
+    """raise_for_status() that reports HTTP 429 to the rate limiter as its own error"""
+    if response.status_code == 429:
+        rate_limiter.throttled(provider, api_key, parse_retry_after(response.headers.get('Retry-After')))
+        raise SearchRateLimitError(f"{provider} rate limit exceeded (HTTP 429)")
+    response.raise_for_status()
+
+def _measure_search(result: 'SearchResult', api: 'SearchAPI', *args, **kwargs) -> Dict[str, Any]:
+    """Span fields for a get_sources call"""
+    if result.failed:
+        return {"outcome": "error", "provider": type(api).__name__, "error_message": result.error}
+    return {"items": len((result.data or {}).get('organic') or []), "provider": type(api).__name__}
+
+def _measure_search_many(results: List['SearchResult'], api: 'SearchAPI', queries: List[str], *args, **kwargs) -> Dict[str, Any]:
+    """Span fields for a get_sources_many call"""
+    failed = sum(1 for result in results if result.failed)
+    return {"items": len(queries), "outcome": "error" if failed else "ok", "failed": failed, "provider": type(api).__name__}
+
+def _decode_response(response: Union[requests.Response, httpx.Response], fast_decode: bool) -> Any:
+    """Decode a JSON response body, bypassing the client's generic decoder on the fast path"""
+    if fast_decode:
+        return decode_json(response.content)
+    return response.json()
+
+class HTTPClientPool:
+    """
+    Keep-alive HTTP clients shared by every request a search API makes.
+
+    The sync client is a single ``requests.Session``. ``httpx.AsyncClient`` is bound to the
+    event loop it was first used on, so it is recreated when called from a different loop.
+    """
+    def __init__(self, pool_size: int = 20, timeout: float = 10, headers: Optional[Dict[str, str]] = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._session: Optional[requests.Session] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(self.headers)
+            self._session = session
+        return self._session
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the async client owned by the running loop and the sync session"""
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
+        self.close()
+
+    def close(self) -> None:
+        """Close the sync session"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
 class SearchAPI(ABC):
     """Abstract base class for search APIs"""
     @abstractmethod
@@ -75,8 +199,79 @@ class SearchAPI(ABC):
         """Get search results from the API"""
         pass
 
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        """
+        Get search results without blocking the event loop.
+
+        Implementations with a native async client should override this; the default
+        runs get_sources in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_sources, query, num_results, stored_location)
+
+    def get_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        """
+        Get search results for many queries.
+
+        The default implementation fans out get_sources over at most `concurrency` threads.
+        Results are returned in input order; a failing query yields a failed SearchResult
+        instead of aborting the batch.
+        """
+        def get_one(query: str) -> SearchResult[Dict[str, Any]]:
+            try:
+                return self.get_sources(query, num_results, stored_location)
+            except Exception as e:
+                return SearchResult(error=f"Unexpected error: {str(e)}")
+
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(queries)))) as executor:
+            return list(executor.map(get_one, queries))
+
+    async def aget_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        """Async version of get_sources_many() with at most `concurrency` requests in flight"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def get_one(query: str) -> SearchResult[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.aget_sources(query, num_results, stored_location)
+                except Exception as e:
+                    return SearchResult(error=f"Unexpected error: {str(e)}")
+
+        return list(await asyncio.gather(*(get_one(query) for query in queries)))
+
+    async def aclose(self) -> None:
+        """Release any pooled connections held by the API client"""
+        pass
+
+    def health(self) -> Dict[str, Any]:
+        """Return circuit breaker state, latency estimates and remaining rate-limit tokens for the provider(s) behind this API"""
+        return {}
+
 class SerperAPI(SearchAPI):
-    def __init__(self, api_key: Optional[str] = None, config: Optional[SerperConfig] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        config: Optional[SerperConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         if api_key:
             self.config = SerperConfig(api_key=api_key)
         else:
@@ -86,12 +281,23 @@ class SerperAPI(SearchAPI):
             'X-API-KEY': self.config.api_key,
             'Content-Type': 'application/json'
         }
+        self.http = HTTPClientPool(
+            pool_size=self.config.pool_size,
+            timeout=self.config.timeout,
+            headers=self.headers
+        )
+        # A 429 means the provider is up but throttling us; the rate limiter handles it
+        self.breaker = CircuitBreaker(
+            "serper", self.config.timeout, self.config.circuit_breaker, ignored_errors=(SearchRateLimitError,)
+        )
+        self.rate_limiter = rate_limiter or default_rate_limiter
 
     @staticmethod
     def extract_fields(items: List[Dict[str, Any]], fields: List[str]) -> List[Dict[str, Any]]:
         """Extract specified fields from a list of dictionaries"""
         return [{key: item.get(key, "") for key in fields if key in item} for item in items]
 
+    @traced("serp.get_sources", measure=_measure_search)
     def get_sources(
         self,
         query: str,
@@ -113,54 +319,247 @@ class SerperAPI(SearchAPI):
             return SearchResult(error="Query cannot be empty")
 
         try:
-            search_location = (stored_location or self.config.default_location).lower()
-
-            payload = {
-                "q": query,
-                "num": min(max(1, num_results), 10),
-                "gl": search_location
-            }
+            self.rate_limiter.acquire("serper", self.config.api_key, timeout=self.config.timeout)
+            with self.breaker.call():
+                response = self.http.session.post(
+                    self.config.api_url,
+                    json=self._build_payload(query, num_results, stored_location),
+                    timeout=self.breaker.timeout()
+                )
+                _check_status(response, "serper", self.config.api_key, self.rate_limiter)
+                data = self._parse_response(_decode_response(response, self.config.fast_decode))
+            return SearchResult(data=data)
+
+        except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+            return SearchResult(error=str(e))
+        except requests.RequestException as e:
+            return SearchResult(error=f"API request failed: {str(e)}")
+        except Exception as e:
+            return SearchResult(error=f"Unexpected error: {str(e)}")
 
-            response = requests.post(
-                self.config.api_url,
-                headers=self.headers,
-                json=payload,
-                timeout=self.config.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            results = {
-                'organic': self.extract_fields(
-                    data.get('organic', []),
-                    ['title', 'link', 'snippet', 'date']
-                ),
-                'topStories': self.extract_fields(
-                    data.get('topStories', []),
-                    ['title', 'imageUrl']
-                ),
-                'images': self.extract_fields(
-                    data.get('images', [])[:6],
-                    ['title', 'imageUrl']
-                ),
-                'graph': data.get('knowledgeGraph'),
-                'answerBox': data.get('answerBox'),
-                'peopleAlsoAsk': data.get('peopleAlsoAsk'),
-                'relatedSearches': data.get('relatedSearches')
-            }
-
-            return SearchResult(data=results)
+    @traced("serp.get_sources", measure=_measure_search)
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        """Async version of get_sources() using the pooled keep-alive client."""
+        if not query.strip():
+            return SearchResult(error="Query cannot be empty")
 
-        except requests.RequestException as e:
+        try:
+            await self.rate_limiter.aacquire("serper", self.config.api_key, timeout=self.config.timeout)
+            with self.breaker.call():
+                response = await self.http.async_client.post(
+                    self.config.api_url,
+                    json=self._build_payload(query, num_results, stored_location),
+                    timeout=self.breaker.timeout()
+                )
+                _check_status(response, "serper", self.config.api_key, self.rate_limiter)
+                data = self._parse_response(_decode_response(response, self.config.fast_decode))
+            return SearchResult(data=data)
+
+        except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+            return SearchResult(error=str(e))
+        except httpx.HTTPError as e:
             return SearchResult(error=f"API request failed: {str(e)}")
         except Exception as e:
             return SearchResult(error=f"Unexpected error: {str(e)}")
 
+    @traced("serp.get_sources_many", measure=_measure_search_many)
+    def get_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        """
+        Fetch results for many queries using Serper's multi-query request body.
+
+        Queries are sent in batches of up to `batch_size`, with at most `concurrency`
+        batches in flight. Results are returned in input order.
+        """
+        results, batches = self._plan_batches(queries, num_results, stored_location)
+
+        def send(batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+            indices, payloads = zip(*batch)
+            try:
+                # Serper bills per query, so a batch takes one token per query
+                self.rate_limiter.acquire("serper", self.config.api_key, tokens=len(payloads), timeout=self.config.timeout)
+                # Batches take longer than single queries, so keep them out of the latency estimate
+                with self.breaker.call(track_latency=False):
+                    response = self.http.session.post(
+                        self.config.api_url,
+                        json=list(payloads),
+                        timeout=self.config.timeout
+                    )
+                    _check_status(response, "serper", self.config.api_key, self.rate_limiter)
+                    self._fill_batch(results, indices, _decode_response(response, self.config.fast_decode))
+            except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+                for i in indices:
+                    results[i] = SearchResult(error=str(e))
+            except requests.RequestException as e:
+                for i in indices:
+                    results[i] = SearchResult(error=f"API request failed: {str(e)}")
+            except Exception as e:
+                for i in indices:
+                    results[i] = SearchResult(error=f"Unexpected error: {str(e)}")
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as executor:
+                list(executor.map(send, batches))
+        return results
+
+    @traced("serp.get_sources_many", measure=_measure_search_many)
+    async def aget_sources_many(
+        self,
+        queries: List[str],
+        num_results: int = 8,
+        stored_location: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[SearchResult[Dict[str, Any]]]:
+        """Async version of get_sources_many()"""
+        results, batches = self._plan_batches(queries, num_results, stored_location)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def send(batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+            indices, payloads = zip(*batch)
+            async with semaphore:
+                try:
+                    await self.rate_limiter.aacquire(
+                        "serper", self.config.api_key, tokens=len(payloads), timeout=self.config.timeout
+                    )
+                    with self.breaker.call(track_latency=False):
+                        response = await self.http.async_client.post(
+                            self.config.api_url,
+                            json=list(payloads),
+                            timeout=self.config.timeout
+                        )
+                        _check_status(response, "serper", self.config.api_key, self.rate_limiter)
+                        self._fill_batch(results, indices, _decode_response(response, self.config.fast_decode))
+                except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+                    for i in indices:
+                        results[i] = SearchResult(error=str(e))
+                except httpx.HTTPError as e:
+                    for i in indices:
+                        results[i] = SearchResult(error=f"API request failed: {str(e)}")
+                except Exception as e:
+                    for i in indices:
+                        results[i] = SearchResult(error=f"Unexpected error: {str(e)}")
+
+        await asyncio.gather(*(send(batch) for batch in batches))
+        return results
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    def health(self) -> Dict[str, Any]:
+        return {self.breaker.name: {
+            **self.breaker.snapshot(),
+            "rate_limit_remaining": self.rate_limiter.remaining(self.breaker.name, self.config.api_key),
+        }}
+
+    def _plan_batches(
+        self,
+        queries: List[str],
+        num_results: int,
+        stored_location: Optional[str]
+    ) -> Tuple[List[Optional[SearchResult[Dict[str, Any]]]], List[List[Tuple[int, Dict[str, Any]]]]]:
+        """Pre-fill results for empty queries and group the rest into request batches"""
+        results: List[Optional[SearchResult[Dict[str, Any]]]] = [None] * len(queries)
+        pending = []
+        for i, query in enumerate(queries):
+            if not query.strip():
+                results[i] = SearchResult(error="Query cannot be empty")
+            else:
+                pending.append((i, self._build_payload(query, num_results, stored_location)))
+        size = max(1, self.config.batch_size)
+        return results, [pending[i:i + size] for i in range(0, len(pending), size)]
+
+    def _fill_batch(self, results: List[Any], indices: Tuple[int, ...], data: Any) -> None:
+        if not isinstance(data, list) or len(data) != len(indices):
+            raise SerperAPIException("Unexpected batch response shape from Serper API")
+        for i, item in zip(indices, data):
+            results[i] = SearchResult(data=self._parse_response(item))
+
+    def _build_payload(self, query: str, num_results: int, stored_location: Optional[str]) -> Dict[str, Any]:
+        search_location = (stored_location or self.config.default_location).lower()
+        return {
+            "q": query,
+            "num": min(max(1, num_results), 10),
+            "gl": search_location
+        }
+
+    def _parse_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.config.fast_decode:
+            return self._parse_response_records(data)
+        return {
+            'organic': self.extract_fields(
+                data.get('organic', []),
+                ['title', 'link', 'snippet', 'date']
+            ),
+            'topStories': self.extract_fields(
+                data.get('topStories', []),
+                ['title', 'imageUrl']
+            ),
+            'images': self.extract_fields(
+                data.get('images', [])[:6],
+                ['title', 'imageUrl']
+            ),
+            'graph': data.get('knowledgeGraph'),
+            'answerBox': data.get('answerBox'),
+            'peopleAlsoAsk': data.get('peopleAlsoAsk'),
+            'relatedSearches': data.get('relatedSearches')
+        }
+
+    @staticmethod
+    def _parse_response_records(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fast path of _parse_response() that builds slotted records instead of dicts"""
+        answer_box = data.get('answerBox')
+        graph = data.get('knowledgeGraph')
+        return {
+            'organic': [
+                OrganicResult(item.get('title'), item.get('link'), item.get('snippet'), item.get('date'))
+                for item in data.get('organic', ())
+            ],
+            'topStories': [
+                {'title': item.get('title'), 'imageUrl': item.get('imageUrl')}
+                for item in data.get('topStories', ())
+            ],
+            'images': [
+                {'title': item.get('title'), 'imageUrl': item.get('imageUrl')}
+                for item in data.get('images', ())[:6]
+            ],
+            'graph': KnowledgeGraph(
+                graph.get('title'),
+                graph.get('type'),
+                graph.get('description'),
+                graph.get('website'),
+                graph.get('attributes')
+            ) if graph else None,
+            'answerBox': AnswerBox(
+                answer_box.get('title'),
+                answer_box.get('answer'),
+                answer_box.get('snippet'),
+                answer_box.get('link')
+            ) if answer_box else None,
+            'peopleAlsoAsk': data.get('peopleAlsoAsk'),
+            'relatedSearches': data.get('relatedSearches')
+        }
+
 
 class SearXNGAPI(SearchAPI):
     """API client for SearXNG search engine"""
 
-    def __init__(self, instance_url: Optional[str] = None, api_key: Optional[str] = None, config: Optional[SearXNGConfig] = None):
+    def __init__(
+        self,
+        instance_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        config: Optional[SearXNGConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         if instance_url:
             self.config = SearXNGConfig(instance_url=instance_url, api_key=api_key)
         else:
@@ -169,7 +568,18 @@ class SearXNGAPI(SearchAPI):
         self.headers = {'Content-Type': 'application/json'}
         if self.config.api_key:
             self.headers['X-API-Key'] = self.config.api_key
-
+        self.http = HTTPClientPool(
+            pool_size=self.config.pool_size,
+            timeout=self.config.timeout,
+            headers=self.headers
+        )
+        self.breaker = CircuitBreaker(
+            "searxng", self.config.timeout, self.config.circuit_breaker, ignored_errors=(SearchRateLimitError,)
+        )
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self._page_executor: Optional[ThreadPoolExecutor] = None
+
+    @traced("serp.get_sources", measure=_measure_search)
     def get_sources(
         self,
         query: str,
@@ -179,6 +589,10 @@ class SearXNGAPI(SearchAPI):
         """
         Fetch search results from SearXNG instance.
 
+        When num_results exceeds what one page holds, pages 1..N are requested in
+        parallel (up to config.max_pages), merged in page order and deduplicated by
+        canonical URL. Remaining pages are abandoned once enough results arrived.
+
         Args:
             query: Search query string
             num_results: Number of results to return (default: 8)
@@ -191,38 +605,187 @@ class SearXNGAPI(SearchAPI):
             return SearchResult(error="Query cannot be empty")
 
         try:
-            # Ensure the instance URL ends with /search
-            search_url = self.config.instance_url
-            if not search_url.endswith('/search'):
-                search_url = search_url.rstrip('/') + '/search'
-
-            # Prepare parameters for SearXNG
-            params = {
-                'q': query,
-                'format': 'json',
-                'pageno': 1,
-                'categories': 'general',
-                'language': 'all',
-                'time_range': None,
-                'safesearch': 0,
-                'engines': 'google,bing,duckduckgo',  # Default engines, can be customised
-                'max_results': min(max(1, num_results), 20)  # Limit to reasonable range
-            }
-
-            # Add location if provided and supported
-            if stored_location and stored_location != 'all':
-                params['language'] = stored_location
-
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                params=params,
-                timeout=self.config.timeout
+            num_pages = self._page_count(num_results)
+            if num_pages == 1:
+                pages = [self._fetch_page(query, num_results, stored_location, 1)]
+            else:
+                if self._page_executor is None:
+                    self._page_executor = ThreadPoolExecutor(
+                        max_workers=self.config.max_pages,
+                        thread_name_prefix="searxng-pages"
+                    )
+                futures = [
+                    self._page_executor.submit(self._fetch_page, query, num_results, stored_location, pageno)
+                    for pageno in range(1, num_pages + 1)
+                ]
+                pages = []
+                try:
+                    for future in futures:
+                        try:
+                            page = future.result()
+                        except Exception as e:
+                            page = e
+                        if not self._collect_page(pages, page, num_results):
+                            break
+                finally:
+                    for future in futures:
+                        future.cancel()
+            return SearchResult(data=self._parse_pages(pages, num_results))
+
+        except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+            return SearchResult(error=str(e))
+        except requests.RequestException as e:
+            return SearchResult(error=f"SearXNG API request failed: {str(e)}")
+        except Exception as e:
+            return SearchResult(error=f"Unexpected error with SearXNG: {str(e)}")
+
+    @traced("serp.get_sources", measure=_measure_search)
+    async def aget_sources(
+        self,
+        query: str,
+        num_results: int = 8,
+        stored_location: Optional[str] = None
+    ) -> SearchResult[Dict[str, Any]]:
+        """Async version of get_sources() using the pooled keep-alive client."""
+        if not query.strip():
+            return SearchResult(error="Query cannot be empty")
+
+        try:
+            tasks = [
+                asyncio.ensure_future(self._afetch_page(query, num_results, stored_location, pageno))
+                for pageno in range(1, self._page_count(num_results) + 1)
+            ]
+            pages = []
+            try:
+                for task in tasks:
+                    try:
+                        page = await task
+                    except Exception as e:
+                        page = e
+                    if not self._collect_page(pages, page, num_results):
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Let cancelled pages unwind (breaker and rate limiter bookkeeping) before returning
+                await asyncio.gather(*tasks, return_exceptions=True)
+            return SearchResult(data=self._parse_pages(pages, num_results))
+
+        except (CircuitOpenError, RateLimitTimeout, SearchRateLimitError) as e:
+            return SearchResult(error=str(e))
+        except httpx.HTTPError as e:
+            return SearchResult(error=f"SearXNG API request failed: {str(e)}")
+        except Exception as e:
+            return SearchResult(error=f"Unexpected error with SearXNG: {str(e)}")
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    def health(self) -> Dict[str, Any]:
+        return {self.breaker.name: {
+            **self.breaker.snapshot(),
+            "rate_limit_remaining": self.rate_limiter.remaining(self.breaker.name, self.config.api_key),
+        }}
+
+    def _page_count(self, num_results: int) -> int:
+        per_page = max(1, self.config.results_per_page)
+        return max(1, min(self.config.max_pages, math.ceil(num_results / per_page)))
+
+    def _fetch_page(self, query: str, num_results: int, stored_location: Optional[str], pageno: int) -> Dict[str, Any]:
+        self.rate_limiter.acquire("searxng", self.config.api_key, timeout=self.config.timeout)
+        with self.breaker.call():
+            response = self.http.session.get(
+                self._search_url(),
+                params=self._build_params(query, num_results, stored_location, pageno),
+                timeout=self.breaker.timeout()
+            )
+            _check_status(response, "searxng", self.config.api_key, self.rate_limiter)
+            return _decode_response(response, self.config.fast_decode)
+
+    async def _afetch_page(self, query: str, num_results: int, stored_location: Optional[str], pageno: int) -> Dict[str, Any]:
+        await self.rate_limiter.aacquire("searxng", self.config.api_key, timeout=self.config.timeout)
+        with self.breaker.call():
+            response = await self.http.async_client.get(
+                self._search_url(),
+                params=self._build_params(query, num_results, stored_location, pageno),
+                timeout=self.breaker.timeout()
             )
-            response.raise_for_status()
-            data = response.json()
+            _check_status(response, "searxng", self.config.api_key, self.rate_limiter)
+            return _decode_response(response, self.config.fast_decode)
+
+    @staticmethod
+    def _collect_page(pages: List[Dict[str, Any]], page: Union[Dict[str, Any], Exception], num_results: int) -> bool:
+        """
+        Append the next page in order and return whether more pages are worth reading.
+        A failed first page propagates; a failed later page ends the merge with what we have.
+        """
+        if isinstance(page, Exception):
+            if not pages:
+                raise page
+            return False
+        pages.append(page)
+        if not page.get('results'):
+            return False
+        unique = {canonical_url(r.get('url', '')) for p in pages for r in p.get('results', [])}
+        return len(unique) < num_results
+
+    def _parse_pages(self, pages: List[Dict[str, Any]], num_results: int) -> Dict[str, Any]:
+        if len(pages) == 1:
+            return self._parse_response(pages[0], num_results)
+        merged = []
+        seen = set()
+        for page in pages:
+            for result in page.get('results', []):
+                key = canonical_url(result.get('url', ''))
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(result)
+        return self._parse_response({'results': merged, 'suggestions': pages[0].get('suggestions', [])}, num_results)
+
+    def _search_url(self) -> str:
+        # Ensure the instance URL ends with /search
+        search_url = self.config.instance_url
+        if not search_url.endswith('/search'):
+            search_url = search_url.rstrip('/') + '/search'
+        return search_url
+
+    def _build_params(
+        self,
+        query: str,
+        num_results: int,
+        stored_location: Optional[str],
+        pageno: int = 1
+    ) -> Dict[str, Any]:
+        # Prepare parameters for SearXNG
+        params = {
+            'q': query,
+            'format': 'json',
+            'pageno': pageno,
+            'categories': 'general',
+            'language': 'all',
+            'safesearch': 0,
+            'engines': 'google,bing,duckduckgo',  # Default engines, can be customised
+            'max_results': min(max(1, num_results), 20)  # Limit to reasonable range
+        }
 
-            # Transform SearXNG results to match SerperAPI format
+        # Add location if provided and supported
+        if stored_location and stored_location != 'all':
+            params['language'] = stored_location
+        return params
+
+    def _parse_response(self, data: Dict[str, Any], num_results: int) -> Dict[str, Any]:
+        # Transform SearXNG results to match SerperAPI format
+        if self.config.fast_decode:
+            organic_results = [
+                OrganicResult(
+                    result.get('title', ''),
+                    result.get('url', ''),
+                    result.get('content', ''),
+                    result.get('publishedDate', '')
+                )
+                for result in data.get('results', ())[:num_results]
+            ]
+        else:
             organic_results = []
             for result in data.get('results', [])[:num_results]:
                 organic_results.append({
@@ -232,49 +795,51 @@ class SearXNGAPI(SearchAPI):
                     'date': result.get('publishedDate', '')
                 })
 
-            # Extract image results if available
-            image_results = []
-            for result in data.get('results', []):
-                if result.get('img_src'):
-                    image_results.append({
-                        'title': result.get('title', ''),
-                        'imageUrl': result.get('img_src', '')
-                    })
-            image_results = image_results[:6]  # Limit to 6 images like SerperAPI
-
-            # Format results to match SerperAPI structure
-            results = {
-                'organic': organic_results,
-                'images': image_results,
-                'topStories': [],  # SearXNG might not have direct equivalent
-                'graph': None,     # SearXNG doesn't provide knowledge graph
-                'answerBox': None, # SearXNG doesn't provide answer box
-                'peopleAlsoAsk': None,
-                'relatedSearches': data.get('suggestions', [])
-            }
-
-            return SearchResult(data=results)
-
-        except requests.RequestException as e:
-            return SearchResult(error=f"SearXNG API request failed: {str(e)}")
-        except Exception as e:
-            return SearchResult(error=f"Unexpected error with SearXNG: {str(e)}")
+        # Extract image results if available
+        image_results = []
+        for result in data.get('results', []):
+            if result.get('img_src'):
+                image_results.append({
+                    'title': result.get('title', ''),
+                    'imageUrl': result.get('img_src', '')
+                })
+        image_results = image_results[:6]  # Limit to 6 images like SerperAPI
+
+        # Format results to match SerperAPI structure
+        return {
+            'organic': organic_results,
+            'images': image_results,
+            'topStories': [],  # SearXNG might not have direct equivalent
+            'graph': None,     # SearXNG doesn't provide knowledge graph
+            'answerBox': None, # SearXNG doesn't provide answer box
+            'peopleAlsoAsk': None,
+            'relatedSearches': data.get('suggestions', [])
+        }
 
 
 def create_search_api(
     search_provider: str = "serper",
     serper_api_key: Optional[str] = None,
     searxng_instance_url: Optional[str] = None,
-    searxng_api_key: Optional[str] = None
+    searxng_api_key: Optional[str] = None,
+    cache_config: Optional[Dict[str, Any]] = None,
+    hedge_delay: float = 0.5,
+    coalesce: bool = False
 ) -> SearchAPI:
     """
     Factory function to create the appropriate search API client.
 
     Args:
-        search_provider: The search provider to use ('serper' or 'searxng')
+        search_provider: The search provider to use ('serper', 'searxng', 'hedged' or 'federated').
+            'hedged' queries Serper and falls back to SearXNG if no answer arrived within
+            hedge_delay seconds; 'federated' queries both and merges the organic results.
         serper_api_key: Optional API key for Serper
         searxng_instance_url: Optional SearXNG instance URL
         searxng_api_key: Optional API key for SearXNG instance
+        cache_config: Optional keyword arguments for CachedSearchAPI. When given, the
+            provider is wrapped in a TTL'd result cache (an empty dict uses the defaults).
+        hedge_delay: Seconds before the backup request is sent in 'hedged' mode
+        coalesce: Whether concurrent identical searches should share one upstream request
 
     Returns:
         An instance of a SearchAPI implementation
@@ -282,9 +847,30 @@ def create_search_api(
     Raises:
         ValueError: If an invalid search provider is specified
     """
-    if search_provider.lower() == "serper":
-        return SerperAPI(api_key=serper_api_key)
-    elif search_provider.lower() == "searxng":
-        return SearXNGAPI(instance_url=searxng_instance_url, api_key=searxng_api_key)
+    provider = search_provider.lower()
+    if provider == "serper":
+        api = SerperAPI(api_key=serper_api_key)
+    elif provider == "searxng":
+        api = SearXNGAPI(instance_url=searxng_instance_url, api_key=searxng_api_key)
+    elif provider in ("hedged", "federated"):
+        from opendeepsearch.serp_search.federated_search import FederatedSearchAPI
+        api = FederatedSearchAPI(
+            [
+                SerperAPI(api_key=serper_api_key),
+                SearXNGAPI(instance_url=searxng_instance_url, api_key=searxng_api_key)
+            ],
+            strategy="hedge" if provider == "hedged" else "merge",
+            hedge_delay=hedge_delay
+        )
     else:
-        raise ValueError(f"Invalid search provider: {search_provider}. Must be 'serper' or 'searxng'")
+        raise ValueError(
+            f"Invalid search provider: {search_provider}. Must be 'serper', 'searxng', 'hedged' or 'federated'"
+        )
+
+    if cache_config is not None:
+        from opendeepsearch.serp_search.search_cache import CachedSearchAPI
+        api = CachedSearchAPI(api, **cache_config)
+    if coalesce:
+        from opendeepsearch.serp_search.coalescing_search import CoalescingSearchAPI
+        api = CoalescingSearchAPI(api)
+    return api
@@ -0,0 +1,302 @@
+"""
+Local stand-in for the Serper and SearXNG search endpoints, for offline load testing.
+
+Speaks Serper's ``POST /search`` (single and multi-query bodies) and SearXNG's
+``GET /search?format=json``. Responses come from a recordings file or are synthesized
+deterministically from the query, with configurable latency and error injection.
+
+Point the clients at it with ``SerperConfig(api_url=server.serper_url)`` and
+``SearXNGConfig(instance_url=server.searxng_url)``.
+
+Usage:
+    python -m opendeepsearch.serp_search.stub_server --port 8089 \\
+        --latency lognormal --latency-median 0.3 --latency-sigma 0.5 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Literal, Optional
+from urllib.parse import parse_qs, urlsplit
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # The default backlog of 5 stalls connects under load
+
+@dataclass
+class LatencyModel:
+    """
+    Distribution of artificial response delays, in seconds.
+
+    - 'fixed': always `median`
+    - 'uniform': uniform between `low` and `high`
+    - 'lognormal': lognormal with the given `median` and `sigma` (heavy tail), capped at `high`
+    """
+    kind: Literal["fixed", "uniform", "lognormal"] = "fixed"
+    median: float = 0.0
+    low: float = 0.0
+    high: float = 30.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.kind == "lognormal":
+            return min(self.high, rng.lognormvariate(0, self.sigma) * self.median)
+        return self.median
+
+class StubSearchServer:
+    """
+    Threaded HTTP server imitating Serper and SearXNG.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency: Delay model applied to every request
+        error_rate: Fraction of requests answered with `error_status`
+        error_status: HTTP status used for injected errors (e.g. 500 or 429)
+        hang_rate: Fraction of requests that sleep `hang_seconds` first, to exercise client timeouts
+        hang_seconds: Delay used for hanging requests
+        recordings: Optional mapping of query -> recorded provider response
+        results_per_page: Organic results per synthetic response page
+        seed: Seed for latency and error sampling
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 30.0,
+        recordings: Optional[Dict[str, Any]] = None,
+        results_per_page: int = 10,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.recordings = recordings or {}
+        self.results_per_page = results_per_page
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "serper": 0, "searxng": 0, "errors": 0, "hangs": 0}
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = _Server((host, port), self._make_handler())
+
+    @classmethod
+    def from_recordings_file(cls, path: str, **kwargs) -> 'StubSearchServer':
+        """Create a server replaying a JSON file of {query: response}"""
+        with open(path, encoding="utf-8") as f:
+            return cls(recordings=json.load(f), **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def serper_url(self) -> str:
+        return f"{self.url}/search"
+
+    @property
+    def searxng_url(self) -> str:
+        return self.url
+
+    def start(self) -> 'StubSearchServer':
+        """Serve in a daemon thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-search-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'StubSearchServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _roll(self) -> Dict[str, Any]:
+        """Sample the fault injection and delay for one request"""
+        with self._rng_lock:
+            return {
+                "delay": self.latency.sample(self._rng),
+                "hang": self._rng.random() < self.hang_rate,
+                "error": self._rng.random() < self.error_rate,
+            }
+
+    def serper_response(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        query = payload.get("q", "")
+        if query in self.recordings:
+            return self.recordings[query]
+        num = int(payload.get("num", 10))
+        return {
+            "searchParameters": {"q": query, "gl": payload.get("gl", "us"), "num": num, "type": "search"},
+            "organic": self._synthetic_results(query, 1, num, serper=True),
+            "relatedSearches": [{"query": f"{query} explained"}, {"query": f"{query} today"}],
+        }
+
+    def searxng_response(self, query: str, pageno: int) -> Dict[str, Any]:
+        if query in self.recordings:
+            return self.recordings[query]
+        return {
+            "query": query,
+            "number_of_results": self.results_per_page * 5,
+            "results": self._synthetic_results(query, pageno, self.results_per_page, serper=False),
+            "suggestions": [f"{query} explained"],
+        }
+
+    @staticmethod
+    def _synthetic_results(query: str, pageno: int, count: int, serper: bool) -> List[Dict[str, Any]]:
+        slug = hashlib.sha1(query.encode()).hexdigest()[:10]
+        results = []
+        for i in range(count):
+            rank = (pageno - 1) * count + i + 1
+            link = f"https://example-{rank}.test/{slug}/{rank}"
+            title = f"{query} - synthetic result {rank}"
+            snippet = f"Synthetic snippet {rank} for '{query}'. " * 3
+            if serper:
+                results.append({"title": title, "link": link, "snippet": snippet, "position": rank})
+            else:
+                results.append({"title": title, "url": link, "content": snippet, "engine": "stub"})
+        return results
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Any) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _inject_faults(self) -> bool:
+                """Apply latency/hang/error injection; returns True if an error was sent"""
+                server._count("requests")
+                roll = server._roll()
+                if roll["hang"]:
+                    server._count("hangs")
+                    time.sleep(server.hang_seconds)
+                time.sleep(roll["delay"])
+                if roll["error"]:
+                    server._count("errors")
+                    self._send_json(server.error_status, {"message": "injected error", "statusCode": server.error_status})
+                    return True
+                return False
+
+            def do_POST(self):
+                if urlsplit(self.path).path.rstrip("/") != "/search":
+                    self._send_json(404, {"message": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"message": "invalid JSON body"})
+                    return
+                if self._inject_faults():
+                    return
+                server._count("serper")
+                if isinstance(payload, list):
+                    self._send_json(200, [server.serper_response(item) for item in payload])
+                else:
+                    self._send_json(200, server.serper_response(payload))
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path.rstrip("/") != "/search":
+                    self._send_json(404, {"message": "not found"})
+                    return
+                params = parse_qs(parts.query)
+                if params.get("format", [""])[0] != "json":
+                    self._send_json(403, {"message": "only format=json is supported"})
+                    return
+                if self._inject_faults():
+                    return
+                server._count("searxng")
+                query = params.get("q", [""])[0]
+                pageno = int(params.get("pageno", ["1"])[0])
+                self._send_json(200, server.searxng_response(query, pageno))
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Serper/SearXNG stand-in server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--latency-median", type=float, default=0.0, help="Fixed delay, or lognormal median (s)")
+    parser.add_argument("--latency-low", type=float, default=0.0, help="Uniform lower bound (s)")
+    parser.add_argument("--latency-high", type=float, default=30.0, help="Uniform upper bound / lognormal cap (s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--recordings", help="JSON file mapping query -> recorded response")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    kwargs = dict(
+        host=args.host,
+        port=args.port,
+        latency=LatencyModel(
+            kind=args.latency,
+            median=args.latency_median,
+            low=args.latency_low,
+            high=args.latency_high,
+            sigma=args.latency_sigma
+        ),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed
+    )
+    if args.recordings:
+        server = StubSearchServer.from_recordings_file(args.recordings, **kwargs)
+    else:
+        server = StubSearchServer(**kwargs)
+
+    print(f"Serper endpoint:  {server.serper_url}")
+    print(f"SearXNG instance: {server.searxng_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
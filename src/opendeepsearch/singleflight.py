@@ -0,0 +1,90 @@
+"""
+Request coalescing: concurrent calls that share a key run once and share the result.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class _Call:
+    """An in-flight synchronous call that followers wait on"""
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller for a key (the leader) starts the work; callers arriving while it is
+    still running await the same result. Async work runs in its own task and followers
+    await it through asyncio.shield, so a cancelled caller never cancels the shared work.
+    Nothing is cached once the call completes.
+    """
+    def __init__(self):
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the execution already in flight on this loop"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[flight_key] = task
+                task.add_done_callback(lambda done: self._forget(flight_key, done))
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def do_sync(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Blocking variant of do() for calls made from multiple threads"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls executed and how many joined an in-flight call"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._tasks) + len(self._calls)
+        return stats
+
+    def _forget(self, flight_key: Tuple[int, Hashable], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
@@ -0,0 +1,110 @@
+"""
+Handle for a snippet-first answer whose scraped refinement finishes in the background.
+"""
+
+import asyncio
+import threading
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+class SpeculativeAnswer:
+    """
+    A quick draft answer plus the refined answer being produced in the background.
+
+    The draft is generated from SERP snippets and the answer box alone. Scraping, reranking
+    and a second completion keep running on the event loop that created the handle; the
+    refined answer can be awaited, waited for from another thread, or pushed to callbacks.
+    If the refinement fails, the draft stands in for it and the exception is kept in `error`.
+
+    Attributes:
+        query: The question asked
+        draft: Answer built from SERP snippets only
+        error: Exception raised by the refinement, if any
+    """
+    def __init__(self, query: str, draft: str, refinement: Optional["asyncio.Future[str]"] = None):
+        self.query = query
+        self.draft = draft
+        self.error: Optional[BaseException] = None
+        self._refined: Optional[str] = None if refinement is not None else draft
+        self._task = refinement
+        self._loop = refinement.get_loop() if refinement is not None else None
+        self._callbacks: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()  # Guards _callbacks and setting _done
+        self._done = threading.Event()
+        if refinement is None:
+            self._done.set()
+        else:
+            refinement.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: "asyncio.Future[str]") -> None:
+        if task.cancelled():
+            self._refined = self.draft
+        elif task.exception() is not None:
+            self.error = task.exception()
+            logger.warning(f"Refinement failed for '{self.query}', keeping the draft: {self.error!r}")
+            self._refined = self.draft
+        else:
+            self._refined = task.result()
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._notify(callback)
+
+    def _notify(self, callback: Callable[[str], None]) -> None:
+        try:
+            callback(self._refined)
+        except Exception as e:
+            logger.exception(f"Refinement callback failed: {e}")
+
+    @property
+    def answer(self) -> str:
+        """The refined answer if it is ready, otherwise the draft"""
+        return self._refined if self._done.is_set() else self.draft
+
+    def done(self) -> bool:
+        """Whether the refinement has finished (or failed, or was cancelled)"""
+        return self._done.is_set()
+
+    def add_done_callback(self, callback: Callable[[str], None]) -> None:
+        """
+        Call `callback(refined_answer)` once the refinement finishes, on the event loop's
+        thread. Called immediately if it already has.
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._notify(callback)
+
+    async def refined(self) -> str:
+        """Wait for the refined answer (from the loop the handle was created on)"""
+        if self._task is not None and not self._done.is_set():
+            try:
+                await asyncio.shield(self._task)
+            except BaseException:
+                if not self._task.done():
+                    raise
+        return self._refined
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        """
+        Block until the refined answer is ready. Call from a thread other than the one
+        running the handle's event loop (e.g. after ask_speculative_sync).
+
+        Raises:
+            TimeoutError: If `timeout` elapses first; the refinement keeps running
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Refinement for '{self.query}' did not finish within {timeout}s")
+        return self._refined
+
+    def cancel(self) -> None:
+        """Stop the background refinement; the draft becomes the final answer"""
+        if self._task is not None and not self._task.done():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def __repr__(self) -> str:
+        state = "refined" if self.done() else "refining"
+        return f"SpeculativeAnswer(query={self.query!r}, {state})"
@@ -0,0 +1,312 @@
+"""
+Lightweight per-stage tracing for the search pipeline.
+
+Instrumented stages (SERP lookups, page scrapes, quality filtering, chunking,
+embeddings, reranking, LLM completions) open a span that records duration, items and
+bytes processed, and outcome. Finished spans go to every registered sink. With no sink
+registered, tracing is off and an instrumented call costs one global lookup.
+
+    from opendeepsearch import tracing
+    histogram = tracing.HistogramSink()
+    tracing.enable(histogram, tracing.JSONLinesSink("spans.jsonl"))
+    ...
+    print(histogram.summary())
+
+Setting OPENDEEPSEARCH_TRACE_FILE enables a JSONLinesSink at import time.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Union
+
+_span_ids = itertools.count(1)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("opendeepsearch_span", default=None)
+
+class Span:
+    """
+    A timed pipeline stage. Used as a context manager; exceptions mark it as an error.
+
+    Attributes:
+        name: Stage name, e.g. 'serp.get_sources' or 'llm.completion'
+        duration: Seconds between enter and exit
+        items: Number of things processed (results, chunks, texts, ...)
+        bytes: Size of the data processed
+        outcome: 'ok', 'error' or a stage-specific value such as 'empty'
+        attributes: Extra key/values (provider, model, url, ...)
+    """
+    __slots__ = ('name', 'span_id', 'parent_id', 'trace_id', 'start', 'duration',
+                 'items', 'bytes', 'outcome', 'error', 'attributes', '_token', '_started')
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id: Optional[int] = None
+        self.trace_id = self.span_id
+        self.start = 0.0
+        self.duration = 0.0
+        self.items: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+        self._token = None
+        self._started = 0.0
+
+    def set(
+        self,
+        items: Optional[int] = None,
+        bytes: Optional[int] = None,
+        outcome: Optional[str] = None,
+        **attributes: Any
+    ) -> None:
+        """Record what the stage processed; unset arguments are left unchanged"""
+        if items is not None:
+            self.items = items
+        if bytes is not None:
+            self.bytes = bytes
+        if outcome is not None:
+            self.outcome = outcome
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None:
+            self.parent_id = parent.span_id
+            self.trace_id = parent.trace_id
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self._started
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in a different context (e.g. an async generator closed elsewhere)
+            pass
+        if exc_type is not None:
+            self.outcome = "cancelled" if exc_type.__name__ in ("CancelledError", "GeneratorExit") else "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        elif self.outcome is None:
+            self.outcome = "ok"
+        _emit(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "trace_id": self.trace_id,
+            "start": self.start,
+            "duration": self.duration,
+            "items": self.items,
+            "bytes": self.bytes,
+            "outcome": self.outcome,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    """Returned by span() while tracing is off"""
+    __slots__ = ()
+
+    def set(self, *args, **kwargs) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class SpanSink(ABC):
+    """Destination for finished spans. emit() is called from the finishing thread."""
+    @abstractmethod
+    def emit(self, span: Span) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class JSONLinesSink(SpanSink):
+    """Appends one JSON object per span to a file or stream"""
+    def __init__(self, target: Union[str, IO[str]]):
+        if isinstance(target, str):
+            self._file = open(target, "a", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class HistogramSink(SpanSink):
+    """
+    In-memory latency histogram per stage, with item/byte totals and outcome counts.
+
+    Args:
+        buckets: Upper bounds (seconds) of the latency buckets; a final +inf bucket is implied
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        index = bisect.bisect_left(self.buckets, span.duration)
+        with self._lock:
+            stage = self._stages.get(span.name)
+            if stage is None:
+                stage = self._stages[span.name] = {
+                    "count": 0, "total_s": 0.0, "max_s": 0.0, "items": 0, "bytes": 0,
+                    "outcomes": {}, "buckets": [0] * (len(self.buckets) + 1),
+                }
+            stage["count"] += 1
+            stage["total_s"] += span.duration
+            stage["max_s"] = max(stage["max_s"], span.duration)
+            stage["items"] += span.items or 0
+            stage["bytes"] += span.bytes or 0
+            stage["outcomes"][span.outcome] = stage["outcomes"].get(span.outcome, 0) + 1
+            stage["buckets"][index] += 1
+
+    def _percentile(self, counts: List[int], total: int, q: float, max_s: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile"""
+        rank = q / 100 * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, max_s)
+        return max_s
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage count, mean/p50/p95/p99/max seconds, totals and outcome counts"""
+        with self._lock:
+            stages = {name: {**stage, "buckets": list(stage["buckets"]), "outcomes": dict(stage["outcomes"])}
+                      for name, stage in self._stages.items()}
+        return {
+            name: {
+                "count": stage["count"],
+                "mean_s": stage["total_s"] / stage["count"],
+                "p50_s": self._percentile(stage["buckets"], stage["count"], 50, stage["max_s"]),
+                "p95_s": self._percentile(stage["buckets"], stage["count"], 95, stage["max_s"]),
+                "p99_s": self._percentile(stage["buckets"], stage["count"], 99, stage["max_s"]),
+                "max_s": stage["max_s"],
+                "total_s": stage["total_s"],
+                "items": stage["items"],
+                "bytes": stage["bytes"],
+                "outcomes": stage["outcomes"],
+                "histogram": dict(zip([*map(str, self.buckets), "+inf"], stage["buckets"])),
+            }
+            for name, stage in stages.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+# Registered sinks; an empty tuple means tracing is off
+_sinks: tuple = ()
+_sinks_lock = threading.Lock()
+
+def enable(*sinks: SpanSink) -> None:
+    """Register sinks (in addition to any already registered)"""
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + tuple(s for s in sinks if s not in _sinks)
+
+def disable(close: bool = True) -> None:
+    """Unregister every sink, closing them unless `close` is False"""
+    global _sinks
+    with _sinks_lock:
+        sinks, _sinks = _sinks, ()
+    if close:
+        for sink in sinks:
+            sink.close()
+
+def remove_sink(sink: SpanSink) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+def is_enabled() -> bool:
+    return bool(_sinks)
+
+def span(name: str, **attributes: Any) -> Union[Span, _NoopSpan]:
+    """Open a span for a pipeline stage; a shared no-op object when tracing is off"""
+    if not _sinks:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+def _emit(finished: Span) -> None:
+    for sink in _sinks:
+        try:
+            sink.emit(finished)
+        except Exception as e:
+            print(f"Tracing sink {type(sink).__name__} failed: {e}")
+
+def _measure_into(s: Span, measure: Optional[Callable[..., Dict[str, Any]]], result: Any, args, kwargs) -> None:
+    if measure is None:
+        return
+    try:
+        s.set(**measure(result, *args, **kwargs))
+    except Exception as e:
+        s.set(measure_error=str(e))
+
+def traced(name: str, measure: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+    """
+    Decorator wrapping a sync or async function in a span.
+
+    Args:
+        name: Span name
+        measure: Optional `measure(result, *args, **kwargs)` returning span fields
+            (items, bytes, outcome or extra attributes) for a successful call
+    """
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _sinks:
+                    return await fn(*args, **kwargs)
+                with Span(name, {}) as s:
+                    result = await fn(*args, **kwargs)
+                    _measure_into(s, measure, result, args, kwargs)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            with Span(name, {}) as s:
+                result = fn(*args, **kwargs)
+                _measure_into(s, measure, result, args, kwargs)
+                return result
+        return wrapper
+    return decorator
+
+if os.getenv("OPENDEEPSEARCH_TRACE_FILE"):
+    enable(JSONLinesSink(os.environ["OPENDEEPSEARCH_TRACE_FILE"]))
@@ -0,0 +1,170 @@
+"""
+OpenDeepSearchAgent against the local Serper stand-in: throughput of concurrent asks,
+behavior when the search provider hangs, and how asks degrade to meet a deadline.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+# No network needed: use LiteLLM's bundled model cost map
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from opendeepsearch import ods_agent
+from opendeepsearch.ods_agent import OpenDeepSearchAgent
+from opendeepsearch.ods_tool import OpenDeepSearchTool
+from opendeepsearch.background_loop import BackgroundLoop
+from opendeepsearch.deadline import DegradationPolicy
+from opendeepsearch.serp_search.serp_search import SerperAPI, SerperConfig
+from opendeepsearch.serp_search.stub_server import LatencyModel, StubSearchServer
+
+SERP_LATENCY_S = 0.1
+LLM_LATENCY_S = 0.05
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replace the LiteLLM completion with a fixed-latency fake and record its calls"""
+    calls = []
+
+    async def acompletion(model, messages, **kwargs):
+        calls.append(kwargs)
+        await ods_agent.asyncio.sleep(LLM_LATENCY_S)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="stub answer"))])
+
+    monkeypatch.setattr(ods_agent, "acompletion", acompletion)
+    return calls
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundLoop()
+    yield loop
+    loop.stop()
+
+def make_agent(server: StubSearchServer, background_loop: BackgroundLoop, timeout: float = 5) -> OpenDeepSearchAgent:
+    agent = OpenDeepSearchAgent(model="stub/model", serper_api_key="stub", background_loop=background_loop)
+    agent.serp_search = SerperAPI(config=SerperConfig(api_key="stub", api_url=server.serper_url, timeout=timeout))
+    return agent
+
+def test_concurrent_asks_overlap_search_and_llm_latency(fake_llm, background_loop):
+    queries = [f"load test query {i}" for i in range(32)]
+    with StubSearchServer(latency=LatencyModel(median=SERP_LATENCY_S), seed=1) as server:
+        agent = make_agent(server, background_loop)
+        start = time.perf_counter()
+        answers = agent.ask_many_sync(queries, concurrency=8)
+        elapsed = time.perf_counter() - start
+        agent.close()
+        stats = server.stats()
+
+    assert answers == ["stub answer"] * len(queries)
+    assert stats["serper"] == len(queries)
+    assert len(fake_llm) == len(queries)
+    serial = len(queries) * (SERP_LATENCY_S + LLM_LATENCY_S)
+    assert elapsed < serial / 3, f"{elapsed:.2f}s for {len(queries)} asks, serial would take {serial:.2f}s"
+
+def test_hanging_search_provider_is_cut_off_by_client_timeout(fake_llm, background_loop):
+    with StubSearchServer(hang_rate=1.0, hang_seconds=3, seed=1) as server:
+        agent = make_agent(server, background_loop, timeout=0.5)
+        start = time.perf_counter()
+        sources = background_loop.run(agent.serp_search.aget_sources("hanging query"))
+        elapsed = time.perf_counter() - start
+        agent.close()
+
+    assert sources.failed
+    assert elapsed < 2.5
+
+def test_ask_with_deadline_degrades_instead_of_waiting_for_search(fake_llm, background_loop):
+    with StubSearchServer(hang_rate=1.0, hang_seconds=3, seed=1) as server:
+        agent = make_agent(server, background_loop)
+        start = time.perf_counter()
+        answer = agent.ask_sync("hanging query", timeout_s=1.0)
+        elapsed = time.perf_counter() - start
+        agent.close()
+
+    assert answer == "stub answer"
+    assert answer.degradations[0] in ("serp_timeout", "serp_failed")
+    assert elapsed < 1.5
+    assert fake_llm and "timeout" in fake_llm[0]
+
+def test_speculative_answer_skips_refinement_when_search_fails(fake_llm, background_loop):
+    stored = []
+
+    class RecordingCache:
+        async def aget(self, query, variant=""):
+            return None
+
+        async def aput(self, query, answer, variant=""):
+            stored.append(query)
+
+    with StubSearchServer(error_rate=1.0, seed=1) as server:
+        agent = make_agent(server, background_loop)
+        agent.answer_cache = RecordingCache()
+        handle = agent.ask_speculative_sync("failing query")
+        agent.close()
+
+    assert handle.done()
+    assert handle.result(timeout=0) == handle.draft == "stub answer"
+    assert len(fake_llm) == 1
+    assert stored == []
+
+def test_slow_search_is_abandoned_for_the_llm_reserve(fake_llm, background_loop):
+    # A 1s budget keeps 0.5s for the completion, so a 1s search is cut off halfway
+    with StubSearchServer(latency=LatencyModel(median=1.0), seed=1) as server:
+        agent = make_agent(server, background_loop)
+        start = time.perf_counter()
+        answer = agent.ask_sync("slow query", timeout_s=1.0)
+        elapsed = time.perf_counter() - start
+        agent.close()
+
+    assert answer.degradations == ("serp_timeout", "capped_tokens")
+    assert elapsed < 1.0
+    assert fake_llm[0]["max_tokens"] == agent.degradation_policy.min_completion_tokens
+
+def test_failed_search_degrades_to_an_answer_without_context(fake_llm, background_loop):
+    with StubSearchServer(error_rate=1.0, seed=1) as server:
+        agent = make_agent(server, background_loop)
+        answer = agent.ask_sync("failing query", timeout_s=5.0)
+        agent.close()
+
+    assert answer == "stub answer"
+    assert answer.degradations[0] == "serp_failed"
+
+@pytest.mark.parametrize("llm_reserve_s,capped", [(5.0, True), (0.5, False)])
+def test_completion_tokens_are_capped_only_when_the_budget_is_short(fake_llm, background_loop, llm_reserve_s, capped):
+    # min_scrape_s is out of reach, so the ask answers from snippets and goes straight to the LLM
+    policy = DegradationPolicy(llm_reserve_s=llm_reserve_s, min_scrape_s=10.0)
+    with StubSearchServer(latency=LatencyModel(median=0.01), seed=1) as server:
+        agent = make_agent(server, background_loop)
+        agent.degradation_policy = policy
+        answer = agent.ask_sync("fast query", timeout_s=2.0)
+        agent.close()
+
+    assert answer.degradations == (("skipped_scrape", "capped_tokens") if capped else ("skipped_scrape",))
+    assert 1.0 < fake_llm[0]["timeout"] <= 2.0
+    if capped:
+        # About 2s left at the assumed generation speed
+        assert policy.min_completion_tokens <= fake_llm[0]["max_tokens"] <= 2.0 * policy.llm_tokens_per_s
+    else:
+        assert "max_tokens" not in fake_llm[0]
+
+def test_tool_notes_degradations_in_its_answer(fake_llm, background_loop):
+    with StubSearchServer(error_rate=1.0, seed=1) as server:
+        tool = OpenDeepSearchTool(model_name="stub/model", serper_api_key="stub", timeout_s=2.0)
+        tool.search_tool = make_agent(server, background_loop)
+        answer = tool.forward("failing query")
+        tool.search_tool.close()
+
+    assert answer.startswith("stub answer\n\n[Answered under a 2s time limit; degraded: serp_failed")
+    assert tool.last_degradations[0] == "serp_failed"
+
+def test_tool_answer_is_plain_without_degradations(fake_llm, background_loop):
+    with StubSearchServer(seed=1) as server:
+        tool = OpenDeepSearchTool(model_name="stub/model", serper_api_key="stub")
+        tool.search_tool = make_agent(server, background_loop)
+        answer = tool.forward("plain query")
+        tool.search_tool.close()
+
+    assert answer == "stub answer"
+    assert tool.last_degradations == ()
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from opendeepsearch import answer_cache
+from opendeepsearch.answer_cache import InMemoryAnswerStore, SemanticAnswerCache, SQLiteAnswerStore
+from opendeepsearch.serp_search.search_cache import TTLRule
+
+VOCABULARY = ["aave", "safe", "is", "what", "gas", "price", "uniswap", "fee", "tvl", "curve"]
+
+def embedder(texts):
+    """Bag of words over a tiny vocabulary, enough to tell paraphrases from other questions"""
+    rows = []
+    for text in texts:
+        words = text.lower().replace("?", "").split()
+        rows.append([float(words.count(word)) for word in VOCABULARY])
+    return torch.tensor(rows)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+def test_paraphrase_hits_and_other_questions_miss():
+    cache = SemanticAnswerCache(embedder, threshold=0.95)
+    cache.put("Is Aave safe?", "Audited, with a long track record.")
+    assert cache.get("is aave safe") == "Audited, with a long track record."
+    assert cache.get("What is the Uniswap fee?") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_variants_do_not_share_answers():
+    cache = SemanticAnswerCache(embedder)
+    cache.put("Is Aave safe?", "pro answer", variant="2|pro")
+    assert cache.get("Is Aave safe?", variant="2|default") is None
+    assert cache.get("Is Aave safe?", variant="2|pro") == "pro answer"
+
+def test_entries_expire_by_ttl_rule(clock):
+    cache = SemanticAnswerCache(embedder, ttl_rules=[TTLRule("gas", r"\bgas\b", ttl=15)], default_ttl=300)
+    cache.put("gas price", "12 gwei")
+    cache.put("Is Aave safe?", "yes")
+    clock[0] += 16
+    assert cache.get("gas price") is None
+    assert cache.get("Is Aave safe?") == "yes"
+    assert cache.stats()["expired"] == 1
+    assert len(cache.store) == 1
+
+def test_lru_eviction_reuses_matrix_rows():
+    store = InMemoryAnswerStore(max_entries=2)
+    cache = SemanticAnswerCache(embedder, store=store)
+    cache.put("Is Aave safe?", "aave")
+    cache.put("gas price", "gas")
+    assert cache.get("Is Aave safe?") == "aave"  # now the most recently used
+    cache.put("uniswap fee", "fee")  # evicts "gas price"
+    assert cache.get("gas price") is None
+    assert cache.get("uniswap fee") == "fee"
+    assert cache.get("Is Aave safe?") == "aave"
+    assert cache.stats()["evictions"] == 1
+    assert store._matrix.shape == (2, len(VOCABULARY))
+
+@pytest.mark.parametrize("max_entries", [0, -1])
+def test_store_needs_room_for_an_entry(max_entries, tmp_path):
+    with pytest.raises(ValueError):
+        InMemoryAnswerStore(max_entries=max_entries)
+    with pytest.raises(ValueError):
+        SQLiteAnswerStore(str(tmp_path / "answers.sqlite"), max_entries=max_entries)
+
+def test_replacing_an_entry_keeps_one_row():
+    store = InMemoryAnswerStore(max_entries=4)
+    cache = SemanticAnswerCache(embedder, store=store)
+    cache.put("Is Aave safe?", "old")
+    cache.put("is aave safe", "new")
+    assert len(store) == 1
+    assert cache.get("Is Aave safe?") == "new"
+
+def test_sqlite_store_reloads_answers(tmp_path):
+    path = str(tmp_path / "answers.sqlite")
+    SemanticAnswerCache(embedder, sqlite_path=path).put("Is Aave safe?", "persisted")
+    reloaded = SemanticAnswerCache(embedder, store=SQLiteAnswerStore(path))
+    assert reloaded.get("is aave safe") == "persisted"
+
+def test_embedder_failure_is_a_miss():
+    def broken(texts):
+        raise RuntimeError("embedding service down")
+
+    cache = SemanticAnswerCache(broken)
+    cache.put("Is Aave safe?", "yes")
+    assert cache.get("Is Aave safe?") is None
+    assert cache.stats()["errors"] == 2
@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import os
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+# No network needed: use LiteLLM's bundled model cost map
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from opendeepsearch.ods_agent import OpenDeepSearchAgent
+
+class FakeLLM:
+    """Stands in for OpenDeepSearchAgent._complete; tracks how many asks are in flight"""
+    def __init__(self, delay=0.02, delays=None, fail=()):
+        self.delay = delay
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.active = 0
+        self.peak = 0
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, query, context, deadline=None):
+        self.started.append(query)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(query, self.delay))
+            if query in self.fail:
+                raise ValueError(f"LLM rejected {query}")
+            return f"answer to {query}"
+        except asyncio.CancelledError:
+            self.cancelled.append(query)
+            raise
+        finally:
+            self.active -= 1
+
+@pytest.fixture
+def agent():
+    agent = OpenDeepSearchAgent(model="stub/model", serper_api_key="stub")
+
+    async def no_search(query, max_sources=2, pro_mode=False, deadline=None):
+        return ""
+
+    agent.search_and_build_context = no_search
+    return agent
+
+def test_concurrency_bound_and_input_order(agent):
+    llm = agent._complete = FakeLLM()
+    queries = [f"query {i}" for i in range(20)]
+    answers = asyncio.run(agent.ask_many(queries, concurrency=4))
+    assert answers == [f"answer to {q}" for q in queries]
+    assert llm.peak == 4
+    assert llm.active == 0
+
+def test_as_completed_yields_in_finishing_order(agent):
+    agent._complete = FakeLLM(delays={"slow": 0.1, "medium": 0.05, "fast": 0.0})
+
+    async def run():
+        return [pair async for pair in agent.ask_many_as_completed(["slow", "medium", "fast"], concurrency=3)]
+
+    assert asyncio.run(run()) == [(2, "answer to fast"), (1, "answer to medium"), (0, "answer to slow")]
+
+def test_return_exceptions_keeps_failures_in_their_slot(agent):
+    agent._complete = FakeLLM(fail={"bad"})
+    answers = asyncio.run(agent.ask_many(["good", "bad", "also good"], return_exceptions=True))
+    assert answers[0] == "answer to good" and answers[2] == "answer to also good"
+    assert isinstance(answers[1], ValueError)
+
+def test_failure_cancels_the_asks_in_flight(agent):
+    llm = agent._complete = FakeLLM(delays={"bad": 0.01}, delay=1.0, fail={"bad"})
+    queries = ["bad"] + [f"slow {i}" for i in range(9)]
+    with pytest.raises(ValueError):
+        asyncio.run(agent.ask_many(queries, concurrency=4))
+    # Every slow ask that started was cancelled, the rest never started,
+    # and nothing keeps running after the error
+    assert sorted(llm.cancelled) == sorted(q for q in llm.started if q != "bad")
+    assert len(llm.started) < len(queries)
+    assert llm.active == 0
+
+def test_cancelling_the_batch_cancels_every_ask(agent):
+    llm = agent._complete = FakeLLM(delay=1.0)
+
+    async def run():
+        batch = asyncio.ensure_future(agent.ask_many([f"query {i}" for i in range(10)], concurrency=3))
+        while llm.active < 3:
+            await asyncio.sleep(0.01)
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+
+    asyncio.run(run())
+    assert sorted(llm.cancelled) == ["query 0", "query 1", "query 2"]
+    assert len(llm.started) == 3
+    assert llm.active == 0
+
+def test_leaving_as_completed_early_cancels_the_rest(agent):
+    llm = agent._complete = FakeLLM(delays={"fast": 0.0}, delay=1.0)
+
+    async def run():
+        async with contextlib.aclosing(agent.ask_many_as_completed(["fast", "slow 1", "slow 2"])) as completed:
+            async for pair in completed:
+                return pair
+
+    assert asyncio.run(run()) == (0, "answer to fast")
+    assert sorted(llm.cancelled) == ["slow 1", "slow 2"]
+    assert llm.active == 0
@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from opendeepsearch.context_scraping import browser_pool
+from opendeepsearch.context_scraping.browser_pool import BrowserPool, BrowserPoolConfig
+
+class FakeCrawler:
+    """AsyncWebCrawler stand-in; URLs containing 'bad' raise, everything else takes `delay`"""
+    instances = []
+
+    def __init__(self, config=None, delay=0.02, fail_start=False):
+        self.delay = delay
+        self.fail_start = fail_start
+        self.active = 0
+        self.peak = 0
+        self.closed = False
+        self.killed = []
+        self.crawler_strategy = SimpleNamespace(kill_session=self.kill_session)
+        FakeCrawler.instances.append(self)
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+        if self.fail_start:
+            raise RuntimeError("browser failed to launch")
+
+    async def close(self):
+        self.closed = True
+
+    async def kill_session(self, session_id):
+        self.killed.append(session_id)
+
+    async def arun(self, url, config):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if "bad" in url:
+                raise RuntimeError(f"crawl of {url} failed")
+            return SimpleNamespace(url=url, session_id=config.session_id)
+        finally:
+            self.active -= 1
+
+@pytest.fixture
+def crawlers(monkeypatch):
+    FakeCrawler.instances = []
+    monkeypatch.setattr(browser_pool, "AsyncWebCrawler", FakeCrawler)
+    return FakeCrawler.instances
+
+def make_pool(**config):
+    return BrowserPool(browser_config=SimpleNamespace(), config=BrowserPoolConfig(**config))
+
+def crawl(pool, *batches):
+    """Crawl each batch of urls concurrently, one batch after another on the same loop"""
+    async def run():
+        results = []
+        for urls in batches:
+            results.append(await asyncio.gather(
+                *(pool.arun(url, SimpleNamespace()) for url in urls), return_exceptions=True
+            ))
+        return results, pool.stats()
+
+    return asyncio.run(run())
+
+def test_pool_launches_at_most_size_browsers(crawlers):
+    pool = make_pool(size=2, pages_per_browser=3)
+    (results,), stats = crawl(pool, [f"https://site.test/{i}" for i in range(12)])
+
+    assert [r.url for r in results] == [f"https://site.test/{i}" for i in range(12)]
+    assert len(crawlers) == 2 and stats["launches"] == 2
+    # Each browser had all its pages busy at once, but never more
+    assert [crawler.peak for crawler in crawlers] == [3, 3]
+    assert stats["pages_in_use"] == 0 and stats["pages_served"] == 12
+
+def test_concurrent_pages_use_distinct_sessions(crawlers):
+    pool = make_pool(size=1, pages_per_browser=4)
+    (results, more), _ = crawl(pool, [f"https://site.test/{i}" for i in range(4)],
+                               [f"https://site.test/{i}" for i in range(4, 8)])
+    assert len({r.session_id for r in results}) == 4
+    # Sessions are reused by later pages
+    assert len(crawlers) == 1
+    assert {r.session_id for r in more} == {r.session_id for r in results}
+
+def test_browser_is_recycled_after_max_pages(crawlers):
+    pool = make_pool(size=1, pages_per_browser=1, max_pages_per_browser=3)
+
+    async def run():
+        for i in range(7):
+            await pool.arun(f"https://site.test/{i}", SimpleNamespace())
+        return pool.stats()
+
+    stats = asyncio.run(run())
+    assert stats["launches"] == 3 and stats["recycled"] == 2
+    assert [crawler.closed for crawler in crawlers] == [True, True, False]
+
+def test_failed_page_is_released_and_its_session_reset(crawlers):
+    pool = make_pool(size=1, pages_per_browser=2, max_consecutive_failures=3)
+    (results, again), stats = crawl(pool, ["https://bad.test/", "https://site.test/"],
+                                    ["https://site.test/a", "https://site.test/b"])
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].url == "https://site.test/"
+    assert stats["pages_in_use"] == 0
+    crawler, = crawlers
+    assert len(crawler.killed) == 1 and not crawler.closed
+    # The failed slot is leased again afterwards
+    assert crawler.killed[0] in {r.session_id for r in again}
+
+def test_consecutive_failures_recycle_the_browser(crawlers):
+    pool = make_pool(size=1, pages_per_browser=1, max_consecutive_failures=2)
+
+    async def run():
+        outcomes = []
+        for url in ["https://bad.test/1", "https://site.test/", "https://bad.test/2", "https://bad.test/3",
+                    "https://site.test/after"]:
+            try:
+                outcomes.append((await pool.arun(url, SimpleNamespace())).url)
+            except RuntimeError:
+                outcomes.append("error")
+        return outcomes, pool.stats()
+
+    outcomes, stats = asyncio.run(run())
+    assert outcomes == ["error", "https://site.test/", "error", "error", "https://site.test/after"]
+    # A success in between resets the count, so only the two failures in a row recycle
+    assert stats["recycled"] == 1 and stats["launches"] == 2
+    assert crawlers[0].closed
+
+def test_failed_launch_releases_the_slot(crawlers, monkeypatch):
+    launches = iter([True, False])
+    monkeypatch.setattr(browser_pool, "AsyncWebCrawler", lambda config: FakeCrawler(config, fail_start=next(launches)))
+    pool = make_pool(size=1, pages_per_browser=2)
+
+    async def run():
+        first = await asyncio.gather(
+            pool.arun("https://site.test/1", SimpleNamespace()),
+            pool.arun("https://site.test/2", SimpleNamespace()),
+            return_exceptions=True
+        )
+        second = await pool.arun("https://site.test/3", SimpleNamespace())
+        return first, second, pool.stats()
+
+    first, second, stats = asyncio.run(run())
+    # Both waiters on the failed launch see its error; the next page gets a fresh browser
+    assert all(isinstance(r, RuntimeError) for r in first)
+    assert second.url == "https://site.test/3"
+    assert stats["launches"] == 2 and stats["browsers"] == 1 and stats["pages_in_use"] == 0
+    assert crawlers[0].closed
+
+def test_aclose_closes_every_browser(crawlers):
+    pool = make_pool(size=2, pages_per_browser=1)
+
+    async def run():
+        await asyncio.gather(*(pool.arun(f"https://site.test/{i}", SimpleNamespace()) for i in range(2)))
+        await pool.aclose()
+        return pool.stats()
+
+    stats = asyncio.run(run())
+    assert stats["browsers"] == 0
+    assert len(crawlers) == 2 and all(crawler.closed for crawler in crawlers)
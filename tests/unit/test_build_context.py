@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from opendeepsearch.context_building.build_context import build_budgeted_context, build_context
+from opendeepsearch.context_building.tokens import count_tokens, truncate_to_tokens
+
+def page(rank, chunk_scores):
+    return {
+        "title": f"Result {rank}",
+        "link": f"https://example-{rank}.test/",
+        "snippet": f"Snippet for result {rank} about lending pools.",
+        "chunks": [
+            {"document": f"Chunk {rank}.{i} " + "collateral and liquidation details " * 10, "score": score}
+            for i, score in enumerate(chunk_scores)
+        ],
+    }
+
+SOURCES = {
+    "answerBox": {"answer": "Aave is a lending protocol."},
+    "organic": [page(1, [0.2, 0.9]), page(2, [0.8, 0.1]), {"title": "No snippet", "link": "https://x.test/"}],
+    "topStories": [{"title": "Aave v4 announced"}],
+}
+
+def test_truncate_to_tokens_respects_the_limit():
+    text = "word " * 500
+    truncated = truncate_to_tokens(text, 50)
+    assert count_tokens(truncated) <= 50
+    assert truncated.endswith(" ...")
+    assert truncate_to_tokens("short text", 50) == "short text"
+    assert truncate_to_tokens(text, 1) == ""
+
+def test_unbounded_context_keeps_everything():
+    context = build_context(SOURCES)
+    assert "ANSWER BOX:" in context and "TOP STORIES:" in context
+    assert "Snippet for result 2" in context
+
+@pytest.mark.parametrize("budget", [60, 150, 300, 1000])
+def test_budgeted_context_fits_the_budget(budget):
+    context = build_budgeted_context(SOURCES, budget)
+    # Counting the joined string can differ from the sum of its pieces by a token or two
+    assert count_tokens(context) <= budget + 4
+
+def budget_for_chunks(*chunks):
+    """Budget that fits everything but scraped chunks, plus `chunks` (given as (rank, index))"""
+    without_chunks = {**SOURCES, "organic": [{k: v for k, v in item.items() if k != "chunks"} for item in SOURCES["organic"]]}
+    full = build_budgeted_context(without_chunks, 100_000)
+    # Smallest budget that still admits every non-chunk piece, as build_budgeted_context counts it
+    budget = next(b for b in range(1, 1000) if build_budgeted_context(without_chunks, b) == full) + 4
+    for rank, i in chunks:
+        chunk = SOURCES["organic"][rank - 1]["chunks"][i]["document"].strip()
+        budget += count_tokens(chunk) + count_tokens("additional information: ") + 1
+    return budget
+
+def test_low_value_text_is_dropped_first():
+    context = build_budgeted_context(SOURCES, budget_for_chunks((1, 1)))
+    assert "Aave is a lending protocol." in context
+    assert "Snippet for result 1" in context and "Snippet for result 2" in context
+    # Only the best chunk across all pages fits
+    assert "Chunk 1.1" in context
+    assert "Chunk 2.0" not in context and "Chunk 1.0" not in context
+
+def test_chunks_are_packed_by_score_across_pages():
+    context = build_budgeted_context(SOURCES, budget_for_chunks((1, 1), (2, 0)))
+    assert "Chunk 1.1" in context and "Chunk 2.0" in context
+    assert "Chunk 1.0" not in context and "Chunk 2.1" not in context
+
+def test_large_budget_matches_unbounded_content():
+    context = build_budgeted_context(SOURCES, 100_000)
+    for text in ("ANSWER BOX:", "Chunk 1.0", "Chunk 2.1", "TOP STORIES:", "Aave v4 announced"):
+        assert text in context
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from opendeepsearch.serp_search import circuit_breaker
+from opendeepsearch.serp_search.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
+from opendeepsearch.serp_search.serp_search import SearchRateLimitError
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def fail(breaker, error=RuntimeError("provider down")):
+    with pytest.raises(type(error)):
+        with breaker.call():
+            raise error
+
+def succeed(breaker):
+    with breaker.call():
+        pass
+
+def make_breaker(**kwargs):
+    config = CircuitBreakerConfig(failure_threshold=3, reset_timeout=30.0)
+    return CircuitBreaker("serper", max_timeout=10, config=config, **kwargs)
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker()
+    fail(breaker)
+    fail(breaker)
+    succeed(breaker)  # resets the streak
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        succeed(breaker)
+    assert breaker.snapshot()["rejected"] == 1
+
+def test_half_open_trial_closes_or_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        fail(breaker)
+    clock[0] += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    fail(breaker)  # the trial fails
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 30
+    succeed(breaker)  # the next trial succeeds
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_only_one_trial_request_while_half_open(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        fail(breaker)
+    clock[0] += 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_ignored_errors_do_not_count_as_failures(clock):
+    breaker = make_breaker(ignored_errors=(SearchRateLimitError,))
+    for _ in range(5):
+        fail(breaker, SearchRateLimitError("serper rate limit exceeded (HTTP 429)"))
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["failures"] == 0
+
+def test_ignored_error_releases_the_half_open_trial(clock):
+    breaker = make_breaker(ignored_errors=(SearchRateLimitError,))
+    for _ in range(3):
+        fail(breaker)
+    clock[0] += 30
+    fail(breaker, SearchRateLimitError("serper rate limit exceeded (HTTP 429)"))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    succeed(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_timeout_adapts_to_p95_latency():
+    breaker = CircuitBreaker("serper", max_timeout=10, config=CircuitBreakerConfig(min_samples=5, min_timeout=1.0))
+    assert breaker.timeout() == 10
+    for seconds in (0.4, 0.5, 0.6, 0.7, 0.8):
+        breaker.record_success(seconds)
+    assert breaker.timeout() == pytest.approx(1.6)
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from opendeepsearch.serp_search.coalescing_search import CoalescingSearchAPI
+from opendeepsearch.serp_search.serp_search import SerperAPI, SerperConfig
+from opendeepsearch.serp_search.stub_server import LatencyModel, StubSearchServer
+
+@pytest.fixture
+def server():
+    with StubSearchServer(latency=LatencyModel(median=0.05), seed=1) as server:
+        yield server
+
+def make_api(server):
+    return CoalescingSearchAPI(SerperAPI(config=SerperConfig(api_key="stub", api_url=server.serper_url)))
+
+def test_async_batch_keeps_one_batched_request(server):
+    api = make_api(server)
+    queries = [f"aave query {i}" for i in range(10)]
+
+    async def run():
+        results = await api.aget_sources_many(queries)
+        await api.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert all(result.success for result in results)
+    assert server.stats()["serper"] == 1
+
+def test_sync_batch_sends_duplicate_queries_once(server):
+    api = make_api(server)
+    results = api.get_sources_many(["Is Aave safe?", "is aave safe", "curve tvl"])
+    assert server.stats()["serper"] == 1
+    assert [result.success for result in results] == [True, True, True]
+    # Duplicates get private copies
+    results[0].data["organic"][0]["html"] = "annotated"
+    assert "html" not in results[1].data["organic"][0]
+
+def test_concurrent_identical_searches_share_one_request(server):
+    api = make_api(server)
+
+    async def run():
+        results = await asyncio.gather(*(api.aget_sources("Is Aave safe?") for _ in range(5)))
+        await api.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert all(result.success for result in results)
+    assert server.stats()["serper"] == 1
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from opendeepsearch.serp_search.federated_search import FederatedSearchAPI
+from opendeepsearch.serp_search.serp_search import SearchAPI, SearchResult
+
+class FakeAPI(SearchAPI):
+    """Provider answering after `delay` seconds with its own organic links, or failing"""
+    def __init__(self, name, delay=0.0, fail=False, links=None):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.links = links or [f"https://{name}.test/{i}" for i in range(3)]
+        self.calls = 0
+        self.closed = False
+
+    def _result(self):
+        if self.fail:
+            return SearchResult(error=f"{self.name} down")
+        return SearchResult(data={
+            "organic": [{"title": self.name, "link": link} for link in self.links],
+            "relatedSearches": [f"{self.name} related"],
+        })
+
+    def get_sources(self, query, num_results=8, stored_location=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self._result()
+
+    async def aget_sources(self, query, num_results=8, stored_location=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self._result()
+
+    async def aclose(self):
+        self.closed = True
+
+def search(api, use_async):
+    if use_async:
+        return asyncio.run(api.aget_sources("aave tvl"))
+    return api.get_sources("aave tvl")
+
+def timed_search(api, use_async):
+    start = time.perf_counter()
+    result = search(api, use_async)
+    return result, time.perf_counter() - start
+
+both_modes = pytest.mark.parametrize("use_async", [False, True])
+
+@both_modes
+def test_race_returns_the_first_success(use_async):
+    slow, fast = FakeAPI("slow", delay=0.3), FakeAPI("fast", delay=0.01)
+    result, elapsed = timed_search(FederatedSearchAPI([slow, fast], strategy="race"), use_async)
+    assert result.data["organic"][0]["title"] == "fast"
+    assert slow.calls == fast.calls == 1
+    assert elapsed < 0.25
+
+@both_modes
+def test_race_skips_a_fast_failure(use_async):
+    broken, slow = FakeAPI("broken", fail=True), FakeAPI("slow", delay=0.05)
+    result = search(FederatedSearchAPI([broken, slow], strategy="race"), use_async)
+    assert result.data["organic"][0]["title"] == "slow"
+
+@both_modes
+def test_hedge_does_not_call_the_backup_when_the_primary_is_fast(use_async):
+    primary, backup = FakeAPI("primary", delay=0.01), FakeAPI("backup")
+    result = search(FederatedSearchAPI([primary, backup], strategy="hedge", hedge_delay=0.5), use_async)
+    assert result.data["organic"][0]["title"] == "primary"
+    assert backup.calls == 0
+
+@both_modes
+def test_hedge_sends_the_backup_after_the_delay(use_async):
+    primary, backup = FakeAPI("primary", delay=0.5), FakeAPI("backup", delay=0.01)
+    result, elapsed = timed_search(FederatedSearchAPI([primary, backup], strategy="hedge", hedge_delay=0.1), use_async)
+    assert result.data["organic"][0]["title"] == "backup"
+    assert primary.calls == backup.calls == 1
+    assert 0.1 <= elapsed < 0.4
+
+@both_modes
+def test_hedge_falls_back_immediately_on_failure(use_async):
+    primary, backup = FakeAPI("primary", fail=True), FakeAPI("backup")
+    result, elapsed = timed_search(FederatedSearchAPI([primary, backup], strategy="hedge", hedge_delay=1.0), use_async)
+    assert result.data["organic"][0]["title"] == "backup"
+    assert elapsed < 0.5
+
+@both_modes
+def test_merge_interleaves_and_deduplicates(use_async):
+    first = FakeAPI("first", links=["https://a.test/", "https://b.test/"])
+    second = FakeAPI("second", links=["https://www.a.test/", "https://c.test/"])
+    result = search(FederatedSearchAPI([first, second], strategy="merge"), use_async)
+    assert [item["link"] for item in result.data["organic"]] == ["https://a.test/", "https://b.test/", "https://c.test/"]
+    assert result.data["relatedSearches"] == ["first related"]
+
+@both_modes
+@pytest.mark.parametrize("strategy", ["race", "hedge", "merge"])
+def test_all_providers_failing(strategy, use_async):
+    apis = [FakeAPI("serper", fail=True), FakeAPI("searxng", fail=True)]
+    result = search(FederatedSearchAPI(apis, strategy=strategy, hedge_delay=0.05), use_async)
+    assert result.failed
+    assert result.error.startswith("All search providers failed")
+    assert "serper down" in result.error and "searxng down" in result.error
+
+def test_close_stops_the_worker_threads_and_closes_providers():
+    apis = [FakeAPI("primary"), FakeAPI("backup")]
+    federated = FederatedSearchAPI(apis, strategy="race")
+    assert federated.get_sources("aave tvl").success
+    asyncio.run(federated.aclose())
+    assert federated._executor is None
+    assert all(api.closed for api in apis)
+    # Still usable afterwards
+    assert federated.get_sources("aave tvl").success
+    federated.close()
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        FederatedSearchAPI([])
+    with pytest.raises(ValueError):
+        FederatedSearchAPI([FakeAPI("a")], strategy="fastest")
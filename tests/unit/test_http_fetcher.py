@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from opendeepsearch.context_scraping.http_fetcher import HTTPFetcher, is_app_shell, needs_javascript, visible_text_length
+
+ARTICLE = "<html><body><article>" + "<p>Lending pools price collateral with oracles.</p>" * 40 + "</article></body></html>"
+SHORT_PAGE = "<html><body><p>Moved to the new docs site, see the sidebar for links.</p></body></html>"
+APP_SHELL = "<html><head><script src='/app.js'></script></head><body><div id=\"root\"></div></body></html>"
+
+def test_visible_text_ignores_scripts_styles_and_markup():
+    html = "<html><style>p { color: red }</style><script>var x = 1;</script><p>Hello <b>world</b></p></html>"
+    assert visible_text_length(html) == len("Hello world")
+
+def test_app_shell_detection():
+    assert is_app_shell(APP_SHELL)
+    assert is_app_shell("<html><body><noscript>Please enable JavaScript to continue.</noscript><p>Loading</p></body></html>")
+    assert not is_app_shell(ARTICLE)
+    # Plenty of server-rendered text outweighs an empty mount point
+    assert not is_app_shell(ARTICLE.replace("</body>", "<div id='app'></div></body>"))
+
+def test_short_page_needs_javascript_without_being_an_app_shell():
+    assert needs_javascript(SHORT_PAGE)
+    assert not is_app_shell(SHORT_PAGE)
+    assert not needs_javascript(ARTICLE)
+
+def fetch_all(responses, urls, **fetcher_kwargs):
+    """Fetch `urls` with a fetcher whose client answers from `responses` (url -> response or exception)"""
+    fetcher = HTTPFetcher(**fetcher_kwargs)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = responses[str(request.url)]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def run():
+        fetcher.client_pool._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher.client_pool._async_client_loop = asyncio.get_running_loop()
+        results = [await fetcher.fetch(url, config=None) for url in urls]
+        await fetcher.aclose()
+        return results
+
+    return fetcher, asyncio.run(run())
+
+def html_response(html: str, status: int = 200) -> httpx.Response:
+    return httpx.Response(status, text=html, headers={"content-type": "text/html; charset=utf-8"})
+
+@pytest.mark.parametrize("status", [403, 429, 503])
+def test_bot_block_statuses_send_the_domain_to_the_browser(status):
+    fetcher, results = fetch_all({"https://blocked.test/a": html_response("denied", status)}, ["https://blocked.test/a"])
+    assert results == [None]
+    assert fetcher.needs_browser("https://blocked.test/other")
+
+def test_app_shell_sends_the_domain_to_the_browser():
+    fetcher, results = fetch_all({"https://spa.test/": html_response(APP_SHELL)}, ["https://spa.test/"])
+    assert results == [None]
+    assert fetcher.needs_browser("https://www.spa.test/docs")
+
+@pytest.mark.parametrize("response", [
+    html_response("not found", 404),
+    httpx.Response(200, content=b"%PDF-1.7", headers={"content-type": "application/pdf"}),
+    html_response(SHORT_PAGE),
+    httpx.ConnectTimeout("timed out"),
+    httpx.Response(200, content=ARTICLE.encode(), headers={"content-type": "text/html", "content-length": "12kb"}),
+])
+def test_page_specific_failures_fall_back_for_that_url_only(response):
+    fetcher, results = fetch_all({"https://docs.test/a": response}, ["https://docs.test/a"])
+    assert results == [None]
+    assert not fetcher.needs_browser("https://docs.test/b")
+
+def test_oversized_body_falls_back_for_that_url_only():
+    fetcher, results = fetch_all({"https://big.test/a": html_response(ARTICLE)}, ["https://big.test/a"], max_bytes=1000)
+    assert results == [None]
+    assert not fetcher.needs_browser("https://big.test/b")
+
+def test_unknown_charset_does_not_break_the_probe():
+    fetcher = HTTPFetcher()
+
+    def handler(request):
+        return httpx.Response(200, content=ARTICLE.encode(), headers={"content-type": "text/html; charset=no-such-charset"})
+
+    async def run():
+        fetcher.client_pool._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher.client_pool._async_client_loop = asyncio.get_running_loop()
+        result = await fetcher._get("https://docs.test/a")
+        await fetcher.aclose()
+        return result
+
+    html, _, status = asyncio.run(run())
+    assert status == 200
+    assert html is None or html == ARTICLE
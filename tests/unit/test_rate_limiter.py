@@ -0,0 +1,98 @@
+import asyncio
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from opendeepsearch import rate_limiter
+from opendeepsearch.rate_limiter import RateLimiter, RateLimitTimeout, TokenBucket, parse_retry_after
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [50.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=sleep))
+    return SimpleNamespace(now=now, sleeps=sleeps)
+
+def test_bucket_bursts_then_queues_reservations_in_order(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.remaining() == pytest.approx(-2)
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+    for _ in range(4):
+        bucket.reserve()
+    clock.now[0] += 1
+    assert bucket.remaining() == pytest.approx(2)
+    clock.now[0] += 10
+    assert bucket.remaining() == pytest.approx(4)
+
+def test_reservation_over_timeout_raises_and_reserves_nothing(clock):
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.reserve()
+    with pytest.raises(RateLimitTimeout):
+        bucket.reserve(timeout=0.5)
+    assert bucket.remaining() == pytest.approx(0)
+
+def test_block_for_holds_back_every_caller(clock):
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.block_for(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+def test_acquire_sleeps_for_its_reservation(clock):
+    limiter = RateLimiter()
+    limiter.configure("serper", rate=1, burst=1)
+    limiter.acquire("serper", "key")
+    limiter.acquire("serper", "key")
+    assert clock.sleeps == [pytest.approx(1.0)]
+    # Keys are limited separately
+    limiter.acquire("serper", "other-key")
+    assert len(clock.sleeps) == 1
+
+def test_unconfigured_providers_are_only_counted(clock):
+    limiter = RateLimiter()
+    for _ in range(5):
+        limiter.acquire("jina")
+    assert clock.sleeps == []
+    assert limiter.remaining("jina") is None
+    assert limiter.snapshot()["jina:-"]["granted"] == 5
+
+def test_cancelled_async_wait_refunds_its_token():
+    limiter = RateLimiter()
+    limiter.configure("serper", rate=1, burst=1)
+
+    async def run():
+        await limiter.aacquire("serper", "key")
+        waiter = asyncio.ensure_future(limiter.aacquire("serper", "key"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+    # Without the refund the bucket would still owe the cancelled reservation
+    assert limiter.remaining("serper", "key") > -0.5
+    assert limiter.snapshot()["serper:" + RateLimiter._key_id("key")]["granted"] == 1
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+def test_import_does_not_load_the_agent():
+    # Services outside the package import the limiter; that must not pull in crawl4ai or litellm
+    code = "import sys, opendeepsearch.rate_limiter; assert 'opendeepsearch.ods_agent' not in sys.modules"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from opendeepsearch.context_scraping import scrape_cache
+from opendeepsearch.context_scraping.http_fetcher import FetchedPage, HTTPFetcher, PageMarkdown
+from opendeepsearch.context_scraping.scrape_cache import ScrapeCache
+
+def fetched(url, text, etag=None, last_modified=None):
+    return FetchedPage(
+        url=url,
+        html=f"<html><body><p>{text}</p></body></html>",
+        markdown_v2=PageMarkdown(raw_markdown=text, markdown_with_citations=text, fit_markdown=text),
+        etag=etag,
+        last_modified=last_modified
+    )
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scrape_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape.sqlite"), default_ttl=60, domain_ttls={"aave.com": 3600})
+    yield cache
+    cache.close()
+
+def test_round_trip_by_canonical_url(cache):
+    cache.put("https://www.aave.com/docs/?utm_source=x", fetched("https://aave.com/docs", "Aave docs", etag='"v1"'))
+    entry = cache.get("https://aave.com/docs")
+    assert entry is not None and entry.fresh
+    assert entry.page.markdown_v2.raw_markdown == "Aave docs"
+    assert entry.etag == '"v1"'
+    assert "<p>Aave docs</p>" in entry.page.html
+    assert cache.get("https://aave.com/other") is None
+
+def test_domain_ttls_cover_subdomains(cache):
+    assert cache.ttl_for("https://docs.aave.com/page") == 3600
+    assert cache.ttl_for("https://curve.fi/") == 60
+
+def test_stale_entry_is_refreshed_after_304(cache, clock):
+    cache.put("https://curve.fi/pools", fetched("https://curve.fi/pools", "Pools", etag='"abc"'))
+    clock[0] += 61
+    entry = cache.get("https://curve.fi/pools")
+    assert not entry.fresh
+
+    fetcher = HTTPFetcher()
+    seen = {}
+
+    def handler(request):
+        seen["if-none-match"] = request.headers.get("if-none-match")
+        return httpx.Response(304)
+
+    async def revalidate():
+        fetcher.client_pool._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher.client_pool._async_client_loop = asyncio.get_running_loop()
+        unchanged = await fetcher.revalidate(entry.url, entry.etag, entry.last_modified)
+        await fetcher.aclose()
+        return unchanged
+
+    assert asyncio.run(revalidate()) is True
+    assert seen["if-none-match"] == '"abc"'
+    cache.refresh("https://curve.fi/pools")
+    assert cache.get("https://curve.fi/pools").fresh
+    assert cache.stats()["revalidated"] == 1
+
+def test_identical_content_shares_one_blob(cache):
+    cache.put("https://mirror-a.test/page", fetched("https://mirror-a.test/page", "Same body"), include_html=False)
+    cache.put("https://mirror-b.test/page", fetched("https://mirror-b.test/page", "Same body"), include_html=False)
+    stats = cache.stats()
+    assert stats["pages"] == 2 and stats["blobs"] == 1
+
+def random_page(url):
+    # Random text barely compresses, so every page's blob is about the same size
+    return fetched(url, os.urandom(400).hex())
+
+def blob_size(tmp_path):
+    probe = ScrapeCache(str(tmp_path / "probe.sqlite"), compression_level=1)
+    probe.put("https://probe.test/", random_page("https://probe.test/"), include_html=False)
+    size = probe.stats()["bytes"]
+    probe.close()
+    return size
+
+def test_eviction_keeps_blobs_under_max_bytes(tmp_path, clock):
+    max_bytes = int(blob_size(tmp_path) * 3.5)
+    cache = ScrapeCache(str(tmp_path / "small.sqlite"), max_bytes=max_bytes, compression_level=1)
+    for i in range(10):
+        clock[0] += 1
+        cache.put(f"https://site.test/{i}", random_page(f"https://site.test/{i}"), include_html=False)
+    stats = cache.stats()
+    assert stats["bytes"] <= max_bytes
+    assert stats["pages"] == 3 and stats["evictions"] == 7
+    # The most recently written pages survive
+    assert cache.get("https://site.test/9") is not None
+    assert cache.get("https://site.test/0") is None
+    cache.close()
+
+def test_recently_read_pages_survive_eviction(tmp_path, clock):
+    cache = ScrapeCache(str(tmp_path / "lru.sqlite"), max_bytes=int(blob_size(tmp_path) * 2.5), compression_level=1)
+    for i in range(2):
+        clock[0] += 1
+        cache.put(f"https://site.test/{i}", random_page(f"https://site.test/{i}"), include_html=False)
+    clock[0] += 1
+    cache.get("https://site.test/0")  # now more recently used than page 1
+    clock[0] += 1
+    cache.put("https://site.test/2", random_page("https://site.test/2"), include_html=False)
+    assert cache.get("https://site.test/0") is not None
+    assert cache.get("https://site.test/1") is None
+    cache.close()
@@ -0,0 +1,88 @@
+import asyncio
+
+from opendeepsearch.context_scraping.scrape_scheduler import ScrapeScheduler, url_domain
+
+def test_url_domain_ignores_www_and_case():
+    assert url_domain("https://WWW.Aave.com/docs") == "aave.com"
+    assert url_domain("https://docs.aave.com/") == "docs.aave.com"
+
+async def scrape_all(scheduler, jobs, duration=0.05):
+    """Run (url, priority) jobs through the scheduler; returns urls in start order and peak per-domain load"""
+    started = []
+    active = {}
+    peak = {}
+
+    async def scrape(url, priority):
+        async with scheduler.slot(url, priority):
+            domain = url_domain(url)
+            started.append(url)
+            active[domain] = active.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), active[domain])
+            await asyncio.sleep(duration)
+            active[domain] -= 1
+
+    tasks = [asyncio.ensure_future(scrape(url, priority)) for url, priority in jobs]
+    await asyncio.gather(*tasks)
+    return started, peak
+
+def test_per_domain_cap():
+    scheduler = ScrapeScheduler(max_concurrent=None, max_per_domain=2, politeness_delay_s=0)
+    jobs = [(f"https://aave.com/{i}", i) for i in range(6)] + [("https://curve.fi/", 0)]
+    started, peak = asyncio.run(scrape_all(scheduler, jobs))
+    assert peak["aave.com"] == 2
+    assert len(started) == 7
+
+def test_priority_order_under_global_cap():
+    scheduler = ScrapeScheduler(max_concurrent=1, max_per_domain=None, politeness_delay_s=0)
+    jobs = [(f"https://site-{rank}.test/", rank) for rank in (5, 3, 1, 4, 2)]
+
+    async def run():
+        # Hold the only slot so every job queues before the first is granted
+        async with scheduler.slot("https://blocker.test/", -1):
+            pending = asyncio.ensure_future(scrape_all(scheduler, jobs, duration=0))
+            await asyncio.sleep(0.01)
+        return await pending
+
+    started, _ = asyncio.run(run())
+    assert started == [f"https://site-{rank}.test/" for rank in (1, 2, 3, 4, 5)]
+
+def test_capped_domain_does_not_block_other_domains():
+    scheduler = ScrapeScheduler(max_concurrent=3, max_per_domain=1, politeness_delay_s=0)
+    jobs = [("https://aave.com/a", 0), ("https://aave.com/b", 1), ("https://curve.fi/", 2)]
+    started, _ = asyncio.run(scrape_all(scheduler, jobs))
+    # aave.com/b waits for its domain; curve.fi, with a lower priority, goes ahead of it
+    assert started == ["https://aave.com/a", "https://curve.fi/", "https://aave.com/b"]
+
+def test_politeness_delay_spaces_starts_on_one_domain():
+    scheduler = ScrapeScheduler(max_concurrent=None, max_per_domain=None, politeness_delay_s=0.1)
+    starts = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        async def scrape(url):
+            async with scheduler.slot(url):
+                starts.append((url_domain(url), loop.time()))
+
+        await asyncio.gather(*(scrape(url) for url in
+                               ["https://aave.com/1", "https://aave.com/2", "https://aave.com/3", "https://curve.fi/"]))
+
+    asyncio.run(run())
+    aave = [t for domain, t in starts if domain == "aave.com"]
+    assert all(b - a >= 0.09 for a, b in zip(aave, aave[1:]))
+    curve = next(t for domain, t in starts if domain == "curve.fi")
+    assert curve - aave[0] < 0.05
+
+def test_cancelled_waiter_frees_its_place():
+    scheduler = ScrapeScheduler(max_concurrent=1, max_per_domain=None, politeness_delay_s=0)
+
+    async def run():
+        async with scheduler.slot("https://a.test/"):
+            waiter = asyncio.ensure_future(scheduler.slot("https://b.test/").__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        async with scheduler.slot("https://c.test/"):
+            return scheduler.stats()
+
+    assert asyncio.run(run()) == {"active": 1, "waiting": 0, "per_domain": {"c.test": 1}}
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from opendeepsearch.serp_search import search_cache
+from opendeepsearch.serp_search.records import AnswerBox, OrganicResult
+from opendeepsearch.serp_search.search_cache import CachedSearchAPI, TTLRule
+from opendeepsearch.serp_search.serp_search import SearchAPI, SearchResult
+
+class FakeSearchAPI(SearchAPI):
+    def __init__(self, records: bool = False):
+        self.records = records
+        self.calls = []
+
+    def get_sources(self, query, num_results=8, stored_location=None):
+        self.calls.append(query)
+        if query == "broken":
+            return SearchResult(error="provider down")
+        if self.records:
+            return SearchResult(data={
+                "organic": [OrganicResult("Aave", "https://aave.com", f"about {query}")],
+                "answerBox": AnswerBox(answer="42"),
+            })
+        return SearchResult(data={"organic": [{"title": "Aave", "link": "https://aave.com", "snippet": f"about {query}"}]})
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+def test_hits_return_private_copies():
+    api = FakeSearchAPI()
+    cache = CachedSearchAPI(api)
+    first = cache.get_sources("What is Aave?")
+    first.data["organic"][0]["html"] = "annotated"
+    second = cache.get_sources("what is aave")
+    assert api.calls == ["What is Aave?"]
+    assert "html" not in second.data["organic"][0]
+    assert cache.stats()["hits"] == 1
+
+def test_entries_expire_after_their_rule_ttl(clock):
+    api = FakeSearchAPI()
+    cache = CachedSearchAPI(api, ttl_rules=[TTLRule("gas", r"\bgas\b", ttl=15)], default_ttl=300)
+    cache.get_sources("gas price")
+    cache.get_sources("aave docs")
+    clock[0] += 16
+    cache.get_sources("gas price")
+    cache.get_sources("aave docs")
+    assert api.calls == ["gas price", "aave docs", "gas price"]
+    assert cache.stats()["expired"] == 1
+
+def test_lru_evicts_least_recently_used():
+    api = FakeSearchAPI()
+    cache = CachedSearchAPI(api, max_entries=2)
+    cache.get_sources("a")
+    cache.get_sources("b")
+    cache.get_sources("a")  # a is now the most recently used
+    cache.get_sources("c")  # evicts b
+    cache.get_sources("a")
+    cache.get_sources("b")
+    assert api.calls == ["a", "b", "c", "b"]
+    assert cache.stats()["evictions"] == 2
+
+def test_failed_results_are_not_cached():
+    api = FakeSearchAPI()
+    cache = CachedSearchAPI(api)
+    assert cache.get_sources("broken").failed
+    assert cache.get_sources("broken").failed
+    assert api.calls == ["broken", "broken"]
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "serp.sqlite")
+    CachedSearchAPI(FakeSearchAPI(), sqlite_path=path).get_sources("aave tvl")
+    api = FakeSearchAPI()
+    cache = CachedSearchAPI(api, sqlite_path=path)
+    result = cache.get_sources("aave tvl")
+    assert api.calls == []
+    assert result.data["organic"][0]["link"] == "https://aave.com"
+    assert cache.stats()["disk_hits"] == 1
+
+def test_disk_hits_rehydrate_fast_decode_records(tmp_path):
+    path = str(tmp_path / "serp.sqlite")
+
+    async def run():
+        await CachedSearchAPI(FakeSearchAPI(records=True), sqlite_path=path).aget_sources("aave tvl")
+        return await CachedSearchAPI(FakeSearchAPI(records=True), sqlite_path=path).aget_sources("aave tvl")
+
+    result = asyncio.run(run())
+    organic = result.data["organic"][0]
+    assert isinstance(organic, OrganicResult)
+    assert organic == OrganicResult("Aave", "https://aave.com", "about aave tvl")
+    assert isinstance(result.data["answerBox"], AnswerBox)
+    assert result.data["answerBox"].answer == "42"
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from opendeepsearch.rate_limiter import RateLimiter
+from opendeepsearch.serp_search.serp_search import SearXNGAPI, SearXNGConfig
+from opendeepsearch.serp_search.stub_server import LatencyModel, StubSearchServer
+
+def make_api(server, results_per_page=5):
+    config = SearXNGConfig(instance_url=server.searxng_url, results_per_page=results_per_page)
+    return SearXNGAPI(config=config, rate_limiter=RateLimiter())
+
+def search(api, query, num_results, use_async):
+    if not use_async:
+        return api.get_sources(query, num_results)
+
+    async def run():
+        result = await api.aget_sources(query, num_results)
+        await api.aclose()
+        return result
+
+    return asyncio.run(run())
+
+def ranks(result):
+    return [int(item["link"].rsplit("/", 1)[1]) for item in result.data["organic"]]
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_pages_are_merged_in_page_order(use_async):
+    with StubSearchServer(results_per_page=5, seed=1) as server:
+        result = search(make_api(server), "aave tvl", 12, use_async)
+        stats = server.stats()
+
+    assert result.success
+    assert ranks(result) == list(range(1, 13))
+    assert stats["searxng"] == 3
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_results_repeated_across_pages_are_deduplicated(use_async):
+    # A recorded response is served for every page, so pages 2 and 3 only repeat page 1
+    recorded = {"results": [
+        {"title": "Aave", "url": "https://aave.com/", "content": "Lending"},
+        {"title": "Aave (www)", "url": "https://www.aave.com/?utm_source=feed", "content": "Lending"},
+        {"title": "Curve", "url": "https://curve.fi/pools", "content": "Pools"},
+    ]}
+    with StubSearchServer(recordings={"defi": recorded}, seed=1) as server:
+        result = search(make_api(server), "defi", 12, use_async)
+
+    assert result.success
+    assert [item["link"] for item in result.data["organic"]] == ["https://aave.com/", "https://curve.fi/pools"]
+
+def test_later_pages_are_abandoned_once_enough_results_arrived():
+    # The server fills 10 results per page, while the client expects 5 and plans two pages
+    with StubSearchServer(results_per_page=10, seed=1) as server:
+        api = make_api(server, results_per_page=5)
+        fetch_page = api._afetch_page
+        unwound = []
+
+        async def slow_later_pages(query, num_results, stored_location, pageno):
+            try:
+                if pageno > 1:
+                    await asyncio.sleep(5)
+                return await fetch_page(query, num_results, stored_location, pageno)
+            finally:
+                unwound.append(pageno)
+
+        api._afetch_page = slow_later_pages
+
+        async def run():
+            result = await api.aget_sources("aave tvl", 10)
+            # The abandoned page has finished unwinding by the time the search returns
+            leftover = asyncio.all_tasks() - {asyncio.current_task()}
+            await api.aclose()
+            return result, leftover
+
+        result, leftover = asyncio.run(run())
+        stats = server.stats()
+
+    assert ranks(result) == list(range(1, 11))
+    assert stats["searxng"] == 1
+    assert leftover == set() and sorted(unwound) == [1, 2]
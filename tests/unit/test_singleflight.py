@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+from opendeepsearch.singleflight import SingleFlight
+
+def test_concurrent_async_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def search():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("aave tvl", search) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["result"] * 10
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 9, "in_flight": 0}
+
+def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def search(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def run():
+        first = await asyncio.gather(flight.do("a", lambda: search("a")), flight.do("b", lambda: search("b")))
+        # Nothing is cached once the call completes
+        second = await flight.do("a", lambda: search("a"))
+        return first, second
+
+    assert asyncio.run(run()) == (["a", "b"], "a")
+    assert calls == ["a", "b", "a"]
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("q", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_cancelled_follower_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("q", slow))
+        follower = asyncio.ensure_future(flight.do("q", slow))
+        await asyncio.sleep(0)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(run()) == "done"
+
+def test_sync_calls_from_many_threads_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    results = []
+    start = threading.Barrier(5)
+
+    def search():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    def worker():
+        start.wait()
+        results.append(flight.do_sync("q", search))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["result"] * 5
+    assert len(calls) == 1
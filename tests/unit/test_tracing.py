@@ -0,0 +1,182 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from opendeepsearch import tracing
+
+class ListSink(tracing.SpanSink):
+    def __init__(self):
+        self.spans = []
+
+    def emit(self, span):
+        self.spans.append(span)
+
+@pytest.fixture
+def sink():
+    sink = ListSink()
+    tracing.enable(sink)
+    yield sink
+    tracing.disable()
+
+def finished_span(name, duration, outcome="ok", items=None, bytes=None):
+    s = tracing.Span(name, {})
+    s.duration = duration
+    s.set(items=items, bytes=bytes, outcome=outcome)
+    return s
+
+def test_spans_are_noops_while_tracing_is_off():
+    assert not tracing.is_enabled()
+    with tracing.span("serp.get_sources") as s:
+        s.set(items=3)
+    assert not isinstance(s, tracing.Span)
+
+def test_nested_spans_share_a_trace(sink):
+    with tracing.span("ask", query="aave") as outer:
+        with tracing.span("serp.get_sources") as inner:
+            inner.set(items=8)
+        with tracing.span("llm.completion"):
+            pass
+    with tracing.span("ask") as other:
+        pass
+
+    assert [s.name for s in sink.spans] == ["serp.get_sources", "llm.completion", "ask", "ask"]
+    assert outer.parent_id is None and outer.attributes == {"query": "aave"}
+    assert inner.parent_id == outer.span_id and inner.trace_id == outer.trace_id
+    assert sink.spans[1].parent_id == outer.span_id
+    assert other.trace_id != outer.trace_id
+    assert inner.items == 8 and inner.outcome == "ok"
+
+def test_tasks_inherit_the_current_span(sink):
+    async def child(name):
+        with tracing.span(name):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracing.span("ask") as parent:
+            await asyncio.gather(child("scrape.a"), child("scrape.b"))
+        return parent
+
+    parent = asyncio.run(run())
+    children = [s for s in sink.spans if s.name.startswith("scrape.")]
+    assert len(children) == 2
+    assert all(s.parent_id == parent.span_id for s in children)
+
+def test_exceptions_mark_the_span(sink):
+    with pytest.raises(ValueError):
+        with tracing.span("rerank"):
+            raise ValueError("bad embedding")
+    assert sink.spans[0].outcome == "error"
+    assert sink.spans[0].error == "ValueError: bad embedding"
+
+def test_failing_sink_does_not_break_the_stage(sink):
+    class Broken(tracing.SpanSink):
+        def emit(self, span):
+            raise RuntimeError("disk full")
+
+    tracing.enable(Broken())
+    with tracing.span("scrape"):
+        pass
+    assert len(sink.spans) == 1
+
+def test_json_lines_sink_writes_one_object_per_span(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.enable(tracing.JSONLinesSink(str(path)))
+    try:
+        with tracing.span("ask"):
+            with tracing.span("serp.get_sources", provider="serper") as s:
+                s.set(items=8, bytes=1024)
+    finally:
+        tracing.disable()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["serp.get_sources", "ask"]
+    assert records[0]["parent_id"] == records[1]["span_id"]
+    assert records[0]["attributes"] == {"provider": "serper"}
+    assert records[0]["items"] == 8 and records[0]["bytes"] == 1024
+
+def test_json_lines_sink_leaves_streams_open():
+    stream = io.StringIO()
+    sink = tracing.JSONLinesSink(stream)
+    sink.emit(finished_span("ask", 0.1))
+    sink.close()
+    assert json.loads(stream.getvalue())["duration"] == 0.1
+
+def test_histogram_sink_summary():
+    histogram = tracing.HistogramSink(buckets=(0.1, 1.0))
+    for duration in (0.05, 0.05, 0.5, 2.0):
+        histogram.emit(finished_span("serp.get_sources", duration, items=8, bytes=100))
+    histogram.emit(finished_span("serp.get_sources", 0.05, outcome="error"))
+
+    stage = histogram.summary()["serp.get_sources"]
+    assert stage["count"] == 5
+    assert stage["histogram"] == {"0.1": 3, "1.0": 1, "+inf": 1}
+    assert stage["outcomes"] == {"ok": 4, "error": 1}
+    assert stage["items"] == 32 and stage["bytes"] == 400
+    assert stage["max_s"] == 2.0
+    assert stage["mean_s"] == pytest.approx(2.65 / 5)
+    # Percentiles report the upper bound of their bucket, capped at the slowest span
+    assert stage["p50_s"] == 0.1
+    assert stage["p95_s"] == stage["p99_s"] == 2.0
+
+    histogram.reset()
+    assert histogram.summary() == {}
+
+def test_traced_wraps_sync_and_async_functions(sink):
+    @tracing.traced("chunk", measure=lambda result, text: {"items": len(result), "bytes": len(text)})
+    def chunk(text):
+        return text.split()
+
+    @tracing.traced("embed")
+    async def embed(texts):
+        await asyncio.sleep(0)
+        return [[0.0]] * len(texts)
+
+    assert chunk("a b c") == ["a", "b", "c"]
+    assert asyncio.run(embed(["a"])) == [[0.0]]
+    assert chunk.__name__ == "chunk"
+
+    spans = {s.name: s for s in sink.spans}
+    assert spans["chunk"].items == 3 and spans["chunk"].bytes == 5
+    assert spans["embed"].outcome == "ok"
+
+def test_traced_records_failures_and_measure_errors(sink):
+    @tracing.traced("fetch", measure=lambda result, url: {"bytes": len(result)})
+    def fetch(url):
+        if url == "bad":
+            raise ConnectionError("refused")
+        return None
+
+    fetch("good")
+    with pytest.raises(ConnectionError):
+        fetch("bad")
+    ok, failed = sink.spans
+    assert "measure_error" in ok.attributes and ok.outcome == "ok"
+    assert failed.outcome == "error" and failed.error == "ConnectionError: refused"
+
+def test_traced_functions_run_untraced_while_off():
+    calls = []
+
+    @tracing.traced("chunk")
+    def chunk(text):
+        calls.append(text)
+        return text
+
+    assert chunk("a") == "a" and calls == ["a"]
+    assert not tracing.is_enabled()
+
+def test_trace_file_environment_variable_enables_tracing(tmp_path):
+    path = tmp_path / "env-spans.jsonl"
+    code = (
+        "from opendeepsearch import tracing\n"
+        "assert tracing.is_enabled()\n"
+        "with tracing.span('ask'):\n"
+        "    pass\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path), "OPENDEEPSEARCH_TRACE_FILE": str(path)}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    assert json.loads(path.read_text())["name"] == "ask"